@@ -1,6 +1,7 @@
 import streamlit as st
 
-from src.helpers.getFolders import getFolders
+from src.helpers.moduleLoader import startPreloading
+from src.helpers.pageRegistry import getPageRegistry
 from src.helpers.structPages import structPages
 
 
@@ -17,16 +18,17 @@ def application():
 
   if st.user and st.user.is_logged_in:
     MAIN_DIR = "src/apps/pages"
-    folders = getFolders(MAIN_DIR)
-    if folders:
-      for folder_name, folder_dir in folders.items():
-        pages[folder_name.title()] = structPages(f"{MAIN_DIR}/{folder_dir}")
+    startPreloading()
+    categories = getPageRegistry(MAIN_DIR)
+    for category_name, category in categories.items():
+      pages[category_name] = structPages(category["dir"], category["folders"])
 
     if st.user.email == st.secrets["general"]["ADMIN_EMAIL"] and st.user.given_name == st.secrets["general"]["ADMIN_NAME"]:
       pages.update(
         {
           "Admin": [
             st.Page("src/apps/auth/env.py", title="Environment Variables", icon=":material/security:"),
+            st.Page("src/apps/auth/metrics.py", title="Performance Metrics", icon=":material/monitoring:"),
           ]
         }
       )
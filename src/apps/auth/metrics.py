@@ -0,0 +1,102 @@
+import streamlit as st
+
+from src.helpers.httpClient import httpMetrics
+from src.helpers.llmCache import llmCacheMetrics
+from src.helpers.llmGateway import LLM_CONCURRENCY, llmMetrics
+from src.helpers.modelRuntime import MODEL_MEMORY_BUDGET_MB, batchMetrics, modelMetrics
+from src.helpers.moduleLoader import importMetrics
+from src.helpers.responseCache import cacheMetrics
+
+
+def displayImportMetrics():
+  st.subheader("Page Module Imports")
+  modules, dependencies, pending = importMetrics()
+  st.caption(f"Background preloads still running: {pending}")
+  if modules:
+    st.dataframe(modules, use_container_width=True, hide_index=True)
+  else:
+    st.info("No page module has been imported by this worker yet.", icon="ℹ️")
+
+  st.markdown("**Preloaded Dependencies**")
+  if dependencies:
+    st.dataframe(dependencies, use_container_width=True, hide_index=True)
+  else:
+    st.info("No dependency has finished preloading yet.", icon="ℹ️")
+
+
+def displayModelMetrics():
+  st.subheader("Model Runtime")
+  models = modelMetrics()
+  resident = sum(row["size (MB)"] or 0 for row in models)
+  st.caption(f"Resident models: {resident:.0f} MB of a {MODEL_MEMORY_BUDGET_MB:.0f} MB budget")
+  if models:
+    st.dataframe(models, use_container_width=True, hide_index=True)
+  else:
+    st.info("No model page has been opened by this worker yet.", icon="ℹ️")
+
+  for name, histograms in batchMetrics().items():
+    st.markdown(f"**{name}**")
+    col1, col2 = st.columns(2)
+    with col1:
+      st.caption("Batch size (batches)")
+      st.bar_chart({str(size): count for size, count in histograms["batch_sizes"].items()})
+    with col2:
+      st.caption("Request latency in ms (requests)")
+      st.bar_chart(histograms["latency_ms"])
+
+
+def displayHttpMetrics():
+  st.subheader("Upstream APIs")
+  st.caption("Coalesced requests shared an identical in-flight call; throttled ones waited for their provider's rate limit.")
+  st.dataframe(httpMetrics(), use_container_width=True, hide_index=True)
+
+
+def displayLLMMetrics():
+  st.subheader("LLM Gateway")
+  st.caption(f"Concurrent completions per provider: {LLM_CONCURRENCY}. Rejected requests waited too long for a free slot.")
+  rows = llmMetrics()
+  if rows:
+    st.dataframe(rows, use_container_width=True, hide_index=True)
+  else:
+    st.info("No LLM request has been served by this worker yet.", icon="ℹ️")
+
+  st.markdown("**LLM Response Cache**")
+  rows = llmCacheMetrics()
+  if rows:
+    st.dataframe(rows, use_container_width=True, hide_index=True)
+  else:
+    st.info("No cacheable LLM request has been made on this worker yet.", icon="ℹ️")
+
+
+def displayCacheMetrics():
+  st.subheader("Response Cache")
+  rows = cacheMetrics()
+  if rows:
+    st.dataframe(rows, use_container_width=True, hide_index=True)
+  else:
+    st.info("No cached API response has been requested from this worker yet.", icon="ℹ️")
+
+
+def metrics():
+  st.title("Performance Metrics")
+  st.markdown(
+    """
+    This page shows runtime metrics collected by this worker process.
+    They reset whenever the server restarts.
+    """
+  )
+  if st.user.email == st.secrets["general"]["ADMIN_EMAIL"] and st.user.given_name == st.secrets["general"]["ADMIN_NAME"]:
+    displayImportMetrics()
+    st.divider()
+    displayModelMetrics()
+    st.divider()
+    displayCacheMetrics()
+    st.divider()
+    displayHttpMetrics()
+    st.divider()
+    displayLLMMetrics()
+  else:
+    st.warning("You are not authorized to view the performance metrics.", icon="⚠️")
+
+
+metrics()
@@ -1,12 +1,13 @@
 import bs4
 import plotly.graph_objs as go
-import requests
 import streamlit as st
 
+from src.helpers.httpClient import httpGet
+
 
 def getCountries():
   url = "https://www.worldometers.info/coronavirus/"
-  result = requests.get(url)
+  result = httpGet(url)
   soups = bs4.BeautifulSoup(result.text, "html.parser")
   country_links = soups.find_all("a", class_="mt_a")
   countries = {}
@@ -17,7 +18,7 @@ def getCountries():
 
 def getDetails(country):
   url = f"https://www.worldometers.info/coronavirus/country/{country}/"
-  result = requests.get(url)
+  result = httpGet(url)
   soups = bs4.BeautifulSoup(result.text, "html.parser")
   cases = soups.find_all("div", class_="maincounter-number")
   case_numbers = [case.text.strip() for case in cases]
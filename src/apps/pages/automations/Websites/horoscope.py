@@ -1,7 +1,8 @@
-import requests
 import streamlit as st
 from bs4 import BeautifulSoup
 
+from src.helpers.httpClient import httpGet
+
 zodiac_signs = {
   "Aries": 1,
   "Taurus": 2,
@@ -21,10 +22,10 @@ zodiac_signs = {
 def get_horoscope_by_day(zodiac_sign: int, day: str):
   try:
     if "-" not in day:
-      res = requests.get(f"https://www.horoscope.com/us/horoscopes/general/horoscope-general-daily-{day}.aspx?sign={zodiac_sign}")
+      res = httpGet(f"https://www.horoscope.com/us/horoscopes/general/horoscope-general-daily-{day}.aspx?sign={zodiac_sign}")
     else:
       day = day.replace("-", "")
-      res = requests.get(f"https://www.horoscope.com/us/horoscopes/general/horoscope-archive.aspx?sign={zodiac_sign}&laDate={day}")
+      res = httpGet(f"https://www.horoscope.com/us/horoscopes/general/horoscope-archive.aspx?sign={zodiac_sign}&laDate={day}")
 
     soup = BeautifulSoup(res.content, "html.parser")
     data = soup.find("div", attrs={"class": "main-horoscope"})
@@ -1,78 +1,98 @@
 import io
+import os
 import pickle
 import sys
-import os
-import numpy as np
-from PIL import Image
 
+import numpy as np
 import streamlit as st
 import torch
+from PIL import Image
 from torch import nn
 from torchvision import models, transforms
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../../..")))
 from src.helpers.kaggle import downloadNotebookOutput
-
-def arabicDatesClassifierModel():
-  # APP HEADER
-  st.title("Arabic Dates Classification 🍂")
-  st.markdown(
-    "This pretrained model classifies an image of **Arabic Dates** into one of the 9 varieties commonly found in the Arabian region."
+from src.helpers.modelRuntime import predictOne, registerModel
+from src.helpers.onnxBackend import loadOnnxModel, runOnnx
+
+# IMAGE PREPROCESSING
+transform = transforms.Compose([
+  transforms.Resize((224, 224)),
+  transforms.ToTensor(),
+  transforms.Normalize([0.485, 0.456, 0.406],
+                      [0.229, 0.224, 0.225])
+])
+
+
+def load_model_data():
+  notebook = downloadNotebookOutput("supratikbhowal", "arabic-dates-classification")
+
+  PICKLE_SAVE_PATH = os.path.join(notebook, "arabic_dates_classnames.pkl")
+  with open(PICKLE_SAVE_PATH, "rb") as f:
+    class_names = pickle.load(f)
+
+  model = models.resnet50(weights=models.ResNet50_Weights.DEFAULT)
+  model.fc = nn.Sequential(
+    nn.Linear(model.fc.in_features, 512),
+    nn.ReLU(),
+    nn.Dropout(0.4),
+    nn.Linear(512, len(class_names))
   )
 
-  # LOAD MODEL
-  @st.cache_resource
-  def load_model_data():
-    try:
-      downloadNotebookOutput("supratikbhowal", "arabic-dates-classification", "notebook")
+  MODEL_SAVE_PATH = os.path.join(notebook, "arabic_dates_model.pth")
+  checkpoint = torch.load(MODEL_SAVE_PATH, map_location=torch.device("cpu"))
+  model.load_state_dict(checkpoint["model_state_dict"], strict=False)
+  model.eval()
 
-      PICKLE_SAVE_PATH = "notebook/arabic_dates_classnames.pkl"
-      with open(PICKLE_SAVE_PATH, "rb") as f:
-        class_names = pickle.load(f)
+  return model, class_names
 
-      model = models.resnet50(weights=models.ResNet50_Weights.DEFAULT)
-      model.fc = nn.Sequential(
-        nn.Linear(model.fc.in_features, 512),
-        nn.ReLU(),
-        nn.Dropout(0.4),
-        nn.Linear(512, len(class_names))
-      )
 
-      MODEL_SAVE_PATH = "notebook/arabic_dates_model.pth"
-      checkpoint = torch.load(MODEL_SAVE_PATH, map_location=torch.device("cpu"))
-      model.load_state_dict(checkpoint["model_state_dict"], strict=False)
-      model.eval()
+def load_class_names():
+  notebook = downloadNotebookOutput("supratikbhowal", "arabic-dates-classification")
+  with open(os.path.join(notebook, "arabic_dates_classnames.pkl"), "rb") as f:
+    return pickle.load(f)
 
-      return model, class_names
 
-    except Exception as e:
-      st.error(f"🚨 Failed to load model or data: {e}")
-      st.stop()
+def load_serving_model():
+  # Serve the exported ONNX model when available, otherwise fall back to PyTorch
+  onnx_model = loadOnnxModel("arabicDatesClassifier")
+  if onnx_model:
+    return {**onnx_model, "class_names": load_class_names()}
+  model, class_names = load_model_data()
+  return {"backend": "torch", "model": model, "class_names": class_names}
 
-  model, CLASS_NAMES = load_model_data()
-  st.success("✅ Model and class names loaded successfully!")
 
-  # IMAGE PREPROCESSING
-  transform = transforms.Compose([
-    transforms.Resize((224, 224)),
-    transforms.ToTensor(),
-    transforms.Normalize([0.485, 0.456, 0.406],
-                        [0.229, 0.224, 0.225])
-  ])
+def predict_batch(model_data, batch):
+  class_names = model_data["class_names"]
+  if model_data["backend"] == "onnx":
+    logits = runOnnx(model_data, torch.cat(batch).numpy())
+    exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+    probs = exp / exp.sum(axis=1, keepdims=True)
+  else:
+    with torch.no_grad():
+      outputs = model_data["model"](torch.cat(batch))
+      probs = torch.nn.functional.softmax(outputs, dim=1).numpy()
+  results = []
+  for row in probs:
+    sorted_indices = np.argsort(row)[::-1]
+    results.append(([class_names[i] for i in sorted_indices], row[sorted_indices]))
+  return results
 
-  def preprocess_image(image: Image.Image):
-    image = image.convert("RGB")
-    return transform(image).unsqueeze(0)
 
-  def predict(model, image_tensor, class_names):
-    with torch.no_grad():
-      outputs = model(image_tensor)
-      probs = torch.nn.functional.softmax(outputs[0], dim=0)
-    probs = probs.numpy()
-    sorted_indices = np.argsort(probs)[::-1]
-    sorted_probs = probs[sorted_indices]
-    sorted_labels = [class_names[i] for i in sorted_indices]
-    return sorted_labels, sorted_probs
+registerModel("arabicDatesClassifier", load_serving_model, predict_batch, batching=True)
+
+
+def preprocess_image(image: Image.Image):
+  image = image.convert("RGB")
+  return transform(image).unsqueeze(0)
+
+
+def arabicDatesClassifierModel():
+  # APP HEADER
+  st.title("Arabic Dates Classification 🍂")
+  st.markdown(
+    "This pretrained model classifies an image of **Arabic Dates** into one of the 9 varieties commonly found in the Arabian region."
+  )
 
   # FILE UPLOAD
   uploaded_file = st.file_uploader("📸 Upload an image of Arabic Dates", type=["jpg", "jpeg", "png"])
@@ -84,7 +104,11 @@ def arabicDatesClassifierModel():
     st.write("🔍 Analyzing...")
 
     image_tensor = preprocess_image(image)
-    labels, probs = predict(model, image_tensor, CLASS_NAMES)
+    try:
+      labels, probs = predictOne("arabicDatesClassifier", image_tensor)
+    except Exception as e:
+      st.error(f"🚨 Failed to load model or data: {e}")
+      st.stop()
 
     top_class = labels[0]
     top_prob = probs[0] * 100
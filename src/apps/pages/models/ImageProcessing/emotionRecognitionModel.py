@@ -1,7 +1,6 @@
 import os
 import sys
 from pathlib import Path
-from zipfile import ZipFile
 
 import cv2
 import numpy as np
@@ -11,6 +10,8 @@ from deepface import DeepFace
 from dotenv import load_dotenv
 from PIL import Image
 
+from src.helpers.modelRuntime import predictOne, registerModel
+
 # Initialize environment variables
 load_dotenv()
 
@@ -35,33 +36,32 @@ except Exception:
   pass
 
 
-@st.cache_resource
 def load_custom_model():
   """Load custom model with compatibility fallback"""
+  model_path = ensure_model()
   try:
-    return tf.keras.models.load_model(MODEL_PATH, safe_mode=False)
+    return tf.keras.models.load_model(model_path, safe_mode=False)
   except TypeError as e:
     if "batch_shape" in str(e):
       custom_objects = {"InputLayer": lambda **kwargs: tf.keras.layers.InputLayer(**{k: v for k, v in kwargs.items() if k != "batch_shape"})}
-      return tf.keras.models.load_model(MODEL_PATH, custom_objects=custom_objects, safe_mode=False)
+      return tf.keras.models.load_model(model_path, custom_objects=custom_objects, safe_mode=False)
     raise
 
 
 def ensure_model():
-  """Ensure model is available locally"""
-  if not MODEL_PATH.exists():
-    from src.helpers.kaggle import downloadNotebookOutput
-
-    st.warning("Downloading model from Kaggle...")
-    MODEL_FOLDER.mkdir(parents=True, exist_ok=True)
+  """Ensure model is available locally, preferring a copy placed in MODEL_FOLDER over the Kaggle artifact"""
+  if MODEL_PATH.exists():
+    return MODEL_PATH
 
-    downloadNotebookOutput(os.getenv("KAGGLE_USERNAME"), os.getenv("KAGGLE_NOTEBOOK"), str(MODEL_FOLDER))
+  from src.helpers.artifactStore import findArtifact
+  from src.helpers.kaggle import downloadNotebookOutput
 
-    # Extract if zip file was downloaded
-    for zip_file in MODEL_FOLDER.glob("*.zip"):
-      with ZipFile(zip_file) as z:
-        z.extractall(MODEL_FOLDER)
-      zip_file.unlink()
+  username, notebook = os.getenv("KAGGLE_USERNAME"), os.getenv("KAGGLE_NOTEBOOK")
+  if findArtifact("kaggle-notebook", f"{username}/{notebook}") is None:
+    st.warning("Downloading model from Kaggle...")
+  # Zip archives are extracted by the download, so the model may sit in a sub-folder of the output
+  output = Path(downloadNotebookOutput(username, notebook))
+  return next(output.rglob(MODEL_FILENAME), output / MODEL_FILENAME)
 
 
 def preprocess_image(img):
@@ -72,20 +72,35 @@ def preprocess_image(img):
   return (img_resized / 255.0).reshape(1, 48, 48, 1)
 
 
-def predict_with_custom_model(model, img):
+def custom_model_batch(model, batch):
+  """Predict emotions for a batch of images with the custom model"""
+  predictions = model.predict(np.concatenate([preprocess_image(img) for img in batch]), verbose=0)
+  return [(EMOTION_LABELS[np.argmax(prediction)], float(np.max(prediction))) for prediction in predictions]
+
+
+def deepface_batch(deepface, batch):
+  """Predict emotions for a batch of images with DeepFace"""
+  results = []
+  for img in batch:
+    img = np.array(img) if isinstance(img, Image.Image) else img
+    result = deepface.analyze(img, actions=["emotion"], enforce_detection=False)
+    results.append((result[0]["dominant_emotion"], result[0]["emotion"]))
+  return results
+
+
+registerModel("emotionRecognitionCustom", load_custom_model, custom_model_batch, batching=True)
+# DeepFace caches its own weights internally, so the runtime only serializes inference for it.
+registerModel("emotionRecognitionDeepFace", lambda: DeepFace, deepface_batch, size_mb=0)
+
+
+def predict_with_custom_model(img):
   """Predict emotion using custom model"""
-  processed = preprocess_image(img)
-  prediction = model.predict(processed, verbose=0)
-  emotion = EMOTION_LABELS[np.argmax(prediction)]
-  confidence = float(np.max(prediction))
-  return emotion, confidence
+  return predictOne("emotionRecognitionCustom", img)
 
 
 def predict_with_deepface(img):
   """Predict emotion using DeepFace"""
-  img = np.array(img) if isinstance(img, Image.Image) else img
-  result = DeepFace.analyze(img, actions=["emotion"], enforce_detection=False)
-  return result[0]["dominant_emotion"], result[0]["emotion"]
+  return predictOne("emotionRecognitionDeepFace", img)
 
 
 # ---- Jarvis entry function ----
@@ -114,10 +129,8 @@ def emotionRecognitionModel():
         st.success(f"Predicted Emotion: {emotion}")
         st.json(scores)
     else:
-      ensure_model()
       with st.spinner("Predicting with custom model..."):
-        model = load_custom_model()
-        emotion, confidence = predict_with_custom_model(model, image)
+        emotion, confidence = predict_with_custom_model(image)
         st.success(f"Predicted Emotion: {emotion} ({confidence:.2%})")
 
   st.caption("This page supports both DeepFace and custom-trained models with Kaggle integration.")
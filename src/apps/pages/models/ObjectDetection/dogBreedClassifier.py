@@ -1,9 +1,14 @@
-import gdown
+import os
+
 import numpy as np
 import streamlit as st
 import tensorflow as tf
 from PIL import Image
 
+from src.helpers.googleDrive import downloadDriveFile
+from src.helpers.modelRuntime import predictOne, registerModel
+from src.helpers.onnxBackend import loadOnnxModel, runOnnx
+
 breed_labels = [
   "affenpinscher",
   "afghan_hound",
@@ -128,30 +133,44 @@ breed_labels = [
 ]
 
 
-@st.cache_resource
 def loadModel():
   """Recreate the model architecture and load weights"""
+  weights_path = downloadDriveFile(st.secrets["dogBreedClassificationModel"]["MODEL"], "Model.h5")
+  base_model = tf.keras.applications.MobileNetV2(input_shape=(224, 224, 3), include_top=False, weights="imagenet")
+  base_model.trainable = False
+  model = tf.keras.Sequential(
+    [
+      base_model,
+      tf.keras.layers.Flatten(),
+      tf.keras.layers.Dropout(0.5),
+      tf.keras.layers.Dense(120, activation="softmax", kernel_regularizer=tf.keras.regularizers.l2(0.01)),
+    ]
+  )
+
   try:
-    gdown.download(f"https://drive.google.com/uc?id={st.secrets['dogBreedClassificationModel']['MODEL']}", "Model.h5", quiet=False)
-    base_model = tf.keras.applications.MobileNetV2(input_shape=(224, 224, 3), include_top=False, weights="imagenet")
-    base_model.trainable = False
-    model = tf.keras.Sequential(
-      [
-        base_model,
-        tf.keras.layers.Flatten(),
-        tf.keras.layers.Dropout(0.5),
-        tf.keras.layers.Dense(120, activation="softmax", kernel_regularizer=tf.keras.regularizers.l2(0.01)),
-      ]
-    )
+    model.load_weights(weights_path)
+  except Exception:
+    model.load_weights(tf.train.latest_checkpoint(os.path.dirname(weights_path)))
+  return model
 
-    try:
-      model.load_weights("Model.h5")
-    except Exception:
-      model.load_weights(tf.train.latest_checkpoint("./"))
-    return model
-  except Exception as e:
-    st.error(f"Error loading model: {e}", icon="🚨")
-    return None
+
+def loadServingModel():
+  """Serve the exported ONNX model when available, otherwise fall back to TensorFlow"""
+  return loadOnnxModel("dogBreedClassifier") or {"backend": "keras", "model": loadModel()}
+
+
+def predictBatch(model, batch):
+  """Classify a batch of preprocessed images, returning a (breed, confidence) pair per image"""
+  images = np.concatenate(batch)
+  predictions = runOnnx(model, images) if model["backend"] == "onnx" else model["model"].predict(images, verbose=0)
+  results = []
+  for prediction in predictions:
+    predicted_idx = np.argmax(prediction)
+    results.append((breed_labels[predicted_idx], prediction[predicted_idx]))
+  return results
+
+
+registerModel("dogBreedClassifier", loadServingModel, predictBatch, batching=True)
 
 
 def preprocessImage(img):
@@ -179,16 +198,8 @@ def uploadDogImg():
 
 def predictBreed(x):
   """Predict dog breed from preprocessed image"""
-  model = loadModel()
-  if model is None:
-    st.toast("Failed to load model", icon="🚨")
-    return None, 0
-
   try:
-    predictions = model.predict(x)
-    predicted_idx = np.argmax(predictions[0])
-    confidence = predictions[0][predicted_idx]
-    return breed_labels[predicted_idx], confidence
+    return predictOne("dogBreedClassifier", x)
   except Exception as e:
     st.error(f"Error making prediction: {e}", icon="🚨")
     return None, 0
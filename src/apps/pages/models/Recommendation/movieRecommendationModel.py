@@ -1,54 +1,84 @@
+import os
 import pickle
 
-import requests
+import numpy as np
 import streamlit as st
 
+from src.helpers.artifactStore import fetchArtifact, readManifest
 from src.helpers.kaggle import downloadNotebookOutput
+from src.helpers.tmdb import fetchMovies
+
+# Neighbours precomputed per movie; the slider tops out at 20, so recommendations never need the full row.
+TOP_K = 50
+SIMILARITY_DTYPE = os.environ.get("JARVIS_SIMILARITY_DTYPE", "float16")
+
+
+def build_similarity_index(notebook, index_dir, chunk_size=1024):
+  """One-time conversion of similarity.pkl into a memory-mappable matrix and a top-K neighbour table."""
+  with open(os.path.join(notebook, "similarity.pkl"), "rb") as similarity_file:
+    similarity = np.asarray(pickle.load(similarity_file), dtype=np.float32)
+  np.save(os.path.join(index_dir, "similarity.npy"), similarity.astype(SIMILARITY_DTYPE))
+
+  num_movies = similarity.shape[0]
+  k = min(TOP_K, num_movies - 1)
+  neighbours = np.empty((num_movies, k), dtype=np.int32)
+  for start in range(0, num_movies, chunk_size):
+    rows = similarity[start : start + chunk_size].copy()
+    # A movie is always most similar to itself, so leave it out of its own neighbours.
+    rows[np.arange(len(rows)), np.arange(start, start + len(rows))] = -np.inf
+    top = np.argpartition(-rows, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(rows, top, axis=1), axis=1, kind="stable")
+    neighbours[start : start + len(rows)] = np.take_along_axis(top, order, axis=1)
+  np.save(os.path.join(index_dir, "neighbours.npy"), neighbours)
 
 
 def load_data():
-  downloadNotebookOutput("avdhesh15", "movie-recommendation-app", "notebook")
-  with open("notebook/movies_list.pkl", "rb") as movies_file:
+  notebook = downloadNotebookOutput("avdhesh15", "movie-recommendation-app")
+  with open(os.path.join(notebook, "movies_list.pkl"), "rb") as movies_file:
     movies_data = pickle.load(movies_file)
-  with open("notebook/similarity.pkl", "rb") as similarity_file:
-    similarity = pickle.load(similarity_file)
+
+  # The index is built once per host under the artifact lock and keyed by the similarity.pkl checksum.
+  similarity_checksum = readManifest(notebook)["files"]["similarity.pkl"][:16]
+  index_dir = fetchArtifact(
+    "movie-index",
+    "avdhesh15/movie-recommendation-app",
+    lambda index_dir: build_similarity_index(notebook, index_dir),
+    version=f"{similarity_checksum}-top{TOP_K}-{SIMILARITY_DTYPE}",
+    derived=True,
+  )
+  # Memory-mapped, so every worker shares the same pages through the OS cache.
+  similarity = np.load(os.path.join(index_dir, "similarity.npy"), mmap_mode="r")
+  neighbours = np.load(os.path.join(index_dir, "neighbours.npy"), mmap_mode="r")
   movies_list = movies_data["title"].values
-  return movies_data, similarity, movies_list
+  return movies_data, similarity, neighbours, movies_list
 
 
 try:
-  movies_data, similarity, movies_list = load_data()
+  movies_data, similarity, neighbours, movies_list = load_data()
+  movie_positions = {}
+  for position, title in enumerate(movies_list):
+    movie_positions.setdefault(title, position)
 except Exception as e:
   st.error(f"Data could not be loaded: {e}", icon="🚨")
   st.stop()
 
 
-def fetchData(movie_id):
-  url = f"https://api.themoviedb.org/3/movie/{movie_id}?api_key={st.secrets['api_key']['TMDB_API_KEY']}"
-  data = requests.get(url).json()
-  movie_data = {
-    "original_title": data["original_title"],
-    "poster_path": f"https://image.tmdb.org/t/p/w500{data['poster_path']}",
-    "backdrop_path": f"https://image.tmdb.org/t/p/w500{data['backdrop_path']}",
-    "overview": data["overview"],
-    "runtime": data["runtime"],
-    "release_date": data["release_date"],
-    "spoken_languages": data["spoken_languages"],
-    "genres": data["genres"],
-  }
-  return movie_data
-
-
 def recommend(movie, num_movies_recommend):
-  movie_index = movies_data[movies_data["title"] == movie].index[0]
-  distances = similarity[movie_index]
-  movies_list = sorted(list(enumerate(distances)), reverse=True, key=lambda x: x[1])[1 : num_movies_recommend + 1]
+  movie_index = movie_positions[movie]
+  if num_movies_recommend <= neighbours.shape[1]:
+    movies_list = neighbours[movie_index][:num_movies_recommend]
+  else:
+    distances = np.asarray(similarity[movie_index], dtype=np.float32)
+    movies_list = [i for i in np.argsort(-distances, kind="stable") if i != movie_index][:num_movies_recommend]
+  rows = [movies_data.iloc[i] for i in movies_list]
+  # Fetched concurrently and cached on disk; movies TMDB cannot describe are left out.
+  movies_metadata = fetchMovies([row.id for row in rows], st.secrets["api_key"]["TMDB_API_KEY"])
   recommended_movies = []
   recommended_movies_data = []
-  for i in movies_list:
-    recommended_movies.append(movies_data.iloc[i[0]].title)
-    poster = fetchData(movies_data.iloc[i[0]].id)
-    recommended_movies_data.append(poster)
+  for row, metadata in zip(rows, movies_metadata, strict=True):
+    if metadata is not None:
+      recommended_movies.append(row.title)
+      recommended_movies_data.append(metadata)
   return recommended_movies, recommended_movies_data
 
 
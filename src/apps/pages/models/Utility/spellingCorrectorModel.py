@@ -6,6 +6,8 @@ from nltk.corpus import words
 from nltk.metrics.distance import edit_distance
 from transformers import T5ForConditionalGeneration, T5Tokenizer
 
+from src.helpers.modelRuntime import predict, registerModel
+
 # Download NLTK words corpus if not already present
 try:
   nltk.data.find("corpora/words")
@@ -44,13 +46,31 @@ custom_dict = {
 
 
 # Initialize T5 model and tokenizer
-@st.cache_resource
 def loadModel():
   model = T5ForConditionalGeneration.from_pretrained("vennify/t5-base-grammar-correction")
   tokenizer = T5Tokenizer.from_pretrained("vennify/t5-base-grammar-correction")
   return model, tokenizer
 
 
+def generateCorrections(model_data, batch):
+  """Run a batch of "correct: ..." prompts through T5 and return the decoded outputs."""
+  model, tokenizer = model_data
+  inputs = tokenizer(batch, return_tensors="pt", max_length=512, truncation=True, padding=True)
+  # Generate corrected text with refined parameters
+  outputs = model.generate(
+    inputs["input_ids"],
+    attention_mask=inputs["attention_mask"],
+    max_length=512,
+    num_beams=5,  # Increase beams for better accuracy
+    length_penalty=1.0,
+    early_stopping=True,
+  )
+  return tokenizer.batch_decode(outputs, skip_special_tokens=True)
+
+
+registerModel("spellingCorrector", loadModel, generateCorrections)
+
+
 # Fallback spell correction using Levenshtein distance
 def correctWordFallback(word, max_distance=3):
   """Correct a single word using edit distance with higher threshold."""
@@ -67,7 +87,7 @@ def correctWordFallback(word, max_distance=3):
 
 
 # Spell and grammar correction using T5
-def correctSpelling(text, model, tokenizer):
+def correctSpelling(text):
   """Correct spelling and grammar using T5 model with custom dictionary."""
   # Step 1: Apply custom dictionary corrections
   corrected_text = text
@@ -75,16 +95,7 @@ def correctSpelling(text, model, tokenizer):
     corrected_text = re.sub(r"\b" + re.escape(wrong) + r"\b", correct, corrected_text, flags=re.IGNORECASE)
   # Step 2: Use T5 for grammar and spelling correction
   input_text = f"correct: {corrected_text}"
-  inputs = tokenizer(input_text, return_tensors="pt", max_length=512, truncation=True)
-  # Generate corrected text with refined parameters
-  outputs = model.generate(
-    inputs["input_ids"],
-    max_length=512,
-    num_beams=5,  # Increase beams for better accuracy
-    length_penalty=1.0,
-    early_stopping=True,
-  )
-  corrected = tokenizer.decode(outputs[0], skip_special_tokens=True)
+  corrected = predict("spellingCorrector", [input_text])[0]
   # Step 3: Fallback for any uncorrected words
   tokens = re.findall(r"\b\w+\b", corrected)
   corrected_tokens = []
@@ -121,9 +132,8 @@ def spellingCorrectorModel():
   # Correct button
   if st.button("Correct Spelling"):
     if input_text.strip():
-      model, tokenizer = loadModel()
       with st.spinner("Correcting text..."):
-        corrected = correctSpelling(input_text, model, tokenizer)
+        corrected = correctSpelling(input_text)
       st.session_state["corrected_text"] = corrected  # Store in session state
       st.text_area("Corrected Text (select and press Ctrl+C to copy):", value=corrected, height=150, disabled=False, key="corrected_text_area")
     else:
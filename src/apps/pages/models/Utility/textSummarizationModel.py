@@ -1,16 +1,23 @@
 import streamlit as st
 from transformers import pipeline
 
+from src.helpers.modelRuntime import predict, registerModel
+
 
-@st.cache_resource(show_spinner=True)
 def load_summarizer():
   return pipeline("summarization", model="t5-small")
 
 
+def summarize_batch(summarizer, batch):
+  return summarizer(batch, max_length=150, min_length=30, do_sample=False)
+
+
+registerModel("textSummarizationModel", load_summarizer, summarize_batch)
+
+
 def textSummarizationModel():
   user_input = st.text_area("Enter the text you'd like to summarize (minimum 50 words)", height=200)
   if st.button("Summarize") and len(user_input.split()) >= 50:
-    summarizer = load_summarizer()
     with st.spinner("Summarizing..."):
-      summary = summarizer(user_input, max_length=150, min_length=30, do_sample=False)
+      summary = predict("textSummarizationModel", [user_input])[0]["summary_text"]
       st.info(summary, icon="ℹ️")
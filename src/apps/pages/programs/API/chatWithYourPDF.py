@@ -1,16 +1,18 @@
 import os
-import tempfile
 
 import streamlit as st
-from langchain_community.document_loaders import PyPDFLoader
-from langchain_community.vectorstores import FAISS
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_google_genai import GoogleGenerativeAIEmbeddings
-from langchain_groq import ChatGroq
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 from src.helpers.checkKeyExist import isKeyExist
+from src.helpers.currentUser import isSignedIn, userKey
 from src.helpers.displayInstructions import showInstructions
+from src.helpers.embeddings import EMBEDDING_BACKEND, loadEmbeddings
+from src.helpers.hybridRetrieval import buildHybridRetriever, retrieve
+from src.helpers.knowledgeBase import addDocument, deleteDocument, knowledgeBaseDir, knowledgeBaseManifest, loadKnowledgeBase
+from src.helpers.llmCache import cachedStreamChat
+from src.helpers.llmGateway import needsApiKey
+from src.helpers.pdfIngest import documentDigest, iterChunks, iterPageTexts, temporaryPDF
+from src.helpers.vectorStore import INDEX_TYPE, loadVectorStore
 
 api_guide = """
 | Get your Groq API Key | Get your Google API Key |
@@ -23,64 +25,162 @@ api_guide = """
 
 
 def load_credentials():
-  exists = isKeyExist(["GROQ_API_KEY", "GOOGLE_API_KEY"], "api_key")
-  if not exists["GROQ_API_KEY"] or not exists["GOOGLE_API_KEY"]:
-    showInstructions(markdown_text=api_guide, fields=["GROQ_API_KEY", "GOOGLE_API_KEY"])
+  # The local embedding backend runs on this machine, so only the Groq key is needed then.
+  fields = (["GROQ_API_KEY"] if needsApiKey("groq") else []) + (["GOOGLE_API_KEY"] if EMBEDDING_BACKEND == "google" else [])
+  exists = isKeyExist(fields, "api_key")
+  if not all(exists[field] for field in fields):
+    showInstructions(markdown_text=api_guide, fields=fields)
     st.stop()
 
 
-@st.cache_resource
-def load_model():
+def sourceLabel(document):
+  page = document.metadata.get("page")
+  source = document.metadata.get("source")
+  return ", ".join(part for part in (source, f"page {page}" if page is not None else None) if part) or "document"
+
+
+def answerMessages(context, query):
+  context = "\n\n".join(f"[{i}] ({sourceLabel(document)}) {document.page_content}" for i, document in enumerate(context, start=1))
+  return [
+    {
+      "role": "system",
+      "content": "You are a helpful assistant. Use the following numbered context to answer the user's query, and cite the passages "
+      f"you rely on as [1], [2], ...: {context}",
+    },
+    {"role": "user", "content": query},
+  ]
+
+
+def answerQuestion(retriever, query, scope):
   try:
-    api_key = os.environ.get("GROQ_API_KEY") or st.secrets["api_key"]["GROQ_API_KEY"]
-    return ChatGroq(model="llama-3.1-8b-instant", temperature=0, max_tokens=None, timeout=None, max_retries=2, api_key=api_key)
-  except KeyError:
-    st.toast("GROQ_API_KEY not found in environment variables!", icon="🚨")
-    st.stop()
+    context = retrieve(retriever, query)
+    api_key = os.environ.get("GROQ_API_KEY") or st.secrets.get("api_key", {}).get("GROQ_API_KEY")
+    with st.chat_message("ai"):
+      # Repeated questions in the same scope are answered from the cache, including rephrasings when semantic matching is on.
+      messages = answerMessages(context, query)
+      st.write_stream(cachedStreamChat("pdf-chat", "groq", messages, scope=scope, question=query, api_key=api_key, temperature=0))
+      with st.expander("📎 Sources"):
+        for i, document in enumerate(context, start=1):
+          st.markdown(f"**[{i}] {sourceLabel(document)}**")
+          st.caption(document.page_content[:500])
+  except Exception as e:
+    st.error(f"Error generating response: {str(e)}", icon="🚨")
 
 
-def chatWithYourPDF():
-  load_credentials()
-  GOOGLE_API_KEY = os.environ.get("GOOGLE_API_KEY") or st.secrets["api_key"]["GOOGLE_API_KEY"]
+def split_pdf(data, progress=None):
+  text_splitter = RecursiveCharacterTextSplitter(
+    chunk_size=1000,
+    chunk_overlap=100,
+    length_function=len,
+    is_separator_regex=False,
+  )
+  # Pages are extracted in worker processes and split as they arrive, so large PDFs never sit in memory as page objects.
+  with temporaryPDF(data) as path:
+    return list(iterChunks(iterPageTexts(path, progress=progress), text_splitter))
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def load_retriever(digest, embedding_name, index_type, _file, _embeddings):
+  # Keyed by content hash: reruns reuse this object, and a re-upload (even in another worker) loads the persisted index.
+  # The BM25 index is cheap to rebuild from the chunks, so only the vector index is persisted.
+  progress_bar = st.progress(0.0, text="Processing PDF...")
+
+  def reading(done, total):
+    progress_bar.progress(done / total if total else 1.0, text=f"Reading PDF: {done}/{total} pages")
+
+  def embedding(done, total):
+    progress_bar.progress(done / total if total else 1.0, text=f"Embedding PDF: {done}/{total} batches")
+
+  vector_store = loadVectorStore(digest, embedding_name, lambda: split_pdf(_file.getvalue(), reading), _embeddings, index_type, embedding)
+  retriever = buildHybridRetriever(vector_store)
+  progress_bar.empty()
+  return retriever
+
+
+@st.cache_resource(max_entries=16, show_spinner=False)
+def load_knowledge_base(kb_dir, version, _embeddings):
+  # Keyed by manifest version: any add or delete (from any worker) opens the knowledge base afresh.
+  return loadKnowledgeBase(kb_dir, _embeddings)
+
+
+def addToKnowledgeBase(kb_dir, file, embedding_name, embeddings):
+  data = file.getvalue()
+  progress_bar = st.progress(0.0, text=f"Processing {file.name}...")
+
+  def reading(done, total):
+    progress_bar.progress(done / total if total else 1.0, text=f"Reading {file.name}: {done}/{total} pages")
 
+  def embedding(done, total):
+    progress_bar.progress(done / total if total else 1.0, text=f"Embedding {file.name}: {done}/{total} batches")
+
+  try:
+    if addDocument(kb_dir, documentDigest(data), file.name, embedding_name, lambda: split_pdf(data, reading), embeddings, embedding):
+      st.toast(f"Added {file.name} to your knowledge base.", icon="✅")
+    else:
+      st.toast(f"{file.name} is already in your knowledge base.", icon="ℹ️")
+  except Exception as e:
+    st.error(f"Error processing {file.name}: {str(e)}", icon="🚨")
+  finally:
+    progress_bar.empty()
+
+
+def knowledgeBase(embedding_name, embeddings):
+  if not isSignedIn():
+    st.info("Sign in to keep your knowledge base across visits. Until then it only lasts for this session.", icon="ℹ️")
+  kb_dir = knowledgeBaseDir(userKey(), embedding_name, persist=isSignedIn())
+
+  files = st.file_uploader("Add PDF files to your knowledge base", type=["pdf"], accept_multiple_files=True)
+  if files and st.button("Add to knowledge base", icon="📥"):
+    for file in files:
+      addToKnowledgeBase(kb_dir, file, embedding_name, embeddings)
+
+  manifest = knowledgeBaseManifest(kb_dir)
+  documents = sorted(manifest["documents"].items(), key=lambda item: item[1]["added"])
+  if not documents:
+    st.info("Your knowledge base is empty. Add some PDF files to start asking questions.", icon="ℹ️")
+    return
+  with st.expander(f"📚 Documents in your knowledge base ({len(documents)})"):
+    for digest, document in documents:
+      col1, col2, col3 = st.columns([6, 2, 1])
+      col1.write(document["name"])
+      col2.caption(f"{document['count']} chunks")
+      if col3.button("🗑️", key=f"kb_delete_{digest}", help=f"Remove {document['name']}"):
+        deleteDocument(kb_dir, digest)
+        st.rerun()
+
+  retriever = load_knowledge_base(kb_dir, manifest["version"], embeddings)
+  query = st.text_input("Ask a question about your documents", placeholder="Type your question here...")
+  if query:
+    answerQuestion(retriever, query, f"kb:{kb_dir}:{manifest['version']}")
+
+
+def singlePDF(embedding_name, embeddings):
   file = st.file_uploader("Upload a PDF file", type=["pdf"])
   retriever = None
   if file:
     try:
-      with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-        tmp_file.write(file.read())
-        tmp_path = tmp_file.name
-
-      loader = PyPDFLoader(tmp_path)
-      pages = loader.load()
-      raw_texts = [page.page_content for page in pages]
-      text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=1000,
-        chunk_overlap=100,
-        length_function=len,
-        is_separator_regex=False,
-      )
-
-      documents = text_splitter.create_documents(raw_texts)
-      embeddings = GoogleGenerativeAIEmbeddings(model="models/gemini-embedding-exp-03-07", google_api_key=GOOGLE_API_KEY)
-      vector_store = FAISS.from_documents(documents=documents, embedding=embeddings)
-      retriever = vector_store.as_retriever(search_type="mmr", search_kwargs={"k": 2})
-
+      digest = documentDigest(file.getvalue())
+      retriever = load_retriever(digest, embedding_name, INDEX_TYPE, file, embeddings)
       st.toast("PDF processed successfully. You can now start chatting.", icon="✅")
-      os.unlink(tmp_path)
     except Exception as e:
       st.error(f"Error processing PDF: {str(e)}", icon="🚨")
 
     query = st.text_input("Ask a question about the PDF", placeholder="Type your question here...")
-    if file and retriever and query:
-      try:
-        context = retriever.invoke(query)
-        prompt_template = ChatPromptTemplate.from_messages(
-          [("system", "You are a helpful assistant. Use the following context to answer the user's query: {context}"), ("user", "{query}")]
-        )
-        prompt = prompt_template.invoke({"context": context, "query": query})
-        llm = load_model()
-        response = llm.invoke(prompt)
-        st.info(response.content, icon="💬")
-      except Exception as e:
-        st.error(f"Error generating response: {str(e)}", icon="🚨")
+    if retriever and query:
+      answerQuestion(retriever, query, digest)
+
+
+def chatWithYourPDF():
+  load_credentials()
+  GOOGLE_API_KEY = os.environ.get("GOOGLE_API_KEY") or st.secrets.get("api_key", {}).get("GOOGLE_API_KEY")
+  try:
+    embedding_name, embeddings = loadEmbeddings(EMBEDDING_BACKEND, GOOGLE_API_KEY)
+  except Exception as e:
+    st.error(f"Error loading embeddings: {str(e)}", icon="🚨")
+    st.stop()
+
+  mode = st.radio("Mode", ["Single PDF", "Knowledge Base"], horizontal=True, label_visibility="collapsed")
+  if mode == "Knowledge Base":
+    knowledgeBase(embedding_name, embeddings)
+  else:
+    singlePDF(embedding_name, embeddings)
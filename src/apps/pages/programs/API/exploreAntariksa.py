@@ -1,12 +1,14 @@
 import datetime
 import os
+import unicodedata
 import webbrowser
 
-import requests
 import streamlit as st
 
 from src.helpers.checkKeyExist import isKeyExist
 from src.helpers.displayInstructions import showInstructions
+from src.helpers.httpClient import httpGet, httpGetJSON
+from src.helpers.responseCache import tieredCache
 
 api_guide = """### How to get your API Key:
 1. Visit [api.nasa.gov](https://api.nasa.gov/).
@@ -15,12 +17,17 @@ api_guide = """### How to get your API Key:
 4. Enter the API key in the input field.
 """
 
+SOLAR_SYSTEM_URL = "https://api.le-systeme-solaire.net/rest/bodies/"
+MARS_PHOTOS_URL = "https://api.nasa.gov/mars-photos/api/v1/rovers/curiosity/photos"
+MARS_PHOTOS_PER_PAGE = 12
+MARS_GRID_COLUMNS = 3
+
 
 def SpaceNews(NASA_API_KEY):
   date = st.date_input("What day would you like to know ?", max_value=datetime.date.today())
   URL = f"https://api.nasa.gov/planetary/apod?api_key={NASA_API_KEY}"
   params = {"date": str(date)}
-  data = requests.get(URL, params=params).json()
+  data = httpGet(URL, params=params).json()
 
   if "code" in data and data["code"] == 400:
     st.error(data["msg"], icon="🚨")
@@ -49,19 +56,34 @@ def SpaceNews(NASA_API_KEY):
   st.write(explanation)
 
 
+# Photos of a past sol never change, so each date is fetched once and then served from the response cache.
+@tieredCache("nasa:mars-photos", ttl=30 * 86400)
+def fetchMarsPhotos(date, NASA_API_KEY):
+  data = httpGetJSON(MARS_PHOTOS_URL, params={"earth_date": date, "api_key": NASA_API_KEY}, coalesce=True)
+  return [{"img_src": photo["img_src"], "camera": photo["camera"]["full_name"], "earth_date": photo["earth_date"]} for photo in data["photos"]]
+
+
 def MarsImage(NASA_API_KEY):
   date = st.date_input("What day would you like to know ?", min_value=datetime.date(2012, 8, 16), max_value=datetime.date(2024, 1, 21))
-  url = f"https://api.nasa.gov/mars-photos/api/v1/rovers/curiosity/photos?earth_date={date}&api_key={NASA_API_KEY}"
-  data = requests.get(url).json()
-  photos = data["photos"][0:]
   try:
-    for _index, photo in enumerate(photos):
-      camera_name = photo["camera"]["full_name"]
-      date_of_photo = photo["earth_date"]
-      img_url = photo["img_src"]
-      st.image(img_url, caption=f"Camera Name : {camera_name} | Date : {date_of_photo}")
+    photos = fetchMarsPhotos(str(date), NASA_API_KEY)
   except Exception:
+    st.error("API call not successful. Please try again later.", icon="🚨")
+    return
+  if not photos:
     st.error("No data found for the selected date!", icon="🚨")
+    return
+
+  # Only the current page is rendered, so the browser only downloads the images that are on screen.
+  pages = -(-len(photos) // MARS_PHOTOS_PER_PAGE)
+  page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=1, key=f"mars_page_{date}") if pages > 1 else 1
+  start = (page - 1) * MARS_PHOTOS_PER_PAGE
+  st.caption(f"Showing photos {start + 1}-{min(start + MARS_PHOTOS_PER_PAGE, len(photos))} of {len(photos)}")
+  visible = photos[start : start + MARS_PHOTOS_PER_PAGE]
+  for row in range(0, len(visible), MARS_GRID_COLUMNS):
+    for col, photo in zip(st.columns(MARS_GRID_COLUMNS), visible[row : row + MARS_GRID_COLUMNS], strict=False):
+      with col:
+        st.image(photo["img_src"], caption=f"Camera Name : {photo['camera']} | Date : {photo['earth_date']}", use_container_width=True)
 
 
 def Asteroids(NASA_API_KEY):
@@ -79,7 +101,7 @@ def Asteroids(NASA_API_KEY):
     st.stop()
 
   url = f"https://api.nasa.gov/neo/rest/v1/feed?start_date={start_date}&end_date={end_date}&api_key={NASA_API_KEY}"
-  data = requests.get(url).json()
+  data = httpGet(url).json()
 
   try:
     totalAstro = data["element_count"]
@@ -141,33 +163,130 @@ def Asteroids(NASA_API_KEY):
 
 @st.cache_data(ttl=86400)
 def fetchSolarBodiesData():
-  url = "https://api.le-systeme-solaire.net/rest/bodies/"
-  data = requests.get(url).json()
+  data = httpGet(SOLAR_SYSTEM_URL).json()
   return data
 
 
+def normalizeName(name):
+  # "Callisto", " callisto" and "CALLISTO" all refer to the same body; accents are dropped so "Pluton" ~ "Plutôn".
+  return "".join(c for c in unicodedata.normalize("NFKD", name or "") if c.isalnum()).lower()
+
+
+def massKg(body):
+  mass = body.get("mass")
+  return mass["massValue"] * 10 ** mass["massExponent"] if mass and mass.get("massValue") else None
+
+
+# Sortable columns: label -> (unit, value of a body or None when unknown).
+SOLAR_METRICS = {
+  "Mass": ("kg", massKg),
+  "Mean Radius": ("km", lambda body: body.get("meanRadius") or None),
+  "Gravity": ("m/s²", lambda body: body.get("gravity") or None),
+}
+
+
+@st.cache_resource(ttl=86400, show_spinner=False)
+def solarBodiesIndex():
+  """
+  Index the bulk /rest/bodies/ payload once per process, so that every lookup and ranking is a dict access or a scan
+  of a presorted column instead of a request.
+
+  Returns:
+    dict: "names" (sorted English names), "by_name" (normalized name or id -> body), "by_type" (bodyType -> bodies),
+    "moons_of" (planet id -> its moons) and "sorted" (metric label -> [(value, body)] largest first, unknowns left out).
+  """
+  bodies = sorted(fetchSolarBodiesData()["bodies"], key=lambda body: body["englishName"])
+  index = {"names": [body["englishName"] for body in bodies], "by_name": {}, "by_type": {}, "moons_of": {}, "sorted": {}}
+  for body in bodies:
+    index["by_name"].setdefault(normalizeName(body["englishName"]), body)
+    index["by_name"].setdefault(normalizeName(body["id"]), body)
+    index["by_type"].setdefault(body.get("bodyType") or "Unknown", []).append(body)
+    if body.get("aroundPlanet"):
+      index["moons_of"].setdefault(body["aroundPlanet"]["planet"], []).append(body)
+  for label, (_unit, value) in SOLAR_METRICS.items():
+    column = [(value(body), body) for body in bodies]
+    index["sorted"][label] = sorted([row for row in column if row[0] is not None], key=lambda row: row[0], reverse=True)
+  return index
+
+
+@tieredCache("nasa:images", ttl=86400)
+def fetchBodyImage(body):
+  items = httpGetJSON("https://images-api.nasa.gov/search", params={"q": body, "media_type": "image"}, coalesce=True)["collection"]["items"]
+  return items[0]["links"][0]["href"] if items and items[0].get("links") else None
+
+
+def rankSolarBodies(index, metric, body_type=None, orbiting=None, limit=10):
+  """
+  Largest bodies by a metric, e.g. rankSolarBodies(index, "Mean Radius", "Moon", orbiting="jupiter").
+
+  Args:
+    index (dict): From solarBodiesIndex().
+    metric (str): A SOLAR_METRICS label.
+    body_type (str, optional): Only bodies of this bodyType.
+    orbiting (str, optional): Only bodies orbiting this planet id.
+    limit (int): Number of rows.
+
+  Returns:
+    list: (value, body) pairs, largest first.
+  """
+  rows = []
+  for value, body in index["sorted"][metric]:
+    if body_type and body.get("bodyType") != body_type:
+      continue
+    if orbiting and (body.get("aroundPlanet") or {}).get("planet") != orbiting:
+      continue
+    rows.append((value, body))
+    if len(rows) == limit:
+      break
+  return rows
+
+
+def CompareSolarBodies(index):
+  col1, col2, col3 = st.columns(3)
+  with col1:
+    metric = st.selectbox("📏 Rank by", list(SOLAR_METRICS))
+  with col2:
+    body_type = st.selectbox("🪨 Body Type", [None] + sorted(index["by_type"]), format_func=lambda t: t or "All")
+  with col3:
+    planets = {planet: index["by_name"].get(planet, {}).get("englishName", planet) for planet in sorted(index["moons_of"])}
+    orbiting = st.selectbox("🪐 Orbiting", [None] + list(planets), format_func=lambda p: planets[p] if p else "Anything")
+  limit = st.slider("Number of bodies", min_value=3, max_value=50, value=10)
+
+  rows = rankSolarBodies(index, metric, body_type, orbiting, limit)
+  if not rows:
+    st.info("No body matches these filters.", icon="ℹ️")
+    return
+  unit = SOLAR_METRICS[metric][0]
+  table = [{"Body": body["englishName"], f"{metric} ({unit})": value, "Body Type": body.get("bodyType")} for value, body in rows]
+  st.bar_chart(table, x="Body", y=f"{metric} ({unit})", horizontal=True)
+  st.dataframe(table, use_container_width=True, hide_index=True)
+
+
 def SolarBodies():
   try:
-    data = fetchSolarBodiesData()
-    solarBodies = [body["englishName"] for body in data["bodies"]]
-    bodies = data["bodies"]
+    index = solarBodiesIndex()
 
     st.markdown("### 🌌 Solar System Explorer")
-    st.markdown(f"##### `Number of bodies in the Solar System: {len(bodies)}`")
+    st.markdown(f"##### `Number of bodies in the Solar System: {len(index['names'])}`")
 
-    body = st.selectbox("🔭 Select a Celestial Body", [None] + solarBodies)
+    view = st.radio("View", ["Explore a Body", "Compare & Rank"], horizontal=True, label_visibility="collapsed")
+    if view == "Compare & Rank":
+      CompareSolarBodies(index)
+      return
+
+    body = st.selectbox("🔭 Select a Celestial Body", [None] + index["names"])
     if body is None:
       st.stop()
-    body = body.replace(" ", "-")
-
-    url2 = f"https://api.le-systeme-solaire.net/rest/bodies/{body.lower()}"
-    url3 = f"https://images-api.nasa.gov/search?q={body.lower()}"
-    data2 = requests.get(url2).json()
-    data3 = requests.get(url3).json()
+    data2 = index["by_name"][normalizeName(body)]
 
     st.markdown(f"## 🪐 Data of {body}")
-    if data3["collection"]["items"]:
-      st.image(data3["collection"]["items"][0]["links"][0]["href"], caption=f"{body}")
+    # The image is decorative: a failed image search must not hide the body's data.
+    try:
+      image = fetchBodyImage(body.lower())
+    except Exception:
+      image = None
+    if image:
+      st.image(image, caption=f"{body}")
 
     col1, col2 = st.columns(2)
     with col1:
@@ -1,61 +1,65 @@
 import os
 
-import google.generativeai as genai
 import streamlit as st
 
+from src.helpers.chatSessions import addTurn, clearSession, loadSession, promptMessages
 from src.helpers.checkKeyExist import isKeyExist
+from src.helpers.currentUser import isSignedIn, userKey
 from src.helpers.displayInstructions import showInstructions
+from src.helpers.llmCache import cachedStreamChat
+from src.helpers.llmGateway import needsApiKey
 
 api_guide = """
 Obtain an API key from [Google](https://ai.google.dev/gemini-api) and Enter it here.
 """
 
-if "messages" not in st.session_state:
-  st.session_state.messages = []
+# Messages re-rendered on each rerun; older ones stay in the conversation store (and its summary).
+DISPLAY_MESSAGES = 50
+SYSTEM_PROMPT = "You are Jarvis, a helpful and concise assistant."
 
 
-def geminiINIT():
-  model = genai.GenerativeModel("gemini-1.5-flash")
-  chat = model.start_chat(history=[])
-  return chat
+def generateResponse(session, api_key: str, prompt: str):
+  with st.chat_message("ai"):
+    try:
+      messages = promptMessages(session, prompt, SYSTEM_PROMPT)
+      # Only opening questions (no earlier context) are matched semantically: later answers depend on the conversation.
+      scope = "opening" if len(messages) == 2 else None
+      response = st.write_stream(cachedStreamChat("chat", "gemini", messages, scope=scope, question=prompt, api_key=api_key))
+    except Exception as e:
+      st.error(f"Error generating response: {e}", icon="🚨")
+      return
+  addTurn(session, prompt, response, "gemini", api_key)
 
 
-def generateResponse(chat_instance: genai.ChatSession, prompt: str):
-  with st.chat_message("ai"):
-    response = chat_instance.send_message(prompt, stream=True)
-    for chunk in response:
-      try:
-        yield str(chunk.text)
-      except ValueError:
-        st.error("ValueError: You are not allowed to ask that kind of a prompt!")
-  st.session_state.messages.append({"role": "ai", "content": response.text})
-
-
-def displayHistory():
-  for message in st.session_state.messages:
-    with st.chat_message(message["role"]):
+def displayHistory(session):
+  with session["lock"]:
+    messages = session["messages"][-DISPLAY_MESSAGES:]
+    hidden = len(session["messages"]) - len(messages)
+  if hidden:
+    st.caption(f"{hidden} earlier messages are hidden. Jarvis still remembers them through the conversation summary.")
+  for message in messages:
+    with st.chat_message("user" if message["role"] == "user" else "ai"):
       st.write(message["content"])
 
 
 def genAIChatbot():
-  exists = isKeyExist("GEMINI_API_KEY", "api_key")
-  if not exists["GEMINI_API_KEY"]:
+  if needsApiKey("gemini") and not isKeyExist("GEMINI_API_KEY", "api_key")["GEMINI_API_KEY"]:
     showInstructions(markdown_text=api_guide, fields="GEMINI_API_KEY")
-    prompt = None
     st.stop()
 
-  GEMINI_API_KEY = st.secrets["api_key"]["GEMINI_API_KEY"] or os.environ["GEMINI_API_KEY"]
-  genai.configure(api_key=GEMINI_API_KEY)
+  GEMINI_API_KEY = st.secrets.get("api_key", {}).get("GEMINI_API_KEY") or os.environ.get("GEMINI_API_KEY")
+  # Signed-in users get their conversation back after a reload or restart; anonymous ones keep it for the tab.
+  session = loadSession(userKey(), persist=isSignedIn())
+  if st.button("Clear chat", icon="🧹"):
+    clearSession(session)
+
   prompt = st.chat_input("Let's chat!")
-  st.chat_message("ai")
-  st.write("Hi! How can I help you today?")
-
-  chat_instance = geminiINIT()
-  displayHistory()
-
-  if prompt != "" and prompt is not None:
-    user_message = st.chat_message("user")
-    st.session_state.messages.append({"role": "user", "content": prompt})
-    user_message.write(prompt)
-    response = generateResponse(chat_instance, prompt)
-    st.write_stream(response)
+  with st.chat_message("ai"):
+    st.write("Hi! How can I help you today?")
+
+  displayHistory(session)
+
+  if prompt:
+    with st.chat_message("user"):
+      st.write(prompt)
+    generateResponse(session, GEMINI_API_KEY, prompt)
@@ -1,11 +1,11 @@
 import os
 from datetime import datetime
 
-import requests
 import streamlit as st
 
 from src.helpers.checkKeyExist import isKeyExist
 from src.helpers.displayInstructions import showInstructions
+from src.helpers.httpClient import httpGet
 
 api_guide = """
 ### How to get your API Key:
@@ -97,7 +97,7 @@ def formatISODate(iso_date_str):
 def showHeadlines(API, required, country, category):
   news_headlines = []
   URL = f"https://newsapi.org/v2/{REQUIRED[required]}?country={COUNTRIES[country].lower()}&category={CATEGORIES[category]}&apiKey={API}"
-  response = requests.get(URL)
+  response = httpGet(URL)
   if response.status_code == 200:
     data = response.json()
     if data["totalResults"] == 0:
@@ -114,7 +114,7 @@ def showHeadlines(API, required, country, category):
 
 def showNews(API, required, query, sortby):
   URL = f"https://newsapi.org/v2/{REQUIRED[required]}?q={query}&sortBy={SORTBY[sortby]}&apiKey={API}"
-  response = requests.get(URL)
+  response = httpGet(URL)
   if response.status_code == 200:
     data = response.json()
     articles = data["articles"]
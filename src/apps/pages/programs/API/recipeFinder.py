@@ -1,10 +1,10 @@
 import os
 
-import requests
 import streamlit as st
 
 from src.helpers.checkKeyExist import isKeyExist
 from src.helpers.displayInstructions import showInstructions
+from src.helpers.httpClient import httpGet
 
 api_guide = """
 ### How to get your API Key:
@@ -18,7 +18,7 @@ api_guide = """
 def fetchRecipes(query):
   api_key = os.environ.get("SPOONACULAR_API_KEY", "") or st.secrets["api_key"]["SPOONACULAR_API_KEY"]
   api_url = f"https://api.spoonacular.com/recipes/complexSearch?query={query}&apiKey={api_key}"
-  response = requests.get(api_url)
+  response = httpGet(api_url)
   return response.json()
 
 
@@ -1,10 +1,11 @@
 import os
 
 import streamlit as st
-from groq import Groq
 
 from src.helpers.checkKeyExist import isKeyExist
 from src.helpers.displayInstructions import showInstructions
+from src.helpers.llmCache import cachedStreamChat
+from src.helpers.llmGateway import needsApiKey
 
 api_guide = """
 Get your Groq API Key
@@ -16,34 +17,28 @@ Get your Groq API Key
 
 
 def load_credentials():
+  if not needsApiKey("groq"):
+    return
   exists = isKeyExist("GROQ_API_KEY", "api_key")
   if not exists["GROQ_API_KEY"]:
     showInstructions(markdown_text=api_guide, fields="GROQ_API_KEY")
     st.stop()
 
 
-@st.cache_resource
-def load_summarizer():
-  """Initialize Groq client - replaces the transformers pipeline"""
-  api_key = os.environ.get("GROQ_API_KEY") or st.secrets["api_key"]["GROQ_API_KEY"]
-  return Groq(api_key=api_key)
+def summaryMessages(text):
+  return [
+    {"role": "system", "content": "You are a helpful assistant that summarizes text. Return only the content"},
+    {"role": "user", "content": f"Please provide a concise and short summary of the following text\n\n{text}"},
+  ]
 
 
 def textSummarization():
   load_credentials()
   user_input = st.text_area("Enter the text you'd like to summarize (minimum 50 words)", height=200)
   if st.button("Summarize") and len(user_input.split()) >= 50:
-    summarizer = load_summarizer()
-    with st.spinner("Summarizing..."):
-      chat_completion = summarizer.chat.completions.create(
-        messages=[
-          {"role": "system", "content": "You are a helpful assistant that summarizes text. Return only the content"},
-          {"role": "user", "content": f"Please provide a concise and short summary of the following text\n\n{user_input}"},
-        ],
-        model="llama-3.1-8b-instant",
-        max_tokens=150,
-        temperature=0.3,
-      )
-
-      summary_text = chat_completion.choices[0].message.content
-      st.info(summary_text, icon="ℹ️")
+    api_key = os.environ.get("GROQ_API_KEY") or st.secrets.get("api_key", {}).get("GROQ_API_KEY")
+    try:
+      with st.container(border=True):
+        st.write_stream(cachedStreamChat("summarize", "groq", summaryMessages(user_input), api_key=api_key, max_tokens=150, temperature=0.3))
+    except Exception as e:
+      st.error(f"Error generating summary: {e}", icon="🚨")
@@ -1,11 +1,10 @@
-import base64
 import os
 
-import google.generativeai as genai
 import streamlit as st
 
 from src.helpers.checkKeyExist import isKeyExist
 from src.helpers.displayInstructions import showInstructions
+from src.helpers.llmGateway import needsApiKey, streamChat
 
 api_guide = """
 To get started, obtain an API key from [Google - Gemini Vision API](https://makersuite.google.com/app/apikey)
@@ -17,13 +16,11 @@ def validate_file_size(file):
 
 
 def vision():
-  exists = isKeyExist("VISION_API_KEY", "api_key")
-  if not exists["VISION_API_KEY"]:
+  if needsApiKey("gemini") and not isKeyExist("VISION_API_KEY", "api_key")["VISION_API_KEY"]:
     showInstructions(markdown_text=api_guide, fields="VISION_API_KEY")
     st.stop()
 
-  api_key = st.secrets["api_key"]["VISION_API_KEY"] or os.environ["VISION_API_KEY"]
-  genai.configure(api_key=api_key)
+  api_key = st.secrets.get("api_key", {}).get("VISION_API_KEY") or os.environ.get("VISION_API_KEY")
 
   images = st.file_uploader("Upload Image Files", type=["jpg", "png", "webp", "heic", "heif"], accept_multiple_files=True)
 
@@ -35,10 +32,9 @@ def vision():
       st.stop()
 
     try:
-      encoded_images = [{"mime_type": "image/jpeg", "data": base64.b64encode(image.read()).decode("utf-8")} for image in images]
-      model = genai.GenerativeModel(model_name="gemini-1.5-flash")
-      response = model.generate_content(encoded_images + [prompt])
+      message = {"role": "user", "content": prompt, "images": [(image.type or "image/jpeg", image.getvalue()) for image in images]}
       st.subheader("Generated Response")
-      st.text_area("Output", value=response.text, height=300)
+      with st.container(border=True, height=300):
+        st.write_stream(streamChat("gemini", [message], api_key=api_key))
     except Exception as e:
       st.error(f"An error occurred: {e}", icon="🚨")
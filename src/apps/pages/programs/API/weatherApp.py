@@ -1,10 +1,10 @@
 import os
 
-import requests
 import streamlit as st
 
 from src.helpers.checkKeyExist import isKeyExist
 from src.helpers.displayInstructions import showInstructions
+from src.helpers.httpClient import httpGet
 
 api_guide = """### How to get your API Key:
 1. Visit [WeatherAPI.com](https://www.weatherapi.com/).
@@ -17,7 +17,7 @@ api_guide = """### How to get your API Key:
 def getWeather(api_key, city):
   try:
     url = f"http://api.weatherapi.com/v1/current.json?key={api_key}&q={city}"
-    response = requests.get(url)
+    response = httpGet(url)
     if response.status_code == 200:
       data = response.json()
       weather = {
@@ -1,8 +1,8 @@
-import requests
 import streamlit as st
 
 from src.helpers.checkKeyExist import isKeyExist
 from src.helpers.displayInstructions import showInstructions
+from src.helpers.httpClient import httpGet
 
 api_guide = """
 ### How to get your Wolfram Alpha API Key:
@@ -18,7 +18,7 @@ WOLFRAM_API_KEY = st.secrets["api_key"]["WOLFRAM_API_KEY"]
 
 def calculate_expression(query):
   params = {"input": query, "format": "image,plaintext", "output": "JSON", "appid": WOLFRAM_API_KEY}
-  response = requests.get(WOLFRAM_URL, params=params)
+  response = httpGet(WOLFRAM_URL, params=params)
   if response.status_code == 200:
     data = response.json()
     if "queryresult" in data and data["queryresult"]["success"]:
@@ -1,8 +1,15 @@
 import random
 
-import requests
 import streamlit as st
 
+from src.helpers.httpClient import httpGet, httpGetJSON
+from src.helpers.responseCache import tieredCache
+
+
+@tieredCache("opentdb:categories", ttl=86400)
+def fetchCategories():
+  return httpGetJSON("https://opentdb.com/api_category.php", coalesce=True)["trivia_categories"]
+
 
 def quizGame():
   st.title("Dynamic Quiz Generator")
@@ -17,12 +24,12 @@ def quizGame():
     st.session_state.shuffled_options = {}
 
   st.sidebar.header("Quiz Options")
-  categories_url = "https://opentdb.com/api_category.php"
-  response = requests.get(categories_url)
-  categories_data = response.json()
+  try:
+    categories = fetchCategories()
+  except Exception:
+    categories = None
 
-  if response.status_code == 200 and "trivia_categories" in categories_data:
-    categories = categories_data["trivia_categories"]
+  if categories:
     category_dict = {cat["name"]: cat["id"] for cat in categories}
 
     selected_category = st.sidebar.selectbox("Select a category", list(category_dict.keys()))
@@ -35,7 +42,7 @@ def quizGame():
   if st.sidebar.button("Start Quiz"):
     num_questions = 5
     quiz_url = f"https://opentdb.com/api.php?amount={num_questions}&category={selected_category_id}&difficulty={difficulty}&type=multiple"
-    quiz_response = requests.get(quiz_url)
+    quiz_response = httpGet(quiz_url)
     quiz_data = quiz_response.json()
 
     if quiz_response.status_code == 200 and quiz_data["response_code"] == 0:
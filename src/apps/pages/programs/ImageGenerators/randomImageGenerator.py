@@ -1,8 +1,9 @@
 import base64
 
-import requests
 import streamlit as st
 
+from src.helpers.httpClient import httpGet
+
 resolutions = {
   "Instagram": {
     "Square": (1080, 1080),
@@ -64,7 +65,7 @@ def getImage(height, width, isGrayscale, blur):
   URL = f"https://picsum.photos/{width}/{height}" + ("?" + "&".join(params) if params else "")
 
   try:
-    response = requests.get(URL)
+    response = httpGet(URL)
     if response.status_code == 200:
       fileFormat = response.headers.get("Content-Type", "image/jpeg").split("/")[-1]
       encoded_image = base64.b64encode(response.content).decode()
@@ -1,9 +1,10 @@
-import requests
 import streamlit as st
 
+from src.helpers.httpClient import httpGet
+
 
 def advice():
-  res = requests.get("https://api.adviceslip.com/advice").json()
+  res = httpGet("https://api.adviceslip.com/advice").json()
   advice_text = res["slip"]["advice"]
   st.markdown(f"#### 💡 **{advice_text}**")
 
@@ -1,6 +1,8 @@
-import requests
 import streamlit as st
 
+from src.helpers.httpClient import httpGetJSON
+from src.helpers.responseCache import tieredCache
+
 BASE_URL = "https://api.jikan.moe/v4"
 ALL_GENRES = {
   "Action": 1,
@@ -52,105 +54,105 @@ ALL_GENRES = {
 }
 
 
+# Rankings move slowly and Jikan is heavily rate limited, so every user shares one copy for an hour.
+@tieredCache("jikan:top-anime", ttl=3600)
+def fetch_top_animes():
+  return httpGetJSON(f"{BASE_URL}/top/anime", coalesce=True)["data"][:10]
+
+
+@tieredCache("jikan:top-characters", ttl=3600)
+def fetch_top_characters():
+  return httpGetJSON(f"{BASE_URL}/top/characters", coalesce=True)["data"][:10]
+
+
+@tieredCache("jikan:anime-by-genres", ttl=3600)
+def fetch_animes_by_genres(genres, order, sort):
+  return httpGetJSON(f"{BASE_URL}/anime", params={"genres": genres, "order_by": order, "sort": sort}, coalesce=True)["data"][:10]
+
+
 def top_animes():
-  URL = f"{BASE_URL}/top/anime"
   try:
-    response = requests.get(URL)
-    data = response.json()
-    if response.status_code == 200:
-      st.toast("Top 10 Animes", icon="✅")
-      for anime_details in data["data"][:10]:
-        st.divider()
-        image = anime_details["images"]["jpg"]["large_image_url"]
-        link_url = anime_details["url"]
-        status = anime_details["status"] if anime_details["status"] else "--"
-        score = str(anime_details["score"]) + "/10" if anime_details["score"] else "--"
-        synopsis = anime_details["synopsis"] if anime_details["synopsis"] else "--"
-        season = anime_details["season"] if anime_details["season"] else "--"
-        year = anime_details["year"] if anime_details["year"] else "--"
-        anime_genres = "Genre: " + ", ".join([genre_name["name"] for genre_name in anime_details["genres"]])
-
-        col1, col2 = st.columns([1, 2])
-        with col1:
-          st.image(image, caption=anime_details["title"])
-        with col2:
-          st.markdown(f"##### 😀 [{anime_details['title']}]({link_url})")
-          st.write(f"{score} &nbsp; | &nbsp;  {year} &nbsp;  |  &nbsp; {season}")
-          st.write(f"{anime_genres}")
-          st.write(f"**Status**: {status}")
-          with st.expander("Synopsis", expanded=False):
-            st.write(synopsis)
-    else:
-      st.error("API call not successful. Please try again later.", icon="🚨")
+    animes = fetch_top_animes()
+    st.toast("Top 10 Animes", icon="✅")
+    for anime_details in animes:
+      st.divider()
+      image = anime_details["images"]["jpg"]["large_image_url"]
+      link_url = anime_details["url"]
+      status = anime_details["status"] if anime_details["status"] else "--"
+      score = str(anime_details["score"]) + "/10" if anime_details["score"] else "--"
+      synopsis = anime_details["synopsis"] if anime_details["synopsis"] else "--"
+      season = anime_details["season"] if anime_details["season"] else "--"
+      year = anime_details["year"] if anime_details["year"] else "--"
+      anime_genres = "Genre: " + ", ".join([genre_name["name"] for genre_name in anime_details["genres"]])
+
+      col1, col2 = st.columns([1, 2])
+      with col1:
+        st.image(image, caption=anime_details["title"])
+      with col2:
+        st.markdown(f"##### 😀 [{anime_details['title']}]({link_url})")
+        st.write(f"{score} &nbsp; | &nbsp;  {year} &nbsp;  |  &nbsp; {season}")
+        st.write(f"{anime_genres}")
+        st.write(f"**Status**: {status}")
+        with st.expander("Synopsis", expanded=False):
+          st.write(synopsis)
   except Exception as e:
-    st.error(f"An unexpected error occurred: {e}", icon="🚨")
+    st.error(f"API call not successful. Please try again later. ({e})", icon="🚨")
 
 
 def top_characters():
-  URL = f"{BASE_URL}/top/characters"
   try:
-    response = requests.get(URL)
-    data = response.json()
-    if response.status_code == 200:
-      st.toast("Top 10 Characters", icon="✅")
-      character_map = {character["name"]: character for character in data["data"][:10] if character}
-      for character_name, character_details in character_map.items():
-        st.divider()
-        image_url = character_details["images"]["jpg"]["image_url"]
-        link_url = character_details["url"]
-        about = character_details["about"] if character_details["about"] else "--"
-        nicknames = ", ".join(
-          [name for name in character_details["nicknames"]] + [character_details["name_kanji"]] if character_details["name_kanji"] else []
-        )
-
-        col1, col2 = st.columns([1, 2])
-        with col1:
-          st.image(image_url, caption=character_name)
-        with col2:
-          st.markdown(f"##### 😎 [{character_name}]({link_url})")
-          st.write(f"{nicknames}")
-          with st.expander("About", expanded=False):
-            st.write(about)
-    else:
-      st.error("API call not successful. Please try again later.", icon="🚨")
+    characters = fetch_top_characters()
+    st.toast("Top 10 Characters", icon="✅")
+    character_map = {character["name"]: character for character in characters if character}
+    for character_name, character_details in character_map.items():
+      st.divider()
+      image_url = character_details["images"]["jpg"]["image_url"]
+      link_url = character_details["url"]
+      about = character_details["about"] if character_details["about"] else "--"
+      nicknames = ", ".join(
+        [name for name in character_details["nicknames"]] + [character_details["name_kanji"]] if character_details["name_kanji"] else []
+      )
+
+      col1, col2 = st.columns([1, 2])
+      with col1:
+        st.image(image_url, caption=character_name)
+      with col2:
+        st.markdown(f"##### 😎 [{character_name}]({link_url})")
+        st.write(f"{nicknames}")
+        with st.expander("About", expanded=False):
+          st.write(about)
   except Exception as e:
-    st.error(f"An unexpected error occurred: {e}", icon="🚨")
+    st.error(f"API call not successful. Please try again later. ({e})", icon="🚨")
 
 
 def get_animes_by_genres(selected_genres, order, sort):
   genres = ",".join([str(ALL_GENRES[genre]) for genre in selected_genres])
-  query = f"?genres={genres}&order_by={order}&sort={sort}"
-  URL = f"{BASE_URL}/anime{query}"
   try:
-    response = requests.get(URL)
-    data = response.json()
-    if response.status_code == 200:
-      st.toast("Anime By Genres", icon="✅")
-      for anime_details in data["data"][:10]:
-        st.divider()
-        image = anime_details["images"]["jpg"]["large_image_url"]
-        link_url = anime_details["url"]
-        status = anime_details["status"] if anime_details["status"] else "--"
-        score = str(anime_details["score"]) + "/10" if anime_details["score"] else "--"
-        synopsis = anime_details["synopsis"] if anime_details["synopsis"] else "--"
-        season = anime_details["season"] if anime_details["season"] else "--"
-        year = anime_details["year"] if anime_details["year"] else "--"
-        anime_genres = "Genre: " + ", ".join([genre_name["name"] for genre_name in anime_details["genres"]])
-
-        col1, col2 = st.columns([1, 2])
-        with col1:
-          st.image(image, caption=anime_details["title"])
-        with col2:
-          st.markdown(f"##### 👉 [{anime_details['title']}]({link_url})")
-          st.write(f"{score} &nbsp; | &nbsp;  {year} &nbsp;  |  &nbsp; {season}")
-          st.write(f"{anime_genres}")
-          st.write(f"**Status**: {status}")
-          with st.expander("Synopsis", expanded=False):
-            st.write(synopsis)
-    else:
-      st.error("API call not successful. Please try again later.", icon="🚨")
+    animes = fetch_animes_by_genres(genres, order, sort)
+    st.toast("Anime By Genres", icon="✅")
+    for anime_details in animes:
+      st.divider()
+      image = anime_details["images"]["jpg"]["large_image_url"]
+      link_url = anime_details["url"]
+      status = anime_details["status"] if anime_details["status"] else "--"
+      score = str(anime_details["score"]) + "/10" if anime_details["score"] else "--"
+      synopsis = anime_details["synopsis"] if anime_details["synopsis"] else "--"
+      season = anime_details["season"] if anime_details["season"] else "--"
+      year = anime_details["year"] if anime_details["year"] else "--"
+      anime_genres = "Genre: " + ", ".join([genre_name["name"] for genre_name in anime_details["genres"]])
+
+      col1, col2 = st.columns([1, 2])
+      with col1:
+        st.image(image, caption=anime_details["title"])
+      with col2:
+        st.markdown(f"##### 👉 [{anime_details['title']}]({link_url})")
+        st.write(f"{score} &nbsp; | &nbsp;  {year} &nbsp;  |  &nbsp; {season}")
+        st.write(f"{anime_genres}")
+        st.write(f"**Status**: {status}")
+        with st.expander("Synopsis", expanded=False):
+          st.write(synopsis)
   except Exception as e:
-    st.error(f"An unexpected error occurred: {e}", icon="🚨")
+    st.error(f"API call not successful. Please try again later. ({e})", icon="🚨")
 
 
 def anime():
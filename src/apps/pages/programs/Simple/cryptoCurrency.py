@@ -1,7 +1,9 @@
 import plotly.express as px
-import requests
 import streamlit as st
 
+from src.helpers.httpClient import httpGet, httpGetJSON
+from src.helpers.responseCache import tieredCache
+
 BASE_URL = "https://api.coingecko.com/api/v3"
 
 
@@ -17,13 +19,18 @@ def format_price_change(percentage_change):
     return f"🔻 {value}%"
 
 
+@tieredCache("coingecko:trending", ttl=300)
+def fetchTrendingAssets():
+  return httpGetJSON(f"{BASE_URL}/search/trending", coalesce=True)
+
+
 def showTrendingAssets():
-  response = requests.get(f"{BASE_URL}/search/trending")
-  if response.status_code != 200:
+  try:
+    data = fetchTrendingAssets()
+  except Exception:
     st.error("API call not successful. Please try again later.", icon="🚨")
     st.stop()
 
-  data = response.json()
   asset_type = st.selectbox("Select an asset:", ["Cryptocurrency", "NFTs", "Categories"])
   st.divider()
 
@@ -76,26 +83,18 @@ def showTrendingAssets():
       st.info("No trending categories found.", icon="ℹ️")
 
 
-@st.cache_data(ttl=86400)
+@tieredCache("coingecko:supported-currencies", ttl=86400)
 def getSupportedCurrencies():
-  response = requests.get(f"{BASE_URL}/simple/supported_vs_currencies")
-  if response.status_code == 200:
-    return response.json()
-  else:
-    st.error("API call not successful. Please try again later.", icon="🚨")
+  return httpGetJSON(f"{BASE_URL}/simple/supported_vs_currencies", coalesce=True)
 
 
-@st.cache_data(ttl=86400)
+@tieredCache("coingecko:coins", ttl=86400)
 def getSupportedCoins():
-  response = requests.get(f"{BASE_URL}/coins/list")
-  if response.status_code == 200:
-    return [coin["id"] for coin in response.json()]
-  else:
-    st.error("API call not successful. Please try again later.", icon="🚨")
+  return [coin["id"] for coin in httpGetJSON(f"{BASE_URL}/coins/list", coalesce=True)]
 
 
 def searchCryptocurrency(query):
-  response = requests.get(f"{BASE_URL}/search?query={query}")
+  response = httpGet(f"{BASE_URL}/search?query={query}")
   if response.status_code == 200:
     data = response.json()
     results = data["coins"]
@@ -116,7 +115,7 @@ def searchCryptocurrency(query):
 
 
 def cryptoConversion(from_coin, to_coin):
-  response = requests.get(f"{BASE_URL}/simple/price?ids={from_coin}&vs_currencies={to_coin}")
+  response = httpGet(f"{BASE_URL}/simple/price?ids={from_coin}&vs_currencies={to_coin}")
   if response.status_code == 200:
     data = response.json()
     price = data[from_coin][to_coin]
@@ -125,88 +124,103 @@ def cryptoConversion(from_coin, to_coin):
     st.error("API call not successful. Please try again later.", icon="🚨")
 
 
+@tieredCache("coingecko:markets", ttl=120)
+def fetchTopCryptocurrency():
+  return httpGetJSON(f"{BASE_URL}/coins/markets?vs_currency=usd&order=market_cap_desc&per_page=10", coalesce=True)
+
+
 def showTopCryptocurrency():
-  response = requests.get(f"{BASE_URL}/coins/markets?vs_currency=usd&order=market_cap_desc&per_page=10")
-  if response.status_code == 200:
-    data = response.json()
-    st.divider()
-    for coin in data:
-      col1, col2 = st.columns([1, 3])
-      with col1:
-        st.image(coin["image"])
-      with col2:
-        st.subheader(f"{coin['name']} ({coin['symbol'].upper()})")
-        st.write(f"**Current Price**: ${coin['current_price']:,.2f}")
-        st.write(f"**Market Cap**: ${coin['market_cap']:,.0f}")
-        st.write(f"**24h Price Change**: {format_price_change(coin['price_change_percentage_24h'])}")
-        st.divider()
-  else:
+  try:
+    data = fetchTopCryptocurrency()
+  except Exception:
     st.error("API call not successful. Please try again later.", icon="🚨")
+    return
+  st.divider()
+  for coin in data:
+    col1, col2 = st.columns([1, 3])
+    with col1:
+      st.image(coin["image"])
+    with col2:
+      st.subheader(f"{coin['name']} ({coin['symbol'].upper()})")
+      st.write(f"**Current Price**: ${coin['current_price']:,.2f}")
+      st.write(f"**Market Cap**: ${coin['market_cap']:,.0f}")
+      st.write(f"**24h Price Change**: {format_price_change(coin['price_change_percentage_24h'])}")
+      st.divider()
+
+
+@tieredCache("coingecko:global", ttl=300)
+def fetchCryptoMarketOverview():
+  return httpGetJSON(f"{BASE_URL}/global", coalesce=True)
 
 
 def showCryptoMarketOverview():
-  response = requests.get(f"{BASE_URL}/global")
-  if response.status_code == 200:
-    data = response.json()
-    st.divider()
-    col1, col2, col3, col4 = st.columns(4)
-    with col1:
-      st.metric(label="Active Cryptocurrencies", value=data["data"]["active_cryptocurrencies"])
-    with col2:
-      st.metric(label="Ongoing ICOs", value=data["data"]["ongoing_icos"])
-    with col3:
-      st.metric(label="Ended ICOs", value=data["data"]["ended_icos"])
-    with col4:
-      st.metric(label="Markets", value=data["data"]["markets"])
-
-    st.info(f"Market Capitalization Change (24h) {format_price_change(data['data']['market_cap_change_percentage_24h_usd'])}", icon="ℹ️")
-
-    coins = list(data["data"]["total_volume"].keys())
-    volume = list(data["data"]["total_volume"].values())
-
-    coin_volume_pairs = list(zip(coins, volume, strict=False))
-    top_10_coin_volume_pairs = sorted(coin_volume_pairs, key=lambda x: x[1], reverse=True)[:10]
-
-    top_10_coins = [coin for coin, _ in top_10_coin_volume_pairs]
-    top_10_volumes = [vol for _, vol in top_10_coin_volume_pairs]
-    top_10_volume_percentages = [vol / sum(top_10_volumes) * 100 for vol in top_10_volumes]
-
-    st.plotly_chart(
-      px.pie(
-        names=top_10_coins,
-        values=top_10_volume_percentages,
-        title="Cryptocurrency Volume Dominance",
-        hole=0.3,
-      )
+  try:
+    data = fetchCryptoMarketOverview()
+  except Exception:
+    st.error("API call not successful. Please try again later.", icon="🚨")
+    return
+  st.divider()
+  col1, col2, col3, col4 = st.columns(4)
+  with col1:
+    st.metric(label="Active Cryptocurrencies", value=data["data"]["active_cryptocurrencies"])
+  with col2:
+    st.metric(label="Ongoing ICOs", value=data["data"]["ongoing_icos"])
+  with col3:
+    st.metric(label="Ended ICOs", value=data["data"]["ended_icos"])
+  with col4:
+    st.metric(label="Markets", value=data["data"]["markets"])
+
+  st.info(f"Market Capitalization Change (24h) {format_price_change(data['data']['market_cap_change_percentage_24h_usd'])}", icon="ℹ️")
+
+  coins = list(data["data"]["total_volume"].keys())
+  volume = list(data["data"]["total_volume"].values())
+
+  coin_volume_pairs = list(zip(coins, volume, strict=False))
+  top_10_coin_volume_pairs = sorted(coin_volume_pairs, key=lambda x: x[1], reverse=True)[:10]
+
+  top_10_coins = [coin for coin, _ in top_10_coin_volume_pairs]
+  top_10_volumes = [vol for _, vol in top_10_coin_volume_pairs]
+  top_10_volume_percentages = [vol / sum(top_10_volumes) * 100 for vol in top_10_volumes]
+
+  st.plotly_chart(
+    px.pie(
+      names=top_10_coins,
+      values=top_10_volume_percentages,
+      title="Cryptocurrency Volume Dominance",
+      hole=0.3,
     )
-    st.plotly_chart(
-      px.pie(
-        names=[coin for coin in data["data"]["market_cap_percentage"]],
-        values=[data["data"]["market_cap_percentage"][coin] for coin in data["data"]["market_cap_percentage"]],
-        title="Cryptocurrency Market Capitalization Dominance",
-        hole=0.3,
-      )
+  )
+  st.plotly_chart(
+    px.pie(
+      names=[coin for coin in data["data"]["market_cap_percentage"]],
+      values=[data["data"]["market_cap_percentage"][coin] for coin in data["data"]["market_cap_percentage"]],
+      title="Cryptocurrency Market Capitalization Dominance",
+      hole=0.3,
     )
-  else:
-    st.error("API call not successful. Please try again later.", icon="🚨")
+  )
+
+
+@tieredCache("coingecko:public-treasury", ttl=3600)
+def fetchCompanyHoldings():
+  return httpGetJSON(f"{BASE_URL}/companies/public_treasury/bitcoin", coalesce=True)
 
 
 def showCompanyHoldings():
-  response = requests.get(f"{BASE_URL}/companies/public_treasury/bitcoin")
-  if response.status_code == 200:
-    data = response.json()
-    st.divider()
-    st.subheader("🅱️ Bitcoin (BTC) Holdings")
-    col1, col2, col3 = st.columns(3)
-    col1.metric(label="Total Holdings", value=data["total_holdings"])
-    col2.metric(label="Total Value (USD)", value=f"${data['total_value_usd']:.2f}")
-    col3.metric(label="Market Cap Dominance", value=f"{data['market_cap_dominance']:.2f}%")
-
-    st.divider()
-    st.subheader("🅱️ Companies Holding Bitcoin")
-    st.dataframe(data["companies"])
-  else:
+  try:
+    data = fetchCompanyHoldings()
+  except Exception:
     st.error("API call not successful. Please try again later.", icon="🚨")
+    return
+  st.divider()
+  st.subheader("🅱️ Bitcoin (BTC) Holdings")
+  col1, col2, col3 = st.columns(3)
+  col1.metric(label="Total Holdings", value=data["total_holdings"])
+  col2.metric(label="Total Value (USD)", value=f"${data['total_value_usd']:.2f}")
+  col3.metric(label="Market Cap Dominance", value=f"{data['market_cap_dominance']:.2f}%")
+
+  st.divider()
+  st.subheader("🅱️ Companies Holding Bitcoin")
+  st.dataframe(data["companies"])
 
 
 def cryptoCurrency():
@@ -221,8 +235,12 @@ def cryptoCurrency():
     showTrendingAssets()
 
   elif option == "Exchange Rates":
-    SUPPORTED_CURRENCIES = getSupportedCurrencies()
-    SUPPORTED_COINS = getSupportedCoins()
+    try:
+      SUPPORTED_CURRENCIES = getSupportedCurrencies()
+      SUPPORTED_COINS = getSupportedCoins()
+    except Exception:
+      st.error("API call not successful. Please try again later.", icon="🚨")
+      st.stop()
     col1, col2 = st.columns(2)
     with col1:
       from_currency = st.selectbox("From currency", options=SUPPORTED_COINS)
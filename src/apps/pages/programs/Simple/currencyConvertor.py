@@ -1,19 +1,24 @@
-import requests
 import streamlit as st
 
+from src.helpers.httpClient import httpGet, httpGetJSON
+from src.helpers.responseCache import tieredCache
+
+
+@tieredCache("frankfurter:currencies", ttl=86400)
+def fetch_currencies():
+  return httpGetJSON("https://api.frankfurter.app/currencies", coalesce=True)
+
 
 def get_exchange_rates():
-  url = "https://api.frankfurter.app/currencies"
-  response = requests.get(url)
-  if response.status_code == 200:
-    return response.json()
-  else:
+  try:
+    return fetch_currencies()
+  except Exception:
     return {}
 
 
 def convert_currency(amount, from_currency, to_currency):
   url = f"https://api.frankfurter.app/latest?amount={amount}&from={from_currency}&to={to_currency}"
-  response = requests.get(url)
+  response = httpGet(url)
   if response.status_code == 200:
     return response.json()
   else:
@@ -1,12 +1,11 @@
-from json import loads
-
 import streamlit as st
-from requests import get
+
+from src.helpers.httpClient import httpGet
 
 
 def fact():
-  response = get("https://uselessfacts.jsph.pl/api/v2/facts/random")
-  fact = loads(response.text)["text"].title()
+  response = httpGet("https://uselessfacts.jsph.pl/api/v2/facts/random")
+  fact = response.json()["text"].title()
   st.markdown(f"#### 🤔 **{fact}**")
 
   if st.button("🔄 Reload Fact"):
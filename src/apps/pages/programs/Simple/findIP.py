@@ -1,11 +1,12 @@
 import pyperclip
-import requests
 import streamlit as st
 
+from src.helpers.httpClient import httpGet
+
 
 def get_ip(url):
   try:
-    response = requests.get(url, timeout=5)
+    response = httpGet(url, timeout=5)
     response.raise_for_status()
     return response.json().get("ip", "N/A")
   except Exception as e:
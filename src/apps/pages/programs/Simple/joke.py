@@ -1,13 +1,12 @@
-from json import loads
-
 import streamlit as st
-from requests import get
+
+from src.helpers.httpClient import httpGet
 
 
 def joke():
-  response = get("https://official-joke-api.appspot.com/random_joke")
-  joke_question = loads(response.text)["setup"].title()
-  joke_response = loads(response.text)["punchline"].title()
+  response = httpGet("https://official-joke-api.appspot.com/random_joke").json()
+  joke_question = response["setup"].title()
+  joke_response = response["punchline"].title()
   st.markdown(f"#### 🤔 **{joke_question}**")
   st.markdown(f"> #### **{joke_response}**")
 
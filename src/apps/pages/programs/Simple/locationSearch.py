@@ -1,10 +1,11 @@
-import requests
 import streamlit as st
 
+from src.helpers.httpClient import httpGet
+
 
 def fetch_location_from_ip(ip_address):
   url = f"http://ip-api.com/json/{ip_address}"
-  response = requests.get(url)
+  response = httpGet(url)
   data = response.json()
 
   if data.get("status") == "success":
@@ -1,9 +1,10 @@
-import requests
 import streamlit as st
 
+from src.helpers.httpClient import httpGet
+
 
 def get_quote():
-  response = requests.get("https://zenquotes.io/api/today")
+  response = httpGet("https://zenquotes.io/api/today")
   if response.status_code == 200:
     return response.json()[0]
   else:
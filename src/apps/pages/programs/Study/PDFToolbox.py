@@ -1,107 +1,248 @@
+import io
+import os
+import time
+
 import PyPDF2
 import streamlit as st
 
+from src.helpers.jobQueue import ACTIVE_STATES, cancelJob, getJob, jobResult, submitJob
+from src.helpers.pdfIngest import documentDigest, extractPageRange, pageCount, temporaryPDF
+from src.helpers.pdfOutput import readBuffer, spooledPDF
+from src.helpers.pdfText import requestDocument, searchDocument
+
+
+def uploadDigest(file):
+  # Hash each upload once per session rather than on every rerun.
+  digests = st.session_state.setdefault("pdf_digests", {})
+  if file.file_id not in digests:
+    digests[file.file_id] = documentDigest(file.getvalue())
+  return digests[file.file_id]
+
+
+@st.fragment(run_every=1)
+def pollExtraction(job_id):
+  job = getJob(job_id)
+  if job and job["status"] in ACTIVE_STATES:
+    st.progress(job["progress"], text=f"Extracting text in the background: {job['message'] or 'queued'}")
+  else:
+    st.rerun()
+
+
+def showExtraction(job_id):
+  job = getJob(job_id)
+  if job and job["status"] == "failed":
+    st.error(f"Text extraction failed: {job['error']}", icon="🚫")
+  else:
+    pollExtraction(job_id)
+
+
+def showPageText(text):
+  if text:
+    st.write(text)
+  else:
+    st.warning("No text found on this page", icon="⚠️")
+
 
 def readPDF():
   file = st.file_uploader("Upload a PDF file", type=["pdf"])
   if file:
-    reader = PyPDF2.PdfReader(file)
-    numPage = st.number_input("From which page to start reading?", format="%d", min_value=1, max_value=len(reader.pages))
-    page = reader.pages[numPage - 1]
-    text = page.extract_text()
-    if text:
-      st.write(text)
-    else:
-      st.warning("No text found on this page", icon="⚠️")
+    document, job_id = requestDocument(uploadDigest(file), file.getvalue())
+    if document is None:
+      showExtraction(job_id)
+      # Until the background extraction is done, read the requested page straight from the file.
+      with temporaryPDF(file.getvalue()) as path:
+        numPage = st.number_input("From which page to start reading?", format="%d", min_value=1, max_value=pageCount(path))
+        showPageText(extractPageRange(path, numPage - 1, numPage)[0])
+      return
+
+    pages = document["pages"]
+    numPage = st.number_input("From which page to start reading?", format="%d", min_value=1, max_value=max(1, len(pages)))
+    showPageText(pages[numPage - 1] if pages else "")
+    text = "\n\n".join(f"--- Page {page + 1} ---\n{page_text}" for page, page_text in enumerate(pages))
+    st.download_button("Download text of all pages", text, file_name=f"{os.path.splitext(file.name)[0]}.txt")
+
+
+def searchPDF():
+  file = st.file_uploader("Upload a PDF file to search", type=["pdf"])
+  if file:
+    document, job_id = requestDocument(uploadDigest(file), file.getvalue())
+    if document is None:
+      showExtraction(job_id)
+      return
+    query = st.text_input("Search for", placeholder="Words that must all appear on the page")
+    if query:
+      start = time.perf_counter()
+      results = searchDocument(document, query)
+      st.caption(f"{len(results)} matching pages (best first) in {(time.perf_counter() - start) * 1000:.1f} ms")
+      for result in results:
+        st.markdown(f"**Page {result['page'] + 1}** — {result['snippet']}")
+      if not results:
+        st.info("No page contains all of these words.", icon="🔍")
+
+
+def copyPages(progress, reader, writer, rotate=None, done=0, total=None):
+  """Copy every page of reader into writer, reporting progress (and honouring cancellation) page by page."""
+  total = total or len(reader.pages)
+  for page in reader.pages:
+    if rotate:
+      page.rotate(rotate)
+    writer.add_page(page)
+    done += 1
+    progress(done, total, f"Page {done}/{total}")
+  return done
+
+
+def mergeJob(progress, files):
+  readers = [PyPDF2.PdfReader(io.BytesIO(data)) for data in files]
+  total = sum(len(reader.pages) for reader in readers)
+  pdf_writer = PyPDF2.PdfWriter()
+  done = 0
+  for reader in readers:
+    done = copyPages(progress, reader, pdf_writer, done=done, total=total)
+  progress(total, total, "Writing merged PDF")
+  return spooledPDF(pdf_writer)
+
+
+def splitJob(progress, data, start_page, end_page):
+  pdf_reader = PyPDF2.PdfReader(io.BytesIO(data))
+  pdf_writer = PyPDF2.PdfWriter()
+  total = end_page - start_page + 1
+  for done, i in enumerate(range(start_page - 1, end_page), start=1):
+    pdf_writer.add_page(pdf_reader.pages[i])
+    progress(done, total, f"Page {done}/{total}")
+  return spooledPDF(pdf_writer)
+
+
+def rotateJob(progress, data, angle):
+  pdf_writer = PyPDF2.PdfWriter()
+  copyPages(progress, PyPDF2.PdfReader(io.BytesIO(data)), pdf_writer, rotate=angle)
+  return spooledPDF(pdf_writer)
+
+
+def encryptJob(progress, data, password):
+  pdf_writer = PyPDF2.PdfWriter()
+  copyPages(progress, PyPDF2.PdfReader(io.BytesIO(data)), pdf_writer)
+  progress(1, 1, "Encrypting")
+  pdf_writer.encrypt(password)
+  return spooledPDF(pdf_writer)
+
+
+def decryptJob(progress, data, password):
+  pdf_reader = PyPDF2.PdfReader(io.BytesIO(data))
+  if not pdf_reader.decrypt(password):
+    raise ValueError("Incorrect password")
+  pdf_writer = PyPDF2.PdfWriter()
+  copyPages(progress, pdf_reader, pdf_writer)
+  return spooledPDF(pdf_writer)
+
+
+def startJob(label, file_name, fn, *args):
+  # Uploads are copied to bytes first: the job outlives this script run, and the uploader may drop the file.
+  job_id = submitJob(label, fn, *args)
+  st.session_state.setdefault("pdf_jobs", []).append({"id": job_id, "file_name": file_name})
+  st.toast(f"{label} started. You can keep working while it runs.", icon="⏳")
+
+
+def dismissJob(job_id):
+  cancelJob(job_id)
+  st.session_state["pdf_jobs"] = [entry for entry in st.session_state.get("pdf_jobs", []) if entry["id"] != job_id]
+
+
+def renderJobs():
+  """Show this session's PDF jobs. Returns True while any of them is still queued or running."""
+  active = False
+  for entry in list(st.session_state.get("pdf_jobs", [])):
+    job = getJob(entry["id"])
+    if job is None:
+      # Expired from the result store.
+      st.session_state["pdf_jobs"].remove(entry)
+      continue
+    with st.container(border=True):
+      st.write(f"**{job['label']}**")
+      if job["status"] in ACTIVE_STATES:
+        active = True
+        st.progress(job["progress"], text=job["message"] or job["status"].capitalize())
+        st.button("Cancel", key=f"cancel-{job['id']}", on_click=cancelJob, args=(job["id"],))
+        continue
+      if job["status"] == "done":
+        # Read once and kept with the entry (dropped with it on dismiss or expiry): the polling fragment reruns every second.
+        if entry.get("data") is None:
+          entry["data"] = jobResult(job["id"], readBuffer)
+        data = entry["data"]
+        if data is not None:
+          st.download_button(
+            f"Download {entry['file_name']}", data, file_name=entry["file_name"], mime="application/pdf", key=f"download-{job['id']}"
+          )
+      elif job["status"] == "failed":
+        st.error(job["error"], icon="🚫")
+      else:
+        st.warning("Cancelled", icon="⚠️")
+      st.button("Dismiss", key=f"dismiss-{job['id']}", on_click=dismissJob, args=(job["id"],))
+  return active
+
+
+@st.fragment(run_every=1)
+def pollJobs():
+  # Only this fragment reruns while jobs are in progress; once all are finished, one full rerun stops the polling.
+  if not renderJobs():
+    st.rerun()
+
+
+def showJobs():
+  if not st.session_state.get("pdf_jobs"):
+    return
+  st.subheader("Jobs")
+  jobs = [getJob(entry["id"]) for entry in st.session_state["pdf_jobs"]]
+  if any(job and job["status"] in ACTIVE_STATES for job in jobs):
+    pollJobs()
+  else:
+    renderJobs()
 
 
 def mergePDF():
   uploaded_files = st.file_uploader("Upload PDF files to merge", type=["pdf"], accept_multiple_files=True)
-  if uploaded_files:
-    pdf_writer = PyPDF2.PdfWriter()
-    for file in uploaded_files:
-      pdf_reader = PyPDF2.PdfReader(file)
-      for page_num in range(len(pdf_reader.pages)):
-        page = pdf_reader.pages[page_num]
-        pdf_writer.add_page(page)
-    output_pdf = "merged_output.pdf"
-    with open(output_pdf, "wb") as f:
-      pdf_writer.write(f)
-    with open(output_pdf, "rb") as f:
-      st.download_button("Download Merged PDF", f, file_name="merged_output.pdf")
+  if uploaded_files and st.button("Merge PDF"):
+    startJob(f"Merge {len(uploaded_files)} PDFs", "merged_output.pdf", mergeJob, [file.getvalue() for file in uploaded_files])
 
 
 def splitPDF():
   file = st.file_uploader("Upload a PDF file to split", type=["pdf"])
   if file:
-    pdf_reader = PyPDF2.PdfReader(file)
-    start_page = st.number_input("Start page", min_value=1, max_value=len(pdf_reader.pages), value=1)
-    end_page = st.number_input("End page", min_value=start_page, max_value=len(pdf_reader.pages), value=len(pdf_reader.pages))
-    pdf_writer = PyPDF2.PdfWriter()
-    for i in range(start_page - 1, end_page):
-      pdf_writer.add_page(pdf_reader.pages[i])
-    output_pdf = "split_output.pdf"
-    with open(output_pdf, "wb") as f:
-      pdf_writer.write(f)
-    with open(output_pdf, "rb") as f:
-      st.download_button("Download Split PDF", f, file_name="split_output.pdf")
+    num_pages = len(PyPDF2.PdfReader(file).pages)
+    start_page = st.number_input("Start page", min_value=1, max_value=num_pages, value=1)
+    end_page = st.number_input("End page", min_value=start_page, max_value=num_pages, value=num_pages)
+    if st.button("Split PDF"):
+      startJob(f"Split {file.name} (pages {start_page}-{end_page})", "split_output.pdf", splitJob, file.getvalue(), start_page, end_page)
 
 
 def rotatePDF():
   file = st.file_uploader("Upload a PDF file to rotate", type=["pdf"])
   if file:
-    reader = PyPDF2.PdfReader(file)
-    writer = PyPDF2.PdfWriter()
     angle = st.selectbox("Select rotation angle (clockwise)", [90, 180, 270])
-    for page_num in range(len(reader.pages)):
-      page = reader.pages[page_num]
-      page.rotate(angle)
-      writer.add_page(page)
-    output_file = "rotated_output.pdf"
-    with open(output_file, "wb") as f:
-      writer.write(f)
-    with open(output_file, "rb") as f:
-      st.download_button("Download Rotated PDF", f, file_name=output_file)
+    if st.button("Rotate PDF"):
+      startJob(f"Rotate {file.name} by {angle}°", "rotated_output.pdf", rotateJob, file.getvalue(), angle)
 
 
 def encryptPDF():
   password = st.text_input("Enter password", type="password", placeholder="your encryption password")
   file = st.file_uploader("Upload a PDF file to encrypt", type=["pdf"])
-  if st.button("Encrypt PDF") and password:
-    pdf_reader = PyPDF2.PdfReader(file)
-    pdf_writer = PyPDF2.PdfWriter()
-    for page in pdf_reader.pages:
-      pdf_writer.add_page(page)
-    pdf_writer.encrypt(password)
-    output_pdf = "encrypted_output.pdf"
-    with open(output_pdf, "wb") as f:
-      pdf_writer.write(f)
-    with open(output_pdf, "rb") as f:
-      st.download_button("Download Encrypted PDF", f, file_name="encrypted_output.pdf")
+  if st.button("Encrypt PDF") and password and file:
+    startJob(f"Encrypt {file.name}", "encrypted_output.pdf", encryptJob, file.getvalue(), password)
 
 
 def decryptPDF():
   password = st.text_input("Enter password to decrypt", type="password", placeholder="your decryption password")
   file = st.file_uploader("Upload an encrypted PDF file to decrypt", type=["pdf"])
   if st.button("Decrypt PDF") and password and file:
-    pdf_reader = PyPDF2.PdfReader(file)
-    if pdf_reader.decrypt(password):
-      pdf_writer = PyPDF2.PdfWriter()
-      for page in pdf_reader.pages:
-        pdf_writer.add_page(page)
-      output_pdf = "decrypted_output.pdf"
-      with open(output_pdf, "wb") as f:
-        pdf_writer.write(f)
-      with open(output_pdf, "rb") as f:
-        st.download_button("Download Decrypted PDF", f, file_name="decrypted_output.pdf")
-    else:
-      st.error("Incorrect password", icon="🚫")
+    startJob(f"Decrypt {file.name}", "decrypted_output.pdf", decryptJob, file.getvalue(), password)
 
 
 def PDFToolbox():
-  choice = st.selectbox("Choose an operation", ["Read PDF", "Merge PDF", "Split PDF", "Rotate PDF", "Encrypt PDF", "Decrypt PDF"])
+  choice = st.selectbox("Choose an operation", ["Read PDF", "Search PDF", "Merge PDF", "Split PDF", "Rotate PDF", "Encrypt PDF", "Decrypt PDF"])
   if choice == "Read PDF":
     readPDF()
+  elif choice == "Search PDF":
+    searchPDF()
   elif choice == "Merge PDF":
     mergePDF()
   elif choice == "Split PDF":
@@ -112,3 +253,4 @@ def PDFToolbox():
     encryptPDF()
   elif choice == "Decrypt PDF":
     decryptPDF()
+  showJobs()
@@ -1,10 +1,10 @@
 import os
 
-import requests
 import streamlit as st
 
 from src.helpers.checkKeyExist import isKeyExist
 from src.helpers.displayInstructions import showInstructions
+from src.helpers.httpClient import httpGet
 
 URL = "https://www.googleapis.com/youtube/v3/playlistItems?part=snippet&maxResults=50&playlistId=PLPUts_2rBVRVTrLlcB54Hwi6Ws51UWLXU"
 BLOG_URL = "https://avdhesh-portfolio.netlify.app/blog/fetch-youtube-playlist-in-reactjs"
@@ -20,7 +20,7 @@ api_guide = """
 
 def youtubePlaylistVideos(API_KEY):
   URL2 = f"{URL}&key={API_KEY}"
-  response = requests.get(URL2)
+  response = httpGet(URL2)
   videos = response.json().get("items", [])
   return videos
 
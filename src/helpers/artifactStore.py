@@ -0,0 +1,250 @@
+import contextlib
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+import uuid
+
+try:
+  import fcntl
+except ImportError:
+  import msvcrt
+
+  fcntl = None
+
+from src.helpers.cacheDir import getCacheDir
+
+# Offline mode never touches the network: artifacts come from the local store or the mirror directory only.
+OFFLINE = os.environ.get("JARVIS_OFFLINE", "0") == "1"
+# Read-only directory laid out like the store (<source>/<key>/<version>/...), e.g. pre-baked into an image.
+MIRROR_DIR = os.environ.get("JARVIS_ARTIFACT_MIRROR")
+MANIFEST = "manifest.json"
+
+# Artifact directories whose checksums were verified by this process, so large files are hashed once per worker.
+verified_artifacts = set()
+
+
+@contextlib.contextmanager
+def fileLock(path):
+  """
+  Hold an exclusive lock on path across processes (fcntl on POSIX, msvcrt on Windows).
+
+  Args:
+    path (str): Lock file to create and lock.
+  """
+  with open(path, "a+b") as lock_file:
+    if fcntl:
+      fcntl.flock(lock_file, fcntl.LOCK_EX)
+    else:
+      lock_file.seek(0)
+      while True:
+        try:
+          msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+          break
+        except OSError:
+          time.sleep(0.1)
+    try:
+      yield
+    finally:
+      if fcntl:
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+      else:
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def sha256sum(path):
+  digest = hashlib.sha256()
+  with open(path, "rb") as f:
+    for block in iter(lambda: f.read(1024 * 1024), b""):
+      digest.update(block)
+  return digest.hexdigest()
+
+
+def checksumTree(root):
+  """Map every file below root (except the manifest) to its sha256."""
+  checksums = {}
+  for folder, _dirs, files in os.walk(root):
+    for file in files:
+      path = os.path.join(folder, file)
+      relative = os.path.relpath(path, root)
+      if relative != MANIFEST:
+        checksums[relative.replace(os.sep, "/")] = sha256sum(path)
+  return checksums
+
+
+def readManifest(path):
+  try:
+    with open(os.path.join(path, MANIFEST), encoding="utf-8") as f:
+      return json.load(f)
+  except (OSError, ValueError):
+    return None
+
+
+def verifyArtifact(path):
+  """
+  Check an artifact directory against its manifest.
+
+  Returns:
+    dict or None: The manifest when every listed file is present with the recorded checksum, None otherwise.
+  """
+  manifest = readManifest(path)
+  if manifest is None:
+    return None
+  for relative, checksum in manifest["files"].items():
+    file_path = os.path.join(path, *relative.split("/"))
+    if not os.path.isfile(file_path) or sha256sum(file_path) != checksum:
+      return None
+  return manifest
+
+
+def artifactKey(key):
+  # Keep keys such as "owner/notebook" readable while making them safe directory names.
+  return re.sub(r"[^A-Za-z0-9._-]+", "__", key)
+
+
+def currentDir(final_dir):
+  """The published directory of an artifact: the one its pointer file names, else final_dir (published in place)."""
+  try:
+    with open(f"{final_dir}.current", encoding="utf-8") as f:
+      return os.path.join(os.path.dirname(final_dir), f.read().strip())
+  except OSError:
+    return final_dir
+
+
+def publish(tmp_dir, final_dir, manifest):
+  """
+  Move a complete artifact into a new directory of its own and atomically point final_dir's pointer file at it.
+
+  Published directories are never modified, so lock-free readers see either the previous or the new copy. The
+  directory that was current until now is kept for readers still using it; older ones are removed. Caller holds
+  the lock.
+
+  Returns:
+    str: The published directory.
+  """
+  with open(os.path.join(tmp_dir, MANIFEST), "w", encoding="utf-8") as f:
+    json.dump(manifest, f, indent=2)
+  # mkdtemp creates 0700 directories; published artifacts are shared with every worker on the host.
+  os.chmod(tmp_dir, 0o755)
+  previous = currentDir(final_dir)
+  published = f"{final_dir}@{uuid.uuid4().hex[:12]}"
+  os.replace(tmp_dir, published)
+  pointer_tmp = f"{final_dir}.current.{os.getpid()}.tmp"
+  with open(pointer_tmp, "w", encoding="utf-8") as f:
+    f.write(os.path.basename(published))
+  os.replace(pointer_tmp, f"{final_dir}.current")
+
+  parent, version = os.path.split(final_dir)
+  for name in os.listdir(parent):
+    path = os.path.join(parent, name)
+    if (name == version or name.startswith(f"{version}@")) and path not in (published, previous) and os.path.isdir(path):
+      shutil.rmtree(path, ignore_errors=True)
+  return published
+
+
+def artifactDir(source, key, version=None):
+  version = artifactKey(str(version)) if version is not None else "latest"
+  return os.path.join(getCacheDir("artifacts"), source, artifactKey(key), version)
+
+
+def findArtifact(source, key, version=None):
+  """
+  Return the directory of an artifact that is already in the local store, without ever downloading or building it.
+
+  Returns:
+    str or None: The verified artifact directory, or None when it is missing or incomplete.
+  """
+  current = currentDir(artifactDir(source, key, version))
+  if current in verified_artifacts:
+    return current
+  if verifyArtifact(current):
+    verified_artifacts.add(current)
+    return current
+  return None
+
+
+def fetchArtifact(source, key, download, version=None, max_age=None, derived=False):
+  """
+  Return a local directory holding a verified copy of an artifact, downloading it at most once per host.
+
+  Artifacts live in <cache>/artifacts/<source>/<key>/<version>@<id>, the current one named by the pointer file
+  <version>.current. A manifest stores the sha256 of every file. A download goes into a temp directory next to the
+  final one and is published only once complete, under a file lock, so concurrent workers never see or produce
+  partial artifacts, and a refresh never changes files under a reader (see publish).
+
+  Args:
+    source (str): Where the artifact comes from, e.g. "kaggle-notebook" or "gdrive".
+    key (str): Identifier within the source, e.g. "owner/notebook-name".
+    download (callable): download(directory) fetching every file of the artifact into directory. Should raise on failure.
+    version (str, optional): Pinned version. None means "latest", which is refreshed after max_age seconds.
+    max_age (float, optional): Re-download "latest" artifacts older than this. Never refreshed when None.
+    derived (bool): The artifact is computed locally from other artifacts, so it may be built in offline mode.
+
+  Returns:
+    str: Path to the artifact directory. It never changes: a refreshed artifact gets a new directory.
+
+  Raises:
+    FileNotFoundError: In offline mode when neither the store nor the mirror has the artifact.
+  """
+  final_dir = artifactDir(source, key, version)
+  version = os.path.basename(final_dir)
+  relative = os.path.relpath(final_dir, getCacheDir("artifacts"))
+  os.makedirs(os.path.dirname(final_dir), exist_ok=True)
+
+  def isFresh(manifest):
+    return version != "latest" or max_age is None or OFFLINE or time.time() - manifest["created"] < max_age
+
+  current = currentDir(final_dir)
+  manifest = readManifest(current) if current in verified_artifacts else None
+  if manifest and isFresh(manifest):
+    return current
+
+  with fileLock(f"{final_dir}.lock"):
+    current = currentDir(final_dir)
+    # Offline, any verified copy is fresh enough (see isFresh).
+    stale = verifyArtifact(current)
+    if stale and isFresh(stale):
+      verified_artifacts.add(current)
+      return current
+
+    if MIRROR_DIR:
+      mirrored = os.path.join(MIRROR_DIR, relative)
+      mirror_manifest = verifyArtifact(mirrored)
+      if mirror_manifest:
+        tmp_dir = tempfile.mkdtemp(dir=os.path.dirname(final_dir), prefix=".tmp-")
+        try:
+          shutil.copytree(mirrored, tmp_dir, dirs_exist_ok=True)
+          os.remove(os.path.join(tmp_dir, MANIFEST))
+          published = publish(tmp_dir, final_dir, mirror_manifest)
+        except BaseException:
+          shutil.rmtree(tmp_dir, ignore_errors=True)
+          raise
+        verified_artifacts.add(published)
+        return published
+
+    if OFFLINE and not derived:
+      raise FileNotFoundError(f"Artifact {source}:{key}@{version} is not available offline.")
+
+    tmp_dir = tempfile.mkdtemp(dir=os.path.dirname(final_dir), prefix=".tmp-")
+    published = None
+    try:
+      download(tmp_dir)
+      manifest = {"source": source, "key": key, "version": version, "created": time.time(), "files": checksumTree(tmp_dir)}
+      if not manifest["files"]:
+        raise RuntimeError(f"Download of {source}:{key}@{version} produced no files.")
+      published = publish(tmp_dir, final_dir, manifest)
+    except Exception:
+      if stale:
+        # A failed refresh of "latest" keeps serving the previous copy.
+        return current
+      raise
+    finally:
+      # Also on BaseException, e.g. st.stop() when download() finds the credentials missing.
+      if published is None:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+  verified_artifacts.add(published)
+  return published
@@ -0,0 +1,21 @@
+import os
+
+CACHE_DIR = os.environ.get("JARVIS_CACHE_DIR", ".cache/jarvis")
+
+
+def getCacheDir(*parts):
+  """
+  Return a directory inside the local Jarvis cache, creating it if needed.
+
+  The cache root defaults to ".cache/jarvis" and can be moved with the JARVIS_CACHE_DIR environment variable,
+  e.g. to a volume shared by every worker on the host.
+
+  Args:
+    *parts (str): Sub-directories below the cache root.
+
+  Returns:
+    str: Path to the directory.
+  """
+  path = os.path.join(CACHE_DIR, *parts)
+  os.makedirs(path, exist_ok=True)
+  return path
@@ -0,0 +1,155 @@
+import contextlib
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from src.helpers.cacheDir import getCacheDir
+from src.helpers.llmGateway import chat
+
+# Messages sent to the model verbatim. Older ones are folded into the rolling summary, CHAT_SUMMARY_BATCH at a time,
+# so the prompt stays bounded however long the conversation gets.
+CHAT_KEEP_MESSAGES = int(os.environ.get("JARVIS_CHAT_KEEP_MESSAGES", "12"))
+CHAT_SUMMARY_BATCH = 8
+# Unsummarized messages sent at most, for when summaries lag behind (e.g. the provider is busy and they fail).
+CHAT_PROMPT_LIMIT = CHAT_KEEP_MESSAGES + CHAT_SUMMARY_BATCH
+# Summaries run on their own small pool, so they never hold up (or crowd out) the jobs of the shared job queue.
+CHAT_SUMMARY_WORKERS = 2
+# Messages kept for display; only already-summarized messages are ever dropped.
+CHAT_HISTORY_LIMIT = 200
+CHAT_MAX_SESSIONS = int(os.environ.get("JARVIS_CHAT_MAX_SESSIONS", "256"))
+
+SUMMARY_INSTRUCTIONS = (
+  "You maintain the running summary of a conversation between a user and an assistant. Merge the new messages into "
+  "the existing summary. Keep facts, names, decisions, open questions and the user's preferences; drop small talk. "
+  "Answer with the updated summary only, in at most 200 words."
+)
+
+
+@st.cache_resource
+def chatStore():
+  """Process-wide conversations by user key (LRU), shared by every session and rerun of this worker, and the summary pool."""
+  return {
+    "lock": threading.Lock(),
+    "sessions": OrderedDict(),
+    "executor": ThreadPoolExecutor(max_workers=CHAT_SUMMARY_WORKERS, thread_name_prefix="jarvis-summary"),
+  }
+
+
+def sessionPath(user_key):
+  return os.path.join(getCacheDir("chat-sessions"), f"{hashlib.sha256(user_key.encode('utf-8')).hexdigest()[:32]}.json")
+
+
+def saveSession(session):
+  if not session["persist"]:
+    return
+  data = {key: session[key] for key in ("summary", "summarized", "messages")}
+  path = sessionPath(session["key"])
+  tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+  with contextlib.suppress(OSError):
+    with open(tmp_path, "w", encoding="utf-8") as f:
+      json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def loadSession(user_key, persist=True):
+  """
+  The conversation of a user, kept in memory across reruns and, when persist is set, on disk across restarts.
+
+  Args:
+    user_key (str): Stable id of the user, e.g. their email.
+    persist (bool): Save the conversation to the cache directory.
+
+  Returns:
+    dict: Session with "lock", "summary", "summarized" (leading messages already folded into the summary),
+    "messages" ({"role": "user" | "assistant", "content"} dicts) and "generation" (bumped when it is cleared).
+  """
+  store = chatStore()
+  with store["lock"]:
+    session = store["sessions"].get(user_key)
+    if session is None:
+      session = {
+        "key": user_key,
+        "persist": persist,
+        "lock": threading.Lock(),
+        "summarizing": False,
+        "generation": 0,
+        "summary": "",
+        "summarized": 0,
+        "messages": [],
+      }
+      if persist:
+        with contextlib.suppress(OSError, ValueError), open(sessionPath(user_key), encoding="utf-8") as f:
+          session.update(json.load(f))
+        session["summarized"] = min(session["summarized"], len(session["messages"]))
+      store["sessions"][user_key] = session
+      while len(store["sessions"]) > CHAT_MAX_SESSIONS:
+        store["sessions"].popitem(last=False)
+    store["sessions"].move_to_end(user_key)
+  return session
+
+
+def promptMessages(session, prompt, system=None):
+  """
+  Messages for the next turn: the system prompt and rolling summary, the unsummarized messages (at most
+  CHAT_PROMPT_LIMIT), then the prompt.
+
+  Returns:
+    list: Messages for llmGateway.streamChat.
+  """
+  with session["lock"]:
+    summary, recent = session["summary"], session["messages"][session["summarized"] :][-CHAT_PROMPT_LIMIT:]
+  if summary:
+    system = f"{system or ''}\n\nSummary of the earlier conversation:\n{summary}".strip()
+  return ([{"role": "system", "content": system}] if system else []) + recent + [{"role": "user", "content": prompt}]
+
+
+def summarizeJob(session, provider, api_key):
+  with session["lock"]:
+    generation, start = session["generation"], session["summarized"]
+    stop = len(session["messages"]) - CHAT_KEEP_MESSAGES
+    summary, folded = session["summary"], session["messages"][start:stop]
+  transcript = "\n".join(f"{message['role']}: {message['content']}" for message in folded)
+  messages = [
+    {"role": "system", "content": SUMMARY_INSTRUCTIONS},
+    {"role": "user", "content": f"Existing summary:\n{summary or '(none)'}\n\nNew messages:\n{transcript}"},
+  ]
+  try:
+    updated = chat(provider, messages, api_key=api_key, temperature=0).strip()
+    with session["lock"]:
+      # Messages are only ever appended meanwhile, so unless the session was cleared the folded range is still the same
+      # slice. A cleared session must not get the old conversation back through the summary.
+      if session["generation"] == generation and session["summarized"] == start:
+        session["summary"], session["summarized"] = updated, min(stop, len(session["messages"]))
+        trim = min(session["summarized"], max(0, len(session["messages"]) - CHAT_HISTORY_LIMIT))
+        del session["messages"][:trim]
+        session["summarized"] -= trim
+        saveSession(session)
+  finally:
+    with session["lock"]:
+      session["summarizing"] = False
+
+
+def addTurn(session, prompt, reply, provider, api_key=None):
+  """
+  Record a finished exchange. Once CHAT_SUMMARY_BATCH messages beyond CHAT_KEEP_MESSAGES have piled up, they are
+  folded into the rolling summary by a background job, so the user never waits for it.
+  """
+  with session["lock"]:
+    session["messages"] += [{"role": "user", "content": prompt}, {"role": "assistant", "content": reply}]
+    saveSession(session)
+    due = len(session["messages"]) - session["summarized"] - CHAT_KEEP_MESSAGES >= CHAT_SUMMARY_BATCH and not session["summarizing"]
+    if due:
+      session["summarizing"] = True
+  if due:
+    chatStore()["executor"].submit(summarizeJob, session, provider, api_key)
+
+
+def clearSession(session):
+  with session["lock"]:
+    session.update(summary="", summarized=0, messages=[], generation=session["generation"] + 1)
+    saveSession(session)
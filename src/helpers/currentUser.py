@@ -0,0 +1,19 @@
+import uuid
+
+import streamlit as st
+
+
+def isSignedIn():
+  return bool(getattr(st.user, "is_logged_in", False))
+
+
+def userKey():
+  """
+  Stable id of the current user, for per-user server-side state.
+
+  Returns:
+    str: "user:<email>" when signed in, otherwise a random id kept for this browser session only.
+  """
+  if isSignedIn():
+    return f"user:{st.user.email}"
+  return st.session_state.setdefault("anonymous_user_key", f"anonymous:{uuid.uuid4().hex}")
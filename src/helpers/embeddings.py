@@ -0,0 +1,166 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from src.helpers.modelRuntime import predict, registerModel
+from src.helpers.rateGovernor import TokenBucket
+
+# "google" embeds through the Gemini API; "local" runs a small sentence-transformer on CPU and works offline.
+EMBEDDING_BACKEND = os.environ.get("JARVIS_EMBEDDING_BACKEND", "google")
+GOOGLE_EMBEDDING_MODEL = "models/gemini-embedding-exp-03-07"
+LOCAL_EMBEDDING_MODEL = os.environ.get("JARVIS_LOCAL_EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+EMBED_BATCH_SIZE = int(os.environ.get("JARVIS_EMBED_BATCH_SIZE", "64"))
+EMBED_WORKERS = int(os.environ.get("JARVIS_EMBED_WORKERS", "4"))
+# Batch requests started per minute across all workers; 0 disables the limit.
+EMBED_REQUESTS_PER_MINUTE = float(os.environ.get("JARVIS_EMBED_RPM", "60"))
+EMBED_RETRIES = 4
+
+
+class LocalEmbeddings(Embeddings):
+  """
+  Sentence-transformer embeddings served by the shared model runtime, so the model is loaded once per process.
+
+  Requires the optional sentence-transformers package (`uv sync --group local-embeddings`).
+  """
+
+  # Inference is CPU-bound and already batched by the model, so concurrent or rate-limited requests gain nothing.
+  max_concurrency = 1
+  requests_per_minute = 0
+
+  def __init__(self, model_name=LOCAL_EMBEDDING_MODEL):
+    self.model_name = model_name
+    self.runtime_name = f"localEmbeddings:{model_name}"
+    registerModel(self.runtime_name, self.load, self.encode)
+
+  def load(self):
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(self.model_name, device="cpu")
+
+  @staticmethod
+  def encode(model, batch):
+    return model.encode(batch, batch_size=len(batch), normalize_embeddings=True, convert_to_numpy=True).tolist()
+
+  def embed_documents(self, texts):
+    return predict(self.runtime_name, list(texts)) if texts else []
+
+  def embed_query(self, text):
+    return predict(self.runtime_name, [text])[0]
+
+
+def loadEmbeddings(backend=EMBEDDING_BACKEND, google_api_key=None):
+  """
+  Build the embeddings for a backend.
+
+  Args:
+    backend (str): "google" or "local".
+    google_api_key (str, optional): Gemini API key, required by the "google" backend.
+
+  Returns:
+    tuple: (model name, LangChain Embeddings). The name identifies the vectors in persisted indexes.
+  """
+  if backend == "local":
+    return LOCAL_EMBEDDING_MODEL, LocalEmbeddings(LOCAL_EMBEDDING_MODEL)
+  if backend == "google":
+    from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
+    return GOOGLE_EMBEDDING_MODEL, GoogleGenerativeAIEmbeddings(model=GOOGLE_EMBEDDING_MODEL, google_api_key=google_api_key)
+  raise ValueError(f"Unknown embedding backend '{backend}'. Choose 'google' or 'local'.")
+
+
+def embedTexts(
+  texts,
+  embeddings,
+  checkpoint_dir=None,
+  batch_size=EMBED_BATCH_SIZE,
+  workers=EMBED_WORKERS,
+  requests_per_minute=EMBED_REQUESTS_PER_MINUTE,
+  progress=None,
+):
+  """
+  Embed texts in batches sent concurrently under a rate limit, retrying failed batches with backoff.
+
+  With a checkpoint_dir every finished batch is saved as it completes, so a run that fails halfway (quota, network)
+  resumes where it stopped instead of re-embedding the whole document.
+
+  Args:
+    texts (list): Texts to embed.
+    embeddings: LangChain Embeddings. A max_concurrency or requests_per_minute attribute on it overrides the arguments.
+    checkpoint_dir (str, optional): Directory for per-batch checkpoints. Only reused for the same texts and batch size.
+    batch_size (int): Texts per request.
+    workers (int): Concurrent requests.
+    requests_per_minute (float): Rate limit on requests; 0 disables it.
+    progress (callable, optional): progress(done, total) called from the calling thread as batches finish.
+
+  Returns:
+    np.ndarray: float32 matrix with one row per text.
+  """
+  batch_size = max(1, batch_size)
+  batches = [texts[start : start + batch_size] for start in range(0, len(texts), batch_size)]
+  workers = max(1, min(workers, getattr(embeddings, "max_concurrency", workers), len(batches) or 1))
+  requests_per_minute = getattr(embeddings, "requests_per_minute", requests_per_minute)
+  limiter = TokenBucket(requests_per_minute / 60, 1) if requests_per_minute > 0 else None
+  if checkpoint_dir:
+    checkpoint_dir = os.path.join(checkpoint_dir, f"batch{batch_size}")
+    os.makedirs(checkpoint_dir, exist_ok=True)
+
+  def checkpointPath(i):
+    return os.path.join(checkpoint_dir, f"{i:06d}.npy")
+
+  vectors = [None] * len(batches)
+  pending = []
+  for i in range(len(batches)):
+    if checkpoint_dir and os.path.exists(checkpointPath(i)):
+      vectors[i] = np.load(checkpointPath(i))
+    else:
+      pending.append(i)
+
+  def embedBatch(i):
+    for attempt in range(EMBED_RETRIES + 1):
+      if limiter:
+        limiter.acquire()
+      try:
+        result = np.asarray(embeddings.embed_documents(batches[i]), dtype=np.float32)
+        break
+      except Exception:
+        if attempt == EMBED_RETRIES:
+          raise
+        time.sleep(min(30, 2**attempt))
+    if checkpoint_dir:
+      tmp_path = f"{checkpointPath(i)}.{os.getpid()}.{threading.get_ident()}.tmp"
+      with open(tmp_path, "wb") as f:
+        np.save(f, result)
+      os.replace(tmp_path, checkpointPath(i))
+    return i, result
+
+  done = len(batches) - len(pending)
+  if progress:
+    progress(done, len(batches))
+  if workers == 1:
+    for i in pending:
+      vectors[i] = embedBatch(i)[1]
+      done += 1
+      if progress:
+        progress(done, len(batches))
+  else:
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="jarvis-embed") as executor:
+      futures = [executor.submit(embedBatch, i) for i in pending]
+      try:
+        for future in as_completed(futures):
+          i, result = future.result()
+          vectors[i] = result
+          done += 1
+          if progress:
+            progress(done, len(batches))
+      except BaseException:
+        for future in futures:
+          future.cancel()
+        raise
+
+  if not vectors:
+    return np.empty((0, 0), dtype=np.float32)
+  return np.concatenate(vectors)
@@ -0,0 +1,27 @@
+import os
+
+from src.helpers.artifactStore import fetchArtifact
+
+
+def downloadDriveFile(file_id, file_name):
+  """
+  Fetches a Google Drive file into the local artifact store and returns its path.
+
+  The file is downloaded once per host and shared by every worker. A Drive file id is treated as immutable, so
+  publish a new file (and update the id) to ship new content.
+
+  Args:
+    file_id (str): Google Drive file id.
+    file_name (str): Name to store the file under.
+
+  Returns:
+    str: Path to the downloaded file.
+  """
+
+  def download(folder_name):
+    import gdown
+
+    if gdown.download(f"https://drive.google.com/uc?id={file_id}", os.path.join(folder_name, file_name), quiet=False) is None:
+      raise RuntimeError(f"Google Drive download of {file_id} failed.")
+
+  return os.path.join(fetchArtifact("gdrive", file_id, download, version=file_name), file_name)
@@ -0,0 +1,182 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+from urllib.parse import urlsplit
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.helpers.rateGovernor import MAX_THROTTLE_WAIT, countCoalesced, createGovernor, governorMetrics, providerFor, throttle
+
+# (connect, read) seconds. A slow upstream fails the request instead of pinning a server thread.
+HTTP_TIMEOUT = (float(os.environ.get("JARVIS_HTTP_CONNECT_TIMEOUT", "3.05")), float(os.environ.get("JARVIS_HTTP_READ_TIMEOUT", "15")))
+HTTP_RETRIES = 3
+HTTP_BACKOFF = 0.5
+RETRY_STATUSES = [429, 500, 502, 503, 504]
+IDEMPOTENT_METHODS = ["GET", "HEAD", "OPTIONS"]
+HTTP_POOL_SIZE = 16
+# Concurrent requests allowed per host across all sessions, unless the host has its own cap below.
+HTTP_HOST_CONCURRENCY = int(os.environ.get("JARVIS_HTTP_HOST_CONCURRENCY", "8"))
+HOST_CONCURRENCY = {
+  "api.jikan.moe": 2,
+  "api.coingecko.com": 4,
+}
+# How long a request waits for a free per-host slot before giving up.
+HTTP_QUEUE_TIMEOUT = 30
+USER_AGENT = "Jarvis (+https://github.com/Code-A2Z/jarvis)"
+
+
+class RateLimited(requests.ConnectionError):
+  """The provider's request queue is full: the request was not sent."""
+
+
+@st.cache_resource
+def httpClient():
+  """
+  Process-wide HTTP state shared by every session: one keep-alive session and concurrency cap per host, the rate
+  governor of each API provider, and the coalescable GET requests currently in flight.
+  """
+  return {"lock": threading.Lock(), "hosts": {}, "governor": createGovernor(), "inflight": {}}
+
+
+def hostEntry(client, host, governed=False):
+  with client["lock"]:
+    entry = client["hosts"].get(host)
+    if entry is None:
+      # Only idempotent methods are retried; 429/503 responses honour Retry-After. Hosts of a governed provider only
+      # retry failed connections here: sendRequest retries their responses, taking a token per attempt.
+      retries = Retry(
+        total=HTTP_RETRIES,
+        read=0 if governed else None,
+        backoff_factor=HTTP_BACKOFF,
+        status_forcelist=[] if governed else RETRY_STATUSES,
+        respect_retry_after_header=not governed,
+        allowed_methods=IDEMPOTENT_METHODS,
+        raise_on_status=False,
+      )
+      session = requests.Session()
+      session.headers["User-Agent"] = USER_AGENT
+      adapter = HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_SIZE, max_retries=retries)
+      session.mount("https://", adapter)
+      session.mount("http://", adapter)
+      entry = {"session": session, "slots": threading.BoundedSemaphore(HOST_CONCURRENCY.get(host, HTTP_HOST_CONCURRENCY))}
+      client["hosts"][host] = entry
+  return entry
+
+
+def httpRequest(method, url, timeout=HTTP_TIMEOUT, client=None, coalesce=False, **kwargs):
+  """
+  Send a request through the pooled session of the URL's host.
+
+  Args:
+    method (str): HTTP method.
+    url (str): Absolute URL.
+    timeout (float or tuple): Seconds, or (connect, read) seconds. Defaults to HTTP_TIMEOUT.
+    client (dict, optional): State from httpClient(). Pass it explicitly when calling from a background thread.
+    coalesce (bool): Share the response of an identical GET already in flight instead of sending another. Only for
+      idempotent, cacheable endpoints: callers of an endpoint returning something random would all get the same.
+    **kwargs: Passed on to requests (params, headers, json, ...).
+
+  Returns:
+    requests.Response: The response, whatever its status code (like requests.get).
+
+  Requests to rate-limited providers (see rateGovernor.PROVIDERS) are queued until their token bucket allows them,
+  retries included.
+
+  Raises:
+    RateLimited: When the provider's queue is longer than rateGovernor.MAX_THROTTLE_WAIT.
+    requests.RequestException: On connection errors, timeouts, or when the host stays saturated for HTTP_QUEUE_TIMEOUT.
+  """
+  client = client or httpClient()
+  host = urlsplit(url).netloc.lower()
+  provider = providerFor(client["governor"], host)
+  if not coalesce or method != "GET" or kwargs.get("stream") or "data" in kwargs or "json" in kwargs:
+    return sendRequest(client, host, provider, method, url, timeout, kwargs)
+
+  key = (url, json.dumps(kwargs, sort_keys=True, default=str))
+  with client["lock"]:
+    future = client["inflight"].get(key)
+    leader = future is None
+    if leader:
+      future = client["inflight"][key] = Future()
+  if not leader:
+    if provider:
+      countCoalesced(client["governor"], provider)
+    return future.result()
+
+  try:
+    response = sendRequest(client, host, provider, method, url, timeout, kwargs)
+    future.set_result(response)
+    return response
+  except BaseException as e:
+    future.set_exception(e)
+    raise
+  finally:
+    with client["lock"]:
+      client["inflight"].pop(key, None)
+
+
+def retryDelay(response, attempt):
+  """Seconds before retrying a response: its Retry-After when given in seconds, else exponential backoff."""
+  try:
+    return max(0.0, float(response.headers.get("Retry-After", "")))
+  except ValueError:
+    return HTTP_BACKOFF * 2**attempt
+
+
+def sendRequest(client, host, provider, method, url, timeout, kwargs):
+  entry = hostEntry(client, host, governed=bool(provider))
+  attempts = HTTP_RETRIES + 1 if provider and method in IDEMPOTENT_METHODS else 1
+  for attempt in range(attempts):
+    # Wait for the provider's rate limit before taking a connection slot, so queued requests do not hold connections.
+    if provider and not throttle(client["governor"], provider):
+      raise RateLimited(f"Too many requests queued for {provider}. Please try again in a few seconds.")
+    if not entry["slots"].acquire(timeout=HTTP_QUEUE_TIMEOUT):
+      raise requests.ConnectionError(f"Too many concurrent requests to {host}.")
+    try:
+      response = entry["session"].request(method, url, timeout=timeout, **kwargs)
+    finally:
+      entry["slots"].release()
+    if attempt == attempts - 1 or response.status_code not in RETRY_STATUSES:
+      return response
+    delay = retryDelay(response, attempt)
+    if delay > MAX_THROTTLE_WAIT:
+      return response
+    response.close()
+    time.sleep(delay)
+  return response
+
+
+def httpGet(url, **kwargs):
+  """GET through the shared client, retried with backoff on connection errors, 429 and 5xx. See httpRequest."""
+  return httpRequest("GET", url, **kwargs)
+
+
+def httpPost(url, **kwargs):
+  """POST through the shared client. Never retried, as POST is not idempotent. See httpRequest."""
+  return httpRequest("POST", url, **kwargs)
+
+
+def httpGetJSON(url, **kwargs):
+  """
+  GET a JSON document through the shared client.
+
+  Returns:
+    The decoded JSON body.
+
+  Raises:
+    requests.RequestException: On any failure, including non-2xx responses, so that callers and caches never
+    mistake an error for data.
+  """
+  response = httpGet(url, **kwargs)
+  response.raise_for_status()
+  return response.json()
+
+
+def httpMetrics():
+  """Per-provider request, coalescing and throttling counters for the admin page. See rateGovernor.governorMetrics."""
+  return governorMetrics(httpClient()["governor"])
@@ -0,0 +1,162 @@
+import math
+import os
+import re
+
+import numpy as np
+
+from src.helpers.modelRuntime import predict, registerModel
+
+TOKEN = re.compile(r"\w+")
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Standard reciprocal rank fusion constant: ranks beyond ~60 contribute almost nothing.
+RRF_K = 60
+# Candidates taken from each retriever before fusion (and reranking).
+HYBRID_CANDIDATES = int(os.environ.get("JARVIS_HYBRID_CANDIDATES", "20"))
+# Rerank fused candidates with a local cross-encoder. Requires the local-embeddings dependency group.
+RERANK = os.environ.get("JARVIS_RERANK", "0") == "1"
+RERANKER_MODEL = os.environ.get("JARVIS_RERANKER_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+RETRIEVAL_MODES = ["hybrid", "vector", "bm25"]
+
+
+def tokenize(text):
+  return TOKEN.findall(text.lower())
+
+
+def buildBM25(texts):
+  """
+  Build an in-memory BM25 inverted index.
+
+  Args:
+    texts (list): Chunk texts; their positions are the document ids.
+
+  Returns:
+    dict: "postings" (token -> (ids, term frequencies) arrays), "lengths" and "average_length".
+  """
+  postings = {}
+  lengths = np.zeros(len(texts), dtype=np.float32)
+  for doc_id, text in enumerate(texts):
+    tokens = tokenize(text)
+    lengths[doc_id] = len(tokens)
+    counts = {}
+    for token in tokens:
+      counts[token] = counts.get(token, 0) + 1
+    for token, tf in counts.items():
+      postings.setdefault(token, []).append((doc_id, tf))
+  return {
+    "postings": {
+      token: (np.array([doc_id for doc_id, _ in rows], dtype=np.int64), np.array([tf for _, tf in rows], dtype=np.float32))
+      for token, rows in postings.items()
+    },
+    "lengths": lengths,
+    "average_length": float(lengths.mean()) if len(texts) else 0.0,
+  }
+
+
+def searchBM25(index, query, k):
+  """
+  Returns:
+    list: Up to k (doc id, score) pairs, best first. Documents sharing no term with the query are left out.
+  """
+  count = len(index["lengths"])
+  scores = np.zeros(count, dtype=np.float32)
+  norm = BM25_K1 * (1 - BM25_B + BM25_B * index["lengths"] / (index["average_length"] or 1))
+  for token in set(tokenize(query)):
+    if token not in index["postings"]:
+      continue
+    ids, tfs = index["postings"][token]
+    idf = math.log(1 + (count - len(ids) + 0.5) / (len(ids) + 0.5))
+    scores[ids] += idf * tfs * (BM25_K1 + 1) / (tfs + norm[ids])
+  matched = np.flatnonzero(scores)
+  top = matched[np.argsort(-scores[matched], kind="stable")[:k]]
+  return [(int(doc_id), float(scores[doc_id])) for doc_id in top]
+
+
+def searchVectors(store, query, k):
+  """
+  Nearest chunks in the store's FAISS index (positions are document ids, as built by vectorStore.loadVectorStore).
+
+  Returns:
+    list: Up to k (doc id, L2 distance) pairs, best first.
+  """
+  vector = np.asarray([store.embedding_function.embed_query(query)], dtype=np.float32)
+  distances, ids = store.index.search(vector, min(k, store.index.ntotal))
+  return [(int(doc_id), float(distance)) for doc_id, distance in zip(ids[0], distances[0], strict=True) if doc_id >= 0]
+
+
+def reciprocalRankFusion(rankings, k=RRF_K):
+  """
+  Fuse ranked id lists: each list gives an id 1 / (k + rank). Scores of different retrievers are never compared.
+
+  Returns:
+    list: (doc id, fused score) pairs, best first.
+  """
+  fused = {}
+  for ranking in rankings:
+    for rank, doc_id in enumerate(ranking, start=1):
+      fused[doc_id] = fused.get(doc_id, 0.0) + 1 / (k + rank)
+  return sorted(fused.items(), key=lambda item: -item[1])
+
+
+def loadCrossEncoder():
+  from sentence_transformers import CrossEncoder
+
+  return CrossEncoder(RERANKER_MODEL, device="cpu")
+
+
+def scorePairs(model, pairs):
+  return model.predict(pairs, batch_size=len(pairs)).tolist()
+
+
+def rerank(query, ids, texts):
+  """Order ids by cross-encoder relevance of (query, text), via the shared model runtime."""
+  name = f"crossEncoder:{RERANKER_MODEL}"
+  registerModel(name, loadCrossEncoder, scorePairs)
+  scores = predict(name, [(query, texts[doc_id]) for doc_id in ids])
+  return [doc_id for _, doc_id in sorted(zip(scores, ids, strict=True), key=lambda pair: -pair[0])]
+
+
+def buildHybridRetriever(store):
+  """
+  Pair a LangChain FAISS store from vectorStore.loadVectorStore with a BM25 index over the same chunks.
+
+  Returns:
+    dict: "store", "documents" and "texts" (by doc id) and "bm25".
+  """
+  documents = [store.docstore.search(store.index_to_docstore_id[i]) for i in range(store.index.ntotal)]
+  texts = [document.page_content for document in documents]
+  return {"store": store, "documents": documents, "texts": texts, "bm25": buildBM25(texts)}
+
+
+def retrieveIds(retriever, query, k=4, mode="hybrid", candidates=HYBRID_CANDIDATES, rerank_results=RERANK):
+  """
+  Rank chunk ids for a query.
+
+  Args:
+    retriever (dict): From buildHybridRetriever. Only "store", "bm25" and "texts" are used.
+    query (str): The user's question.
+    k (int): Number of ids returned.
+    mode (str): "hybrid" (BM25 and vectors fused with RRF), "vector" or "bm25".
+    candidates (int): Ids taken from each retriever before fusion and reranking.
+    rerank_results (bool): Reorder the fused candidates with the cross-encoder.
+
+  Returns:
+    list: Chunk ids, best first.
+  """
+  if mode not in RETRIEVAL_MODES:
+    raise ValueError(f"Unknown retrieval mode '{mode}'. Choose one of {', '.join(RETRIEVAL_MODES)}.")
+  depth = max(k, candidates)
+  rankings = []
+  if mode in ("hybrid", "vector"):
+    rankings.append([doc_id for doc_id, _ in searchVectors(retriever["store"], query, depth)])
+  if mode in ("hybrid", "bm25"):
+    rankings.append([doc_id for doc_id, _ in searchBM25(retriever["bm25"], query, depth)])
+  ids = [doc_id for doc_id, _ in reciprocalRankFusion(rankings)][:depth]
+  if rerank_results and ids:
+    ids = rerank(query, ids, retriever["texts"])
+  return ids[:k]
+
+
+def retrieve(retriever, query, k=4, **options):
+  """The chunks (LangChain Documents) for a query. See retrieveIds for the options."""
+  return [retriever["documents"][doc_id] for doc_id in retrieveIds(retriever, query, k, **options)]
@@ -0,0 +1,171 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+JOB_WORKERS = int(os.environ.get("JARVIS_JOB_WORKERS", "2"))
+# Finished jobs keep their results (e.g. spooled output files) this long, and at most this many are kept at once.
+JOB_RESULT_TTL = float(os.environ.get("JARVIS_JOB_TTL", "900"))
+MAX_FINISHED_JOBS = int(os.environ.get("JARVIS_MAX_FINISHED_JOBS", "32"))
+ACTIVE_STATES = ("queued", "running")
+
+
+class JobCancelled(Exception):
+  """Raised inside a job by its progress callback once the job has been cancelled."""
+
+
+@st.cache_resource
+def jobQueue():
+  """Process-wide job queue shared by every session: worker pool and jobs by id (submission order)."""
+  return {"lock": threading.Lock(), "executor": ThreadPoolExecutor(max_workers=JOB_WORKERS, thread_name_prefix="jarvis-job"), "jobs": OrderedDict()}
+
+
+def releaseResult(job):
+  result, job["result"] = job["result"], None
+  if hasattr(result, "close"):
+    result.close()
+
+
+def purgeJobs(queue):
+  """
+  Drop finished jobs past their expiry, then the oldest finished ones beyond MAX_FINISHED_JOBS. Jobs whose result is
+  being read are kept until a later purge. Caller holds the lock.
+  """
+  now = time.time()
+  finished = [job for job in queue["jobs"].values() if job["status"] not in ACTIVE_STATES and not job["readers"]]
+  expired = [job for job in finished if now - job["finished"] > JOB_RESULT_TTL]
+  expired += [job for job in finished if job not in expired][: max(0, len(finished) - len(expired) - MAX_FINISHED_JOBS)]
+  for job in expired:
+    releaseResult(job)
+    queue["jobs"].pop(job["id"])
+
+
+def runJob(queue, job, fn, args, kwargs):
+  with queue["lock"]:
+    if job["status"] != "queued":
+      return
+    job["status"] = "running"
+    job["started"] = time.time()
+
+  def progress(done, total, message=None):
+    if job["cancel"].is_set():
+      raise JobCancelled()
+    with queue["lock"]:
+      job["progress"] = done / total if total else 1.0
+      if message is not None:
+        job["message"] = message
+
+  try:
+    result = fn(progress, *args, **kwargs)
+    status, error = "done", None
+  except JobCancelled:
+    result, status, error = None, "cancelled", None
+  except Exception as e:
+    result, status, error = None, "failed", str(e)
+
+  with queue["lock"]:
+    job.update(status=status, error=error, result=result, finished=time.time())
+    if status == "done":
+      job["progress"] = 1.0
+    if job["id"] not in queue["jobs"]:
+      # Purged while running (cannot normally happen, but never leak a spooled file).
+      releaseResult(job)
+
+
+def submitJob(label, fn, *args, **kwargs):
+  """
+  Run fn in the background and return immediately.
+
+  fn is called as fn(progress, *args, **kwargs) on a worker thread. It reports with progress(done, total, message=None),
+  which raises JobCancelled once cancelJob() was called, and returns the job result. Results with a close() method
+  (e.g. spooled files) are closed when the job expires.
+
+  Args:
+    label (str): Short description shown to the user.
+    fn (callable): The work to run.
+
+  Returns:
+    str: Job id.
+  """
+  queue = jobQueue()
+  job = {
+    "id": uuid.uuid4().hex,
+    "label": label,
+    "status": "queued",
+    "progress": 0.0,
+    "message": "",
+    "result": None,
+    "error": None,
+    "created": time.time(),
+    "started": None,
+    "finished": None,
+    "cancel": threading.Event(),
+    "readers": 0,
+    "result_lock": threading.Lock(),
+  }
+  with queue["lock"]:
+    purgeJobs(queue)
+    queue["jobs"][job["id"]] = job
+  job["future"] = queue["executor"].submit(runJob, queue, job, fn, args, kwargs)
+  return job["id"]
+
+
+def getJob(job_id):
+  """
+  Snapshot of a job for display.
+
+  Returns:
+    dict or None: id, label, status, progress, message, error and timestamps, or None once the job has expired.
+  """
+  queue = jobQueue()
+  with queue["lock"]:
+    purgeJobs(queue)
+    job = queue["jobs"].get(job_id)
+    if job is None:
+      return None
+    return {key: value for key, value in job.items() if key not in ("result", "cancel", "future", "result_lock")}
+
+
+def jobResult(job_id, read):
+  """
+  Apply read() to a finished job's result.
+
+  The job counts as being read meanwhile, so its result cannot expire midway, but the queue lock is not held: reading
+  a large result never blocks other sessions' job calls. Reads of the same job are serialized, as read() may move the
+  position of a spooled file.
+
+  Args:
+    job_id (str): Job id.
+    read (callable): read(result) returning what the caller needs, e.g. the bytes of a spooled file.
+
+  Returns:
+    The value of read(result), or None if the job is not done or has expired.
+  """
+  queue = jobQueue()
+  with queue["lock"]:
+    job = queue["jobs"].get(job_id)
+    if job is None or job["status"] != "done":
+      return None
+    job["readers"] += 1
+  try:
+    with job["result_lock"]:
+      return read(job["result"])
+  finally:
+    with queue["lock"]:
+      job["readers"] -= 1
+
+
+def cancelJob(job_id):
+  """Cancel a queued job outright, or ask a running one to stop at its next progress report."""
+  queue = jobQueue()
+  with queue["lock"]:
+    job = queue["jobs"].get(job_id)
+    if job is None or job["status"] not in ACTIVE_STATES:
+      return
+    job["cancel"].set()
+    if job["status"] == "queued":
+      job.update(status="cancelled", finished=time.time())
@@ -1,58 +1,89 @@
 import os
+import subprocess
+from pathlib import Path
+from zipfile import ZipFile
 
 import streamlit as st
 
+from src.helpers.artifactStore import fetchArtifact
 from src.helpers.checkKeyExist import isKeyExist
 
 
+def setKaggleCredentials():
+  """
+  Export the Kaggle API credentials from Streamlit secrets for the Kaggle CLI.
+
+  Raises:
+    Streamlit error and stops execution if Kaggle credentials are missing.
+  """
+  exists = isKeyExist(["KAGGLE_USERNAME", "KAGGLE_KEY"], "kaggle")
+  if not exists["KAGGLE_USERNAME"] or not exists["KAGGLE_KEY"]:
+    st.error("Kaggle credentials are missing. Please set them in Streamlit secrets.", icon="🚨")
+    st.stop()
+  os.environ["KAGGLE_USERNAME"] = st.secrets["kaggle"]["KAGGLE_USERNAME"]
+  os.environ["KAGGLE_KEY"] = st.secrets["kaggle"]["KAGGLE_KEY"]
+
+
+def extractArchives(folder_name):
+  for zip_file in Path(folder_name).glob("*.zip"):
+    with ZipFile(zip_file) as z:
+      z.extractall(folder_name)
+    zip_file.unlink()
+
+
 @st.cache_resource(ttl=86400)
-def downloadNotebookOutput(username, notebook_name, folder_name, version=None):
+def downloadNotebookOutput(username, notebook_name, version=None):
   """
-  Downloads the output files of a specified Kaggle notebook to a local folder.
+  Fetches the output files of a specified Kaggle notebook into the local artifact store.
 
-  This function checks for Kaggle API credentials in Streamlit secrets, sets them as environment variables,
-  and then uses the Kaggle CLI to download the output of a given notebook. The result is cached for 24 hours.
+  The Kaggle CLI only runs when the artifact store has no fresh copy: every worker on the host shares one
+  checksummed download, and the latest version is refreshed at most once a day. Zip archives in the output are
+  extracted. The result is cached for 24 hours.
 
   Args:
     username (str): Kaggle username of the notebook owner.
     notebook_name (str): Name of the Kaggle notebook (kernel) to download output from.
-    folder_name (str): Local folder path where the output files will be saved.
     version (str, optional): Specific version of the notebook output to download. Defaults to None (latest).
 
+  Returns:
+    str: Directory holding the notebook output files.
+
   Raises:
     Streamlit error and stops execution if Kaggle credentials are missing.
   """
-  exists = isKeyExist(["KAGGLE_USERNAME", "KAGGLE_KEY"], "kaggle")
-  if not exists["KAGGLE_USERNAME"] or not exists["KAGGLE_KEY"]:
-    st.error("Kaggle credentials are missing. Please set them in Streamlit secrets.", icon="🚨")
-    st.stop()
-  os.environ["KAGGLE_USERNAME"] = st.secrets["kaggle"]["KAGGLE_USERNAME"]
-  os.environ["KAGGLE_KEY"] = st.secrets["kaggle"]["KAGGLE_KEY"]
-  version_arg = f"--version {version}" if version else ""
-  os.system(f"kaggle kernels output {username}/{notebook_name} -p {folder_name} {version_arg}")
+
+  def download(folder_name):
+    setKaggleCredentials()
+    version_args = ["--version", str(version)] if version else []
+    subprocess.run(["kaggle", "kernels", "output", f"{username}/{notebook_name}", "-p", folder_name, *version_args], check=True)
+    extractArchives(folder_name)
+
+  return fetchArtifact("kaggle-notebook", f"{username}/{notebook_name}", download, version=version, max_age=86400)
 
 
 @st.cache_resource(ttl=86400)
 def downloadDataset(dataset_name, version=None):
   """
-  Downloads a Kaggle dataset to the local directory.
+  Fetches a Kaggle dataset into the local artifact store.
 
-  This function checks for Kaggle API credentials in Streamlit secrets, sets them as environment variables,
-  and then uses the Kaggle CLI to download the specified dataset. Optionally, a specific version of the dataset
-  can be downloaded. The result is cached for 24 hours.
+  The Kaggle CLI only runs when the artifact store has no fresh copy, and the downloaded archive is extracted.
+  The result is cached for 24 hours.
 
   Args:
     dataset_name (str): The Kaggle dataset identifier in the format 'owner/dataset-name'.
     version (str, optional): Specific version of the dataset to download. Defaults to None (latest).
 
+  Returns:
+    str: Directory holding the dataset files.
+
   Raises:
     Streamlit error and stops execution if Kaggle credentials are missing.
   """
-  exists = isKeyExist(["KAGGLE_USERNAME", "KAGGLE_KEY"], "kaggle")
-  if not exists["KAGGLE_USERNAME"] or not exists["KAGGLE_KEY"]:
-    st.error("Kaggle credentials are missing. Please set them in Streamlit secrets.", icon="🚨")
-    st.stop()
-  os.environ["KAGGLE_USERNAME"] = st.secrets["kaggle"]["KAGGLE_USERNAME"]
-  os.environ["KAGGLE_KEY"] = st.secrets["kaggle"]["KAGGLE_KEY"]
-  version_arg = f"--version {version}" if version else ""
-  os.system(f"kaggle datasets download -d {dataset_name} {version_arg}")
+
+  def download(folder_name):
+    setKaggleCredentials()
+    version_args = ["--version", str(version)] if version else []
+    subprocess.run(["kaggle", "datasets", "download", "-d", dataset_name, "-p", folder_name, *version_args], check=True)
+    extractArchives(folder_name)
+
+  return fetchArtifact("kaggle-dataset", dataset_name, download, version=version, max_age=86400)
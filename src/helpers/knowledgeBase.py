@@ -0,0 +1,237 @@
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.helpers.artifactStore import artifactKey, fileLock
+from src.helpers.cacheDir import getCacheDir
+from src.helpers.hybridRetrieval import buildBM25
+from src.helpers.vectorStore import fetchEmbeddings
+
+# Deleted documents leave dead rows in the vector file; it is compacted once they exceed this share of the rows.
+KB_COMPACT_RATIO = 0.5
+# Rows scanned per step of a vector search, bounding the temporary memory of a query.
+SEARCH_BLOCK_ROWS = 16384
+# Knowledge bases that are not persisted (anonymous users, whose key only lives for one session) are removed once
+# unused for this long.
+TEMPORARY_KB_TTL = float(os.environ.get("JARVIS_TEMPORARY_KB_TTL", "86400"))
+
+
+class MemmapIndex:
+  """
+  Exact L2 search over a memory-mapped float32 matrix, skipping deleted rows. Mirrors the part of the FAISS index
+  API used by hybridRetrieval (search and ntotal). The matrix stays in the OS page cache, shared by every worker,
+  instead of being copied into each worker's memory.
+  """
+
+  def __init__(self, vectors, live):
+    self.vectors = vectors
+    self.live = live
+    self.ntotal = int(live.sum())
+
+  def search(self, queries, k):
+    query = np.asarray(queries[0], dtype=np.float32)
+    candidates_d, candidates_i = [np.empty(0, np.float32)], [np.empty(0, np.int64)]
+    for start in range(0, len(self.vectors), SEARCH_BLOCK_ROWS):
+      block = np.asarray(self.vectors[start : start + SEARCH_BLOCK_ROWS])
+      distances = np.einsum("ij,ij->i", block, block) - 2 * (block @ query) + query @ query
+      distances[~self.live[start : start + len(block)]] = np.inf
+      top = np.argpartition(distances, k - 1)[:k] if 0 < k < len(block) else np.arange(len(block) if k else 0)
+      candidates_d.append(distances[top])
+      candidates_i.append(top + start)
+    distances, ids = np.concatenate(candidates_d), np.concatenate(candidates_i)
+    order = np.argsort(distances, kind="stable")[:k]
+    distances, ids = distances[order], ids[order]
+    ids[~np.isfinite(distances)] = -1
+    return distances[None, :], ids[None, :]
+
+
+def expireTemporaryKnowledgeBases(root):
+  cutoff = time.time() - TEMPORARY_KB_TTL
+  for name in os.listdir(root):
+    path = os.path.join(root, name)
+    with contextlib.suppress(OSError):
+      if os.path.getmtime(path) < cutoff:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def knowledgeBaseDir(user_key, embedding_name, persist=True):
+  """
+  One knowledge base per user and embedding model: vectors of different models cannot share an index.
+
+  Args:
+    user_key (str): Stable id of the user, e.g. from currentUser.userKey().
+    embedding_name (str): Embedding model name.
+    persist (bool): Keep the knowledge base across visits. Otherwise it goes to a temporary area where knowledge
+      bases unused for TEMPORARY_KB_TTL are removed.
+
+  Returns:
+    str: The knowledge base directory.
+  """
+  user_dir = hashlib.sha256(user_key.encode("utf-8")).hexdigest()[:32]
+  if persist:
+    return getCacheDir("knowledge-bases", user_dir, artifactKey(embedding_name))
+  root = getCacheDir("temporary-knowledge-bases")
+  if not os.path.isdir(os.path.join(root, user_dir)):
+    expireTemporaryKnowledgeBases(root)
+  kb_dir = getCacheDir("temporary-knowledge-bases", user_dir, artifactKey(embedding_name))
+  # Every visit to the page marks it as used.
+  os.utime(os.path.join(root, user_dir))
+  return kb_dir
+
+
+def knowledgeBaseManifest(kb_dir):
+  """
+  Returns:
+    dict: "version" (bumped on every change), "vectors" (current vector file), "dimensions", "rows" (including
+    dead rows) and "documents" (digest -> {"name", "start", "count", "added"}).
+  """
+  try:
+    with open(os.path.join(kb_dir, "manifest.json"), encoding="utf-8") as f:
+      return json.load(f)
+  except (OSError, ValueError):
+    return {"version": 0, "vectors": "vectors-0.f32", "dimensions": None, "rows": 0, "documents": {}}
+
+
+def writeManifest(kb_dir, manifest):
+  manifest["version"] += 1
+  tmp_path = os.path.join(kb_dir, f"manifest.json.{os.getpid()}.tmp")
+  with open(tmp_path, "w", encoding="utf-8") as f:
+    json.dump(manifest, f)
+  os.replace(tmp_path, os.path.join(kb_dir, "manifest.json"))
+
+
+def chunksPath(kb_dir, digest):
+  return os.path.join(kb_dir, "chunks", f"{digest}.json")
+
+
+def addDocument(kb_dir, digest, name, embedding_name, load_chunks, embeddings, progress=None):
+  """
+  Add a document to a knowledge base, embedding only its own chunks.
+
+  The chunks are embedded through vectorStore.fetchEmbeddings, so a document any user already embedded with this
+  model is not embedded again. Its vectors are appended to the knowledge base's vector file.
+
+  Args:
+    kb_dir (str): From knowledgeBaseDir().
+    digest (str): documentDigest of the document.
+    name (str): File name shown as the source of its chunks.
+    embedding_name (str): Embedding model name.
+    load_chunks (callable): Returns the document's chunks as LangChain Documents. Only called on a cache miss.
+    embeddings: LangChain Embeddings.
+    progress (callable, optional): progress(done, total) over embedding batches.
+
+  Returns:
+    bool: False when the document was already in the knowledge base.
+
+  Raises:
+    ValueError: When the document has no extractable text.
+  """
+  if digest in knowledgeBaseManifest(kb_dir)["documents"]:
+    return False
+  embeddings_dir = fetchEmbeddings(digest, embedding_name, load_chunks, embeddings, progress)
+  vectors = np.load(os.path.join(embeddings_dir, "embeddings.npy")).astype(np.float32, copy=False)
+  if not len(vectors):
+    raise ValueError(f"No text could be extracted from {name}.")
+
+  with fileLock(os.path.join(kb_dir, ".lock")):
+    manifest = knowledgeBaseManifest(kb_dir)
+    if digest in manifest["documents"]:
+      return False
+    manifest["dimensions"] = manifest["dimensions"] or vectors.shape[1]
+    os.makedirs(os.path.join(kb_dir, "chunks"), exist_ok=True)
+    with open(os.path.join(embeddings_dir, "chunks.json"), encoding="utf-8") as src, open(chunksPath(kb_dir, digest), "w", encoding="utf-8") as dst:
+      dst.write(src.read())
+    path = os.path.join(kb_dir, manifest["vectors"])
+    with open(path, "r+b" if os.path.exists(path) else "wb") as f:
+      # Drop rows an interrupted add wrote after the last manifest update.
+      f.truncate(manifest["rows"] * manifest["dimensions"] * 4)
+      f.seek(0, os.SEEK_END)
+      f.write(vectors.tobytes())
+    manifest["documents"][digest] = {"name": name, "start": manifest["rows"], "count": len(vectors), "added": time.time()}
+    manifest["rows"] += len(vectors)
+    writeManifest(kb_dir, manifest)
+  return True
+
+
+def compact(kb_dir, manifest):
+  """Copy the live rows into a new vector file (no re-embedding) and point the manifest at it. Caller holds the lock."""
+  old_path = os.path.join(kb_dir, manifest["vectors"])
+  generation = int(manifest["vectors"].split("-")[1].split(".")[0]) + 1
+  new_name = f"vectors-{generation}.f32"
+  old = np.memmap(old_path, dtype=np.float32, mode="r", shape=(manifest["rows"], manifest["dimensions"])) if manifest["rows"] else None
+  rows = 0
+  with open(os.path.join(kb_dir, new_name), "wb") as f:
+    for document in sorted(manifest["documents"].values(), key=lambda document: document["start"]):
+      f.write(np.asarray(old[document["start"] : document["start"] + document["count"]]).tobytes())
+      document["start"] = rows
+      rows += document["count"]
+  del old
+  manifest.update(vectors=new_name, rows=rows)
+  writeManifest(kb_dir, manifest)
+  # Workers still reading the old file keep their mapping; on Windows the file is removed by a later compaction.
+  for name in os.listdir(kb_dir):
+    if name.startswith("vectors-") and name != new_name:
+      with contextlib.suppress(OSError):
+        os.remove(os.path.join(kb_dir, name))
+
+
+def deleteDocument(kb_dir, digest):
+  """
+  Remove a document without rebuilding the index: its rows are masked out until they are compacted away.
+
+  Returns:
+    bool: False when the document was not in the knowledge base.
+  """
+  with fileLock(os.path.join(kb_dir, ".lock")):
+    manifest = knowledgeBaseManifest(kb_dir)
+    if manifest["documents"].pop(digest, None) is None:
+      return False
+    with contextlib.suppress(OSError):
+      os.remove(chunksPath(kb_dir, digest))
+    live = sum(document["count"] for document in manifest["documents"].values())
+    if manifest["rows"] - live > KB_COMPACT_RATIO * manifest["rows"]:
+      compact(kb_dir, manifest)
+    else:
+      writeManifest(kb_dir, manifest)
+  return True
+
+
+def loadKnowledgeBase(kb_dir, embeddings):
+  """
+  Open a knowledge base for hybridRetrieval.retrieve: memory-mapped vectors, BM25 over the live chunks, and chunks
+  tagged with their source document. Only the vectors are memory-mapped: the chunk texts and the BM25 postings are
+  held in the worker's memory.
+
+  Returns:
+    dict: Retriever with "store", "documents", "texts", "bm25" and the "manifest" it was built from.
+  """
+  from langchain_core.documents import Document
+
+  # Under the lock, so a concurrent delete or compaction cannot remove the files between the manifest read and the
+  # opens. An open memory map stays valid after its file is removed.
+  with fileLock(os.path.join(kb_dir, ".lock")):
+    manifest = knowledgeBaseManifest(kb_dir)
+    rows, dimensions = manifest["rows"], manifest["dimensions"] or 1
+    path = os.path.join(kb_dir, manifest["vectors"])
+    vectors = np.memmap(path, dtype=np.float32, mode="r", shape=(rows, dimensions)) if rows else np.empty((0, dimensions), np.float32)
+    chunks = {}
+    for digest in manifest["documents"]:
+      with open(chunksPath(kb_dir, digest), encoding="utf-8") as f:
+        chunks[digest] = json.load(f)
+
+  live = np.zeros(rows, dtype=bool)
+  documents, texts = [None] * rows, [""] * rows
+  for digest, document in manifest["documents"].items():
+    for offset, chunk in enumerate(chunks[digest][: document["count"]]):
+      row = document["start"] + offset
+      live[row] = True
+      texts[row] = chunk["text"]
+      documents[row] = Document(page_content=chunk["text"], metadata={**chunk["metadata"], "source": document["name"], "digest": digest})
+  store = SimpleNamespace(embedding_function=embeddings, index=MemmapIndex(vectors, live))
+  return {"store": store, "documents": documents, "texts": texts, "bm25": buildBM25(texts), "manifest": manifest}
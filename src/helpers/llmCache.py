@@ -0,0 +1,203 @@
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import streamlit as st
+
+from src.helpers.cacheDir import getCacheDir
+from src.helpers.llmGateway import DEFAULT_MODELS, resolveProvider, streamChat
+
+LLM_CACHE_TTL = float(os.environ.get("JARVIS_LLM_CACHE_TTL", str(7 * 86400)))
+# Least recently used answers are evicted beyond this size.
+LLM_CACHE_MAX_MB = float(os.environ.get("JARVIS_LLM_CACHE_MAX_MB", "64"))
+# Cosine similarity above which a differently worded question reuses a cached answer; 0 disables semantic matching.
+# Question embeddings come from the local sentence-transformer (`uv sync --group local-embeddings`).
+LLM_CACHE_SIMILARITY = float(os.environ.get("JARVIS_LLM_CACHE_SIMILARITY", "0"))
+# Candidates compared per semantic lookup (most recently used first).
+SEMANTIC_CANDIDATES = 2000
+
+
+@st.cache_resource
+def llmCache():
+  """Process-wide state: per-namespace stats, the lazily created question embedder and whether the db is ready."""
+  return {
+    "lock": threading.Lock(),
+    "embedder_lock": threading.Lock(),
+    "stats": {},
+    "db_ready": False,
+    "embedder": None,
+    "semantic": LLM_CACHE_SIMILARITY > 0,
+  }
+
+
+@contextlib.contextmanager
+def database(cache):
+  # One short-lived connection per operation: sqlite connections must not be shared across threads.
+  connection = sqlite3.connect(os.path.join(getCacheDir("llm-responses"), "cache.sqlite3"), timeout=5, isolation_level=None)
+  try:
+    if not cache["db_ready"]:
+      connection.execute("PRAGMA journal_mode=WAL")
+      connection.execute(
+        "CREATE TABLE IF NOT EXISTS answers (key TEXT PRIMARY KEY, namespace TEXT, scope TEXT, response TEXT, embedding BLOB, "
+        "created REAL, used REAL, size INTEGER)"
+      )
+      connection.execute("CREATE INDEX IF NOT EXISTS answers_scope ON answers (scope, used)")
+      cache["db_ready"] = True
+    yield connection
+  finally:
+    connection.close()
+
+
+def count(cache, namespace, outcome, saved_chars=0):
+  with cache["lock"]:
+    stats = cache["stats"].setdefault(namespace, {"exact": 0, "semantic": 0, "miss": 0, "saved_chars": 0})
+    stats[outcome] += 1
+    stats["saved_chars"] += saved_chars
+
+
+def digest(*parts):
+  return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def embedQuestion(cache, text):
+  """Normalized float32 embedding of text, or None when semantic matching is off or the local model is missing."""
+  if not cache["semantic"] or not text:
+    return None
+  try:
+    # Its own lock, so concurrent first requests load the model once without holding up the stats meanwhile.
+    with cache["embedder_lock"]:
+      if cache["embedder"] is None:
+        from src.helpers.embeddings import LocalEmbeddings
+
+        cache["embedder"] = LocalEmbeddings()
+    return np.asarray(cache["embedder"].embed_query(text), dtype=np.float32)
+  except Exception:
+    # sentence-transformers is optional: fall back to exact matching for the rest of the process.
+    cache["semantic"] = False
+    return None
+
+
+def lookup(cache, key, scope, embedding, threshold, now):
+  with database(cache) as db:
+    row = db.execute("SELECT response, created FROM answers WHERE key = ?", (key,)).fetchone()
+    if row and now - row[1] < LLM_CACHE_TTL:
+      db.execute("UPDATE answers SET used = ? WHERE key = ?", (now, key))
+      return row[0], "exact"
+    if embedding is None:
+      return None, None
+    # Only embeddings of the same size are comparable: a change of embedder model leaves others behind in the cache.
+    rows = db.execute(
+      "SELECT key, response, embedding FROM answers WHERE scope = ? AND length(embedding) = ? AND created > ? ORDER BY used DESC LIMIT ?",
+      (scope, embedding.nbytes, now - LLM_CACHE_TTL, SEMANTIC_CANDIDATES),
+    ).fetchall()
+    if not rows:
+      return None, None
+    matrix = np.stack([np.frombuffer(blob, dtype=np.float32) for _, _, blob in rows])
+    similarities = matrix @ embedding
+    best = int(np.argmax(similarities))
+    if similarities[best] < threshold:
+      return None, None
+    db.execute("UPDATE answers SET used = ? WHERE key = ?", (now, rows[best][0]))
+    return rows[best][1], "semantic"
+
+
+def store(cache, key, namespace, scope, response, embedding, now):
+  size = len(response.encode("utf-8")) + (embedding.nbytes if embedding is not None else 0)
+  with database(cache) as db:
+    db.execute(
+      "INSERT OR REPLACE INTO answers (key, namespace, scope, response, embedding, created, used, size) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+      (key, namespace, scope, response, embedding.tobytes() if embedding is not None else None, now, now, size),
+    )
+    db.execute("DELETE FROM answers WHERE created < ?", (now - LLM_CACHE_TTL,))
+    excess = (db.execute("SELECT COALESCE(SUM(size), 0) FROM answers").fetchone()[0]) - LLM_CACHE_MAX_MB * 1024 * 1024
+    if excess > 0:
+      for old_key, old_size in db.execute("SELECT key, size FROM answers ORDER BY used").fetchall():
+        if excess <= 0:
+          break
+        db.execute("DELETE FROM answers WHERE key = ?", (old_key,))
+        excess -= old_size
+
+
+def cachedStreamChat(namespace, provider, messages, scope=None, question=None, threshold=None, **kwargs):
+  """
+  llmGateway.streamChat with a response cache in front of it, shared by every worker on the host.
+
+  An identical request (same provider, model, options and messages) is answered from the cache. With semantic
+  matching enabled (JARVIS_LLM_CACHE_SIMILARITY), a request whose question embeds close enough to a cached one in
+  the same scope is answered from the cache too. Only non-empty answers that streamed to completion are stored.
+
+  Args:
+    namespace (str): Cache namespace, e.g. "pdf-chat". Also the key for llmCacheMetrics().
+    provider (str): See streamChat.
+    messages (list): See streamChat.
+    scope (str, optional): Everything besides the question that the answer depends on, e.g. the PDF digest.
+      Semantic matches never cross scopes. Leave unset to disable semantic matching for the call.
+    question (str, optional): The text compared semantically, e.g. the user's question.
+    threshold (float, optional): Similarity needed for a semantic hit. Defaults to LLM_CACHE_SIMILARITY.
+    **kwargs: Passed on to streamChat (model, api_key, sampling options).
+
+  Yields:
+    str: Text chunks; a cached answer comes as a single chunk.
+  """
+  cache = llmCache()
+  resolved = resolveProvider(provider)
+  # Keyed like streamChat resolves them, so stub answers never stand in for a real model's.
+  options = {name: value for name, value in kwargs.items() if name != "api_key"}
+  options["model"] = (kwargs.get("model") if resolved == provider else None) or DEFAULT_MODELS[resolved]
+  key = digest(namespace, resolved, options, messages)
+  scope = digest(namespace, resolved, options, scope) if scope is not None else None
+  threshold = LLM_CACHE_SIMILARITY if threshold is None else threshold
+  embedding = embedQuestion(cache, question) if scope and question else None
+  now = time.time()
+
+  try:
+    response, outcome = lookup(cache, key, scope, embedding, threshold, now)
+  except sqlite3.Error:
+    response, outcome = None, None
+  if response is not None:
+    count(cache, namespace, outcome, len(response))
+    yield response
+    return
+
+  count(cache, namespace, "miss")
+  chunks = []
+  for chunk in streamChat(provider, messages, **kwargs):
+    chunks.append(chunk)
+    yield chunk
+  response = "".join(chunks)
+  if not response.strip():
+    # Nothing came back (e.g. a safety block): serving that until the TTL runs out would only repeat the blank.
+    return
+  # The cache is an optimisation; a locked or read-only database must never break the page.
+  with contextlib.suppress(sqlite3.Error):
+    store(cache, key, namespace, scope, response, embedding, now)
+
+
+def llmCacheMetrics():
+  """
+  Hit counts per namespace for the admin page.
+
+  Returns:
+    list: One row dict per namespace.
+  """
+  cache = llmCache()
+  with cache["lock"]:
+    rows = []
+    for namespace, stats in sorted(cache["stats"].items()):
+      calls = stats["exact"] + stats["semantic"] + stats["miss"]
+      rows.append(
+        {
+          "namespace": namespace,
+          "exact hits": stats["exact"],
+          "semantic hits": stats["semantic"],
+          "misses": stats["miss"],
+          "hit rate": round((stats["exact"] + stats["semantic"]) / calls, 3) if calls else None,
+          "answer chars served": stats["saved_chars"],
+        }
+      )
+  return rows
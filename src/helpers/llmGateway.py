@@ -0,0 +1,263 @@
+import base64
+import hashlib
+import json
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+
+import streamlit as st
+
+# Seconds for a whole completion, first token included. The SDK clients also use it as their read timeout.
+LLM_TIMEOUT = float(os.environ.get("JARVIS_LLM_TIMEOUT", "60"))
+LLM_RETRIES = 2
+# Concurrent completions per provider across all sessions; further requests queue for up to LLM_QUEUE_TIMEOUT.
+LLM_CONCURRENCY = int(os.environ.get("JARVIS_LLM_CONCURRENCY", "4"))
+LLM_QUEUE_TIMEOUT = 30
+LLM_MAX_CLIENTS = 32
+# "stub" routes every page through the local stub provider, so the app can be load-tested offline without API keys.
+LLM_PROVIDER_OVERRIDE = os.environ.get("JARVIS_LLM_PROVIDER", "")
+STUB_FIRST_TOKEN_MS = float(os.environ.get("JARVIS_LLM_STUB_FIRST_TOKEN_MS", "300"))
+STUB_TOKEN_MS = float(os.environ.get("JARVIS_LLM_STUB_TOKEN_MS", "15"))
+
+DEFAULT_MODELS = {
+  "groq": "llama-3.1-8b-instant",
+  "gemini": "gemini-1.5-flash",
+  "stub": "stub-echo",
+}
+
+
+class LLMBusy(RuntimeError):
+  """Every slot of the provider stayed busy for LLM_QUEUE_TIMEOUT: the request was not sent."""
+
+
+def resolveProvider(provider):
+  return LLM_PROVIDER_OVERRIDE or provider
+
+
+def needsApiKey(provider):
+  """Whether a page must ask for the provider's API key (not when the stub provider is forced)."""
+  return resolveProvider(provider) != "stub"
+
+
+@st.cache_resource
+def llmGateway():
+  """Process-wide LLM state: SDK clients (LRU), one concurrency cap per provider and per-provider stats."""
+  return {"lock": threading.Lock(), "clients": OrderedDict(), "slots": {}, "stats": {}}
+
+
+def groqClient(api_key, model, options):
+  from groq import Groq
+
+  return Groq(api_key=api_key, timeout=LLM_TIMEOUT, max_retries=LLM_RETRIES)
+
+
+def streamGroq(client, model, messages, options, usage):
+  if any(message.get("images") for message in messages):
+    raise ValueError("Groq models do not accept images.")
+  stream = client.chat.completions.create(
+    model=model, messages=[{"role": message["role"], "content": message["content"]} for message in messages], stream=True, **options
+  )
+  try:
+    for chunk in stream:
+      if chunk.choices and chunk.choices[0].delta.content:
+        yield chunk.choices[0].delta.content
+      # Groq reports token usage on the last chunk of a stream.
+      x_groq = getattr(chunk, "x_groq", None)
+      if x_groq is not None and getattr(x_groq, "usage", None):
+        usage["input"] += x_groq.usage.prompt_tokens
+        usage["output"] += x_groq.usage.completion_tokens
+  finally:
+    stream.close()
+
+
+def geminiClient(api_key, model, options):
+  # The LangChain client takes its API key per instance; google.generativeai.configure() is process-global and
+  # would let the Gemini chatbot and the vision page (different keys) overwrite each other's key.
+  from langchain_google_genai import ChatGoogleGenerativeAI
+
+  return ChatGoogleGenerativeAI(model=model, google_api_key=api_key, timeout=LLM_TIMEOUT, max_retries=LLM_RETRIES, **options)
+
+
+def streamGemini(client, model, messages, options, usage):
+  from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+  types = {"system": SystemMessage, "user": HumanMessage, "assistant": AIMessage}
+  converted = []
+  for message in messages:
+    content = message["content"]
+    if message.get("images"):
+      images = [
+        {"type": "image_url", "image_url": f"data:{mime_type};base64,{base64.b64encode(data).decode('utf-8')}"}
+        for mime_type, data in message["images"]
+      ]
+      content = [{"type": "text", "text": content}] + images
+    converted.append(types[message["role"]](content=content))
+  stream = client.stream(converted)
+  try:
+    for chunk in stream:
+      if chunk.usage_metadata:
+        usage["input"] += chunk.usage_metadata.get("input_tokens", 0)
+        usage["output"] += chunk.usage_metadata.get("output_tokens", 0)
+      if isinstance(chunk.content, str) and chunk.content:
+        yield chunk.content
+  finally:
+    stream.close()
+
+
+def streamStub(client, model, messages, options, usage):
+  # Echoes the last message back word by word with the configured latencies, and counts words as tokens.
+  words = f"[stub] {messages[-1]['content']}".split()[: options.get("max_tokens") or None]
+  usage["input"] += sum(len(str(message["content"]).split()) for message in messages)
+  time.sleep(options.get("first_token_ms", STUB_FIRST_TOKEN_MS) / 1000)
+  for i, word in enumerate(words):
+    if i:
+      time.sleep(options.get("token_ms", STUB_TOKEN_MS) / 1000)
+    usage["output"] += 1
+    yield f"{word} " if i < len(words) - 1 else word
+
+
+LLM_STATS = ["requests", "errors", "cancelled", "rejected", "queue_s", "first_token_s", "first_tokens", "latency_s", "input_tokens", "output_tokens"]
+
+PROVIDERS = {
+  "groq": {"client": groqClient, "stream": streamGroq},
+  "gemini": {"client": geminiClient, "stream": streamGemini},
+  "stub": {"client": lambda api_key, model, options: None, "stream": streamStub},
+}
+
+
+def providerState(gateway, provider, model, api_key, options):
+  # One client per provider, key, model and options: SDK clients own a connection pool and are thread-safe.
+  key = (provider, model, hashlib.sha256((api_key or "").encode("utf-8")).hexdigest(), json.dumps(options, sort_keys=True))
+  with gateway["lock"]:
+    slots = gateway["slots"].setdefault(provider, threading.BoundedSemaphore(LLM_CONCURRENCY))
+    stats = gateway["stats"].setdefault(provider, dict.fromkeys(LLM_STATS, 0))
+    client = gateway["clients"].get(key)
+    if client is None:
+      client = gateway["clients"][key] = PROVIDERS[provider]["client"](api_key, model, options)
+      while len(gateway["clients"]) > LLM_MAX_CLIENTS:
+        gateway["clients"].popitem(last=False)
+    gateway["clients"].move_to_end(key)
+  return client, slots, stats
+
+
+def pumpChunks(chunks, output, stop, slots):
+  """
+  Reader thread of streamChat: move the provider's chunks to output until the stream ends or stop is set. The
+  stream is closed and the provider slot released here, once the provider call has really ended.
+  """
+  try:
+    for text in chunks:
+      if stop.is_set():
+        break
+      output.put(("chunk", text))
+    output.put(("done", None))
+  except BaseException as e:
+    output.put(("error", e))
+  finally:
+    chunks.close()
+    slots.release()
+
+
+def streamChat(provider, messages, model=None, api_key=None, **options):
+  """
+  Stream a chat completion through the provider's pooled client.
+
+  Args:
+    provider (str): "groq", "gemini" or "stub". JARVIS_LLM_PROVIDER overrides it (with that provider's default model).
+    messages (list): {"role": "system" | "user" | "assistant", "content": str} dicts. A message may also carry
+      "images": [(mime type, bytes)] for multimodal models.
+    model (str, optional): Model name. Defaults to the provider's entry in DEFAULT_MODELS.
+    api_key (str, optional): Provider API key.
+    **options: Sampling options such as temperature and max_tokens.
+
+  Yields:
+    str: Text chunks as the model produces them. Nothing is sent until iteration starts.
+
+  Raises:
+    LLMBusy: When no provider slot frees up within LLM_QUEUE_TIMEOUT.
+    TimeoutError: When the completion runs longer than LLM_TIMEOUT, whether or not the provider is still sending.
+  """
+  requested, provider = provider, resolveProvider(provider)
+  model = (model if provider == requested else None) or DEFAULT_MODELS[provider]
+  gateway = llmGateway()
+  client, slots, stats = providerState(gateway, provider, model, api_key, options)
+
+  queued = time.perf_counter()
+  if not slots.acquire(timeout=LLM_QUEUE_TIMEOUT):
+    with gateway["lock"]:
+      stats["rejected"] += 1
+    raise LLMBusy(f"Too many requests to {provider} right now. Please try again in a moment.")
+  start = time.perf_counter()
+  first_token, outcome = None, "errors"
+  usage = {"input": 0, "output": 0}
+  # The provider is read on its own thread so the deadline holds even while it stalls before or between tokens,
+  # which the SDKs' per-read timeouts alone do not bound.
+  output, stop = queue.Queue(), threading.Event()
+  chunks = PROVIDERS[provider]["stream"](client, model, messages, options, usage)
+  threading.Thread(target=pumpChunks, args=(chunks, output, stop, slots), name=f"jarvis-llm-{provider}", daemon=True).start()
+  try:
+    while True:
+      try:
+        kind, value = output.get(timeout=max(0.0, start + LLM_TIMEOUT - time.perf_counter()))
+      except queue.Empty:
+        raise TimeoutError(f"{provider} did not finish within {LLM_TIMEOUT:.0f} seconds.") from None
+      if kind == "done":
+        break
+      if kind == "error":
+        raise value
+      if first_token is None:
+        first_token = time.perf_counter() - start
+      yield value
+    outcome = "requests"
+  except GeneratorExit:
+    # The page stopped reading (rerun or closed tab).
+    outcome = "cancelled"
+    raise
+  finally:
+    stop.set()
+    with gateway["lock"]:
+      stats[outcome] += 1
+      stats["queue_s"] += start - queued
+      stats["latency_s"] += time.perf_counter() - start
+      if first_token is not None:
+        stats["first_token_s"] += first_token
+        stats["first_tokens"] += 1
+      stats["input_tokens"] += usage["input"]
+      stats["output_tokens"] += usage["output"]
+
+
+def chat(provider, messages, **kwargs):
+  """Complete a chat and return the whole text. See streamChat."""
+  return "".join(streamChat(provider, messages, **kwargs))
+
+
+def llmMetrics():
+  """
+  Per-provider counters for the admin page.
+
+  Returns:
+    list: One row dict per provider that served a request.
+  """
+  gateway = llmGateway()
+  with gateway["lock"]:
+    rows = []
+    for provider, stats in sorted(gateway["stats"].items()):
+      calls = stats["requests"] + stats["errors"] + stats["cancelled"]
+      rows.append(
+        {
+          "provider": provider,
+          "completed": stats["requests"],
+          "errors": stats["errors"],
+          "cancelled": stats["cancelled"],
+          "rejected": stats["rejected"],
+          "avg queue (ms)": round(stats["queue_s"] / calls * 1000) if calls else None,
+          "avg first token (ms)": round(stats["first_token_s"] / stats["first_tokens"] * 1000) if stats["first_tokens"] else None,
+          "avg latency (ms)": round(stats["latency_s"] / calls * 1000) if calls else None,
+          "input tokens": stats["input_tokens"],
+          "output tokens": stats["output_tokens"],
+          "output tokens/s": round(stats["output_tokens"] / stats["latency_s"], 1) if stats["latency_s"] else None,
+        }
+      )
+  return rows
@@ -0,0 +1,320 @@
+import gc
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+import streamlit as st
+
+MODEL_MEMORY_BUDGET_MB = float(os.environ.get("JARVIS_MODEL_MEMORY_MB", "4096"))
+MAX_BATCH_SIZE = int(os.environ.get("JARVIS_MAX_BATCH_SIZE", "8"))
+MAX_BATCH_WAIT_MS = float(os.environ.get("JARVIS_MAX_BATCH_WAIT_MS", "10"))
+LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+
+def estimateSizeMB(model):
+  """
+  Best-effort estimate of the memory held by a model's weights.
+
+  Understands torch modules, Keras models, transformers pipelines and tuples/lists/dicts of those
+  (e.g. a (model, tokenizer) pair). A dict with a "size_mb" key reports that size as-is. Anything else counts as 0.
+
+  Args:
+    model: The object returned by a model's load function.
+
+  Returns:
+    float: Estimated size in MB.
+  """
+  if isinstance(model, (tuple, list)):
+    return sum(estimateSizeMB(item) for item in model)
+  if isinstance(model, dict):
+    if "size_mb" in model:
+      return model["size_mb"]
+    return sum(estimateSizeMB(item) for item in model.values())
+  if hasattr(model, "parameters") and callable(model.parameters):
+    try:
+      return sum(param.numel() * param.element_size() for param in model.parameters()) / (1024 * 1024)
+    except (AttributeError, TypeError):
+      pass
+  if hasattr(model, "count_params") and callable(model.count_params):
+    # Keras keeps float32 weights.
+    return model.count_params() * 4 / (1024 * 1024)
+  if hasattr(model, "model"):
+    return estimateSizeMB(model.model)
+  return 0.0
+
+
+@st.cache_resource
+def modelRuntime():
+  """Process-wide model runtime shared by every session: registered specs, loaded models (LRU order) and stats."""
+  return {"lock": threading.Lock(), "specs": {}, "models": OrderedDict(), "stats": {}, "batchers": {}}
+
+
+def registerModel(name, load, predict, concurrency=1, size_mb=None, batching=False, max_batch_size=None, max_wait_ms=None):
+  """
+  Register a model with the shared runtime. Registering again replaces the spec but keeps a loaded model.
+
+  Args:
+    name (str): Unique model name used by predict().
+    load (callable): Builds and returns the model. Called on first use and again after eviction, always on the thread of
+      the predict()/predictOne() caller. Should raise on failure.
+    predict (callable): predict(model, batch) returning one output per item in batch.
+    concurrency (int): How many predictions may run on the model at once. 1 serializes inference.
+    size_mb (float, optional): Known memory footprint. Estimated from the loaded model when omitted.
+    batching (bool): Collect concurrent predictOne() calls into micro-batches instead of running them one by one.
+    max_batch_size (int, optional): Largest micro-batch. Defaults to JARVIS_MAX_BATCH_SIZE.
+    max_wait_ms (float, optional): How long the first request of a batch waits for company. Defaults to JARVIS_MAX_BATCH_WAIT_MS.
+  """
+  runtime = modelRuntime()
+  with runtime["lock"]:
+    runtime["specs"][name] = {
+      "load": load,
+      "predict": predict,
+      "concurrency": max(1, concurrency),
+      "size_mb": size_mb,
+      "batching": batching,
+      "max_batch_size": max(1, max_batch_size or MAX_BATCH_SIZE),
+      "max_wait_ms": MAX_BATCH_WAIT_MS if max_wait_ms is None else max_wait_ms,
+    }
+    runtime["stats"].setdefault(
+      name,
+      {
+        "loads": 0,
+        "evictions": 0,
+        "batches": 0,
+        "items": 0,
+        "seconds": 0.0,
+        "load_seconds": None,
+        "batch_sizes": {},
+        "latency_ms": [0] * (len(LATENCY_BUCKETS_MS) + 1),
+      },
+    )
+
+
+def evictIdle(runtime, keep, incoming_mb=0.0):
+  """Drop least recently used idle models until the loaded models (plus incoming_mb) fit the memory budget."""
+  models = runtime["models"]
+  total = sum(entry["size_mb"] for entry in models.values()) + incoming_mb
+  evicted = False
+  for name in list(models):
+    if total <= MODEL_MEMORY_BUDGET_MB:
+      break
+    entry = models[name]
+    if name == keep or entry["in_flight"] or entry["model"] is None:
+      continue
+    models.pop(name)
+    total -= entry["size_mb"]
+    runtime["stats"][name]["evictions"] += 1
+    evicted = True
+  return evicted
+
+
+def acquireModel(runtime, name):
+  with runtime["lock"]:
+    if name not in runtime["specs"]:
+      raise KeyError(f"Model '{name}' is not registered.")
+    spec = runtime["specs"][name]
+    entry = runtime["models"].get(name)
+    if entry is None:
+      entry = {
+        "model": None,
+        "size_mb": 0.0,
+        "in_flight": 0,
+        "last_used": time.time(),
+        "load_lock": threading.Lock(),
+        "slots": threading.Semaphore(spec["concurrency"]),
+      }
+      runtime["models"][name] = entry
+    runtime["models"].move_to_end(name)
+    entry["in_flight"] += 1
+
+  try:
+    with entry["load_lock"]:
+      if entry["model"] is None:
+        with runtime["lock"]:
+          evicted = evictIdle(runtime, keep=name, incoming_mb=spec["size_mb"] or 0.0)
+        if evicted:
+          gc.collect()
+        start = time.perf_counter()
+        model = spec["load"]()
+        load_seconds = time.perf_counter() - start
+        with runtime["lock"]:
+          entry["model"] = model
+          entry["size_mb"] = spec["size_mb"] if spec["size_mb"] is not None else estimateSizeMB(model)
+          runtime["stats"][name]["loads"] += 1
+          runtime["stats"][name]["load_seconds"] = load_seconds
+          evicted = evictIdle(runtime, keep=name)
+        if evicted:
+          gc.collect()
+  except BaseException:
+    with runtime["lock"]:
+      entry["in_flight"] -= 1
+      if entry["model"] is None and not entry["in_flight"] and runtime["models"].get(name) is entry:
+        runtime["models"].pop(name)
+    raise
+  return entry, spec
+
+
+def releaseModel(runtime, entry):
+  with runtime["lock"]:
+    entry["in_flight"] -= 1
+    entry["last_used"] = time.time()
+
+
+def predict(name, batch):
+  """
+  Run a batch through a registered model, loading it first if it is not resident.
+
+  Args:
+    name (str): Registered model name.
+    batch (list): Inputs in the form the model's predict function expects.
+
+  Returns:
+    list: One output per input.
+  """
+  runtime = modelRuntime()
+  entry, spec = acquireModel(runtime, name)
+  try:
+    start = time.perf_counter()
+    with entry["slots"]:
+      outputs = spec["predict"](entry["model"], batch)
+    seconds = time.perf_counter() - start
+    with runtime["lock"]:
+      stats = runtime["stats"][name]
+      stats["batches"] += 1
+      stats["items"] += len(batch)
+      stats["seconds"] += seconds
+  finally:
+    releaseModel(runtime, entry)
+  return outputs
+
+
+def recordLatency(runtime, name, seconds):
+  milliseconds = seconds * 1000
+  bucket = next((i for i, bound in enumerate(LATENCY_BUCKETS_MS) if milliseconds <= bound), len(LATENCY_BUCKETS_MS))
+  with runtime["lock"]:
+    runtime["stats"][name]["latency_ms"][bucket] += 1
+
+
+def runBatcher(runtime, name, requests):
+  """Worker loop of a micro-batcher: gather requests for up to max_wait_ms, run them as one batch, fan results out."""
+  while True:
+    batch = [requests.get()]
+    with runtime["lock"]:
+      spec = runtime["specs"][name]
+    deadline = time.perf_counter() + spec["max_wait_ms"] / 1000
+    while len(batch) < spec["max_batch_size"]:
+      remaining = deadline - time.perf_counter()
+      if remaining <= 0:
+        break
+      try:
+        batch.append(requests.get(timeout=remaining))
+      except queue.Empty:
+        break
+
+    with runtime["lock"]:
+      sizes = runtime["stats"][name]["batch_sizes"]
+      sizes[len(batch)] = sizes.get(len(batch), 0) + 1
+    try:
+      outputs = predict(name, [item for item, _future, _queued in batch])
+      for (_item, future, queued), output in zip(batch, outputs, strict=True):
+        recordLatency(runtime, name, time.perf_counter() - queued)
+        future.set_result(output)
+    except BaseException as e:
+      for _item, future, _queued in batch:
+        if not future.done():
+          future.set_exception(e)
+
+
+def predictOne(name, item):
+  """
+  Predict a single input. Models registered with batching=True share one forward pass with concurrent callers.
+
+  Args:
+    name (str): Registered model name.
+    item: One input in the form the model's predict function expects inside a batch.
+
+  Returns:
+    The model output for item.
+  """
+  runtime = modelRuntime()
+  with runtime["lock"]:
+    if name not in runtime["specs"]:
+      raise KeyError(f"Model '{name}' is not registered.")
+    if not runtime["specs"][name]["batching"]:
+      batcher = None
+    else:
+      batcher = runtime["batchers"].get(name)
+      if batcher is None:
+        batcher = queue.Queue()
+        threading.Thread(target=runBatcher, args=(runtime, name, batcher), name=f"jarvis-batcher-{name}", daemon=True).start()
+        runtime["batchers"][name] = batcher
+
+  if batcher is None:
+    start = time.perf_counter()
+    output = predict(name, [item])[0]
+    recordLatency(runtime, name, time.perf_counter() - start)
+    return output
+
+  # Load on the caller's script thread, where loaders may show Streamlit messages or call st.stop(); off it those are
+  # dropped. Holding the model also keeps it from being evicted before the batcher runs the request.
+  entry, _spec = acquireModel(runtime, name)
+  try:
+    future = Future()
+    batcher.put((item, future, time.perf_counter()))
+    return future.result()
+  finally:
+    releaseModel(runtime, entry)
+
+
+def batchMetrics():
+  """
+  Batch-size and latency histograms per model for the admin page.
+
+  Returns:
+    dict: Model name to {"batch_sizes": {size: count}, "latency_ms": {bucket label: count}}.
+  """
+  runtime = modelRuntime()
+  labels = [f"<= {bound}" for bound in LATENCY_BUCKETS_MS] + [f"> {LATENCY_BUCKETS_MS[-1]}"]
+  with runtime["lock"]:
+    return {
+      name: {
+        "batch_sizes": dict(sorted(stats["batch_sizes"].items())),
+        "latency_ms": dict(zip(labels, stats["latency_ms"], strict=True)),
+      }
+      for name, stats in runtime["stats"].items()
+      if stats["batches"]
+    }
+
+
+def modelMetrics():
+  """
+  Snapshot of the runtime for the admin page.
+
+  Returns:
+    list: One row dict per registered model.
+  """
+  runtime = modelRuntime()
+  rows = []
+  with runtime["lock"]:
+    for name, stats in runtime["stats"].items():
+      entry = runtime["models"].get(name)
+      loaded = entry is not None and entry["model"] is not None
+      rows.append(
+        {
+          "model": name,
+          "loaded": loaded,
+          "size (MB)": round(entry["size_mb"], 1) if loaded else None,
+          "in flight": entry["in_flight"] if entry else 0,
+          "idle (s)": round(time.time() - entry["last_used"], 1) if loaded else None,
+          "loads": stats["loads"],
+          "last load (s)": round(stats["load_seconds"], 2) if stats["load_seconds"] is not None else None,
+          "evictions": stats["evictions"],
+          "batches": stats["batches"],
+          "items": stats["items"],
+          "avg batch (ms)": round(stats["seconds"] / stats["batches"] * 1000, 1) if stats["batches"] else None,
+        }
+      )
+  return rows
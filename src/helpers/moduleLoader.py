@@ -0,0 +1,261 @@
+import ast
+import contextlib
+import importlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+from src.helpers.artifactStore import fileLock
+from src.helpers.cacheDir import getCacheDir
+
+# Top-level imports that take seconds (or hundreds of MB) to load. Page modules that import any of these are
+# worth warming in the background before a user selects them.
+HEAVY_DEPENDENCIES = [
+  "cv2",
+  "deepface",
+  "faiss",
+  "gdown",
+  "google.generativeai",
+  "groq",
+  "langchain_community",
+  "langchain_core",
+  "langchain_google_genai",
+  "langchain_groq",
+  "langchain_text_splitters",
+  "matplotlib",
+  "mtcnn",
+  "nltk",
+  "plotly",
+  "pygame",
+  "spotipy",
+  "tensorflow",
+  "torch",
+  "torchvision",
+  "transformers",
+]
+
+PRELOAD_WORKERS = int(os.environ.get("JARVIS_PRELOAD_WORKERS", "2"))
+PRELOAD_LIMIT = int(os.environ["JARVIS_PRELOAD_LIMIT"]) if os.environ.get("JARVIS_PRELOAD_LIMIT") else None
+
+
+def moduleDependencies(path):
+  """
+  List the heavy dependencies a page module imports at top level.
+
+  Args:
+    path (str): Path to the page module source file.
+
+  Returns:
+    list: Sorted names from HEAVY_DEPENDENCIES imported by the module.
+  """
+  with open(path, encoding="utf-8") as f:
+    tree = ast.parse(f.read(), filename=path)
+
+  names = []
+  for node in tree.body:
+    if isinstance(node, ast.Import):
+      names.extend(alias.name for alias in node.names)
+    elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+      names.append(node.module)
+  return sorted({dep for dep in HEAVY_DEPENDENCIES for name in names if name == dep or name.startswith(f"{dep}.")})
+
+
+def pageModules(MAIN_DIR="src/apps/pages"):
+  """
+  List every page module under MAIN_DIR.
+
+  Args:
+    MAIN_DIR (str): Root directory holding the page modules.
+
+  Returns:
+    list: (dotted module path, file path) tuples, e.g. ("src.apps.pages.models.Utility.spellingCorrectorModel", "...py").
+  """
+  modules = []
+  for root, dirs, files in os.walk(MAIN_DIR):
+    dirs.sort()
+    for file in sorted(files):
+      if file.endswith(".py") and not file.startswith("__"):
+        path = os.path.join(root, file)
+        modules.append((path[:-3].replace(os.sep, "."), path))
+  return modules
+
+
+@st.cache_resource
+def moduleManifest(MAIN_DIR="src/apps/pages"):
+  """
+  Map every page module under MAIN_DIR to the heavy dependencies it imports.
+
+  Args:
+    MAIN_DIR (str): Root directory holding the page modules.
+
+  Returns:
+    dict: Dotted module path to a list of dependencies.
+  """
+  manifest = {}
+  for module, path in pageModules(MAIN_DIR):
+    try:
+      manifest[module] = moduleDependencies(path)
+    except (OSError, SyntaxError):
+      continue
+  return manifest
+
+
+def usagePath():
+  return os.path.join(getCacheDir(), "module_usage.json")
+
+
+def readUsage():
+  try:
+    with open(usagePath(), encoding="utf-8") as f:
+      return json.load(f)
+  except (OSError, ValueError):
+    return {}
+
+
+def writeUsage(usage):
+  # Write through a temp file so concurrent workers never read a half-written file.
+  tmp_path = f"{usagePath()}.{os.getpid()}.tmp"
+  with open(tmp_path, "w", encoding="utf-8") as f:
+    json.dump(usage, f)
+  os.replace(tmp_path, usagePath())
+
+
+def recordUsage(name):
+  """
+  Count one opening of a page in the usage file shared by every worker on the host.
+
+  The file is read, incremented and written under a file lock, so the counts of the other workers are kept.
+
+  Returns:
+    dict: The merged counts of every worker.
+  """
+  with fileLock(f"{usagePath()}.lock"):
+    usage = readUsage()
+    usage[name] = usage.get(name, 0) + 1
+    writeUsage(usage)
+  return usage
+
+
+@st.cache_resource
+def moduleLoader():
+  """Process-wide loader state: preload pool, pending imports, usage counts and import metrics."""
+  return {
+    "lock": threading.Lock(),
+    "executor": ThreadPoolExecutor(max_workers=PRELOAD_WORKERS, thread_name_prefix="jarvis-preload"),
+    "started": False,
+    "pending": {},
+    "usage": readUsage(),
+    "modules": {},
+    "dependencies": {},
+  }
+
+
+def timedImport(name):
+  start = time.perf_counter()
+  module = importlib.import_module(name)
+  return module, time.perf_counter() - start
+
+
+def preloadDependency(loader, dep):
+  if dep in sys.modules:
+    return
+  try:
+    _, seconds = timedImport(dep)
+    status = "ok"
+  except Exception as e:
+    seconds, status = None, f"failed: {e}"
+  with loader["lock"]:
+    loader["dependencies"][dep] = {"seconds": seconds, "status": status, "loaded_at": time.time()}
+
+
+def startPreloading():
+  """
+  Queue the heavy dependencies of the most-used page modules on the background pool, once per process.
+
+  Modules are ordered by how often they were opened (persisted across restarts), so the popular pages are
+  warm first. Only the dependencies are imported, not the page modules themselves, because several pages
+  render Streamlit elements at import time and must run inside a user's script thread.
+  """
+  loader = moduleLoader()
+  with loader["lock"]:
+    if loader["started"]:
+      return
+    loader["started"] = True
+    manifest = moduleManifest()
+    usage = loader["usage"]
+    ordered = sorted((module for module, deps in manifest.items() if deps), key=lambda module: -usage.get(module, 0))
+    for module in ordered[:PRELOAD_LIMIT]:
+      for dep in manifest[module]:
+        if dep not in loader["pending"] and dep not in sys.modules:
+          loader["pending"][dep] = loader["executor"].submit(preloadDependency, loader, dep)
+
+
+def loadPageModule(name):
+  """
+  Import a page module, recording how long the first import took and how often the page is opened.
+
+  Args:
+    name (str): Dotted module path of the page.
+
+  Returns:
+    module: The imported page module.
+  """
+  loader = moduleLoader()
+  opened = st.session_state.setdefault("opened_page_modules", set())
+  if name not in opened:
+    opened.add(name)
+    with loader["lock"]:
+      loader["usage"][name] = loader["usage"].get(name, 0) + 1
+    with contextlib.suppress(OSError):
+      usage = recordUsage(name)
+      with loader["lock"]:
+        loader["usage"] = usage
+
+  if name in sys.modules:
+    return sys.modules[name]
+
+  deps = moduleManifest().get(name, [])
+  warm = [dep for dep in deps if dep in sys.modules]
+  module, seconds = timedImport(name)
+  with loader["lock"]:
+    loader["modules"][name] = {"seconds": seconds, "dependencies": deps, "warm_dependencies": warm, "loaded_at": time.time()}
+  return module
+
+
+def importMetrics():
+  """
+  Snapshot of the loader metrics for the admin page.
+
+  Returns:
+    tuple: (modules, dependencies, pending) where modules and dependencies are lists of row dicts, slowest first,
+      and pending is the number of preloads still running.
+  """
+  loader = moduleLoader()
+  with loader["lock"]:
+    modules = [
+      {
+        "module": name,
+        "import (s)": round(data["seconds"], 3),
+        "opened": loader["usage"].get(name, 0),
+        "dependencies": ", ".join(data["dependencies"]),
+        "warm at import": f"{len(data['warm_dependencies'])}/{len(data['dependencies'])}",
+      }
+      for name, data in loader["modules"].items()
+    ]
+    dependencies = [
+      {
+        "dependency": dep,
+        "preload (s)": round(data["seconds"], 3) if data["seconds"] is not None else None,
+        "status": data["status"],
+      }
+      for dep, data in loader["dependencies"].items()
+    ]
+    pending = sum(1 for future in loader["pending"].values() if not future.done())
+  modules.sort(key=lambda row: -row["import (s)"])
+  dependencies.sort(key=lambda row: -(row["preload (s)"] or 0))
+  return modules, dependencies, pending
@@ -0,0 +1,69 @@
+import os
+
+import numpy as np
+
+from src.helpers.cacheDir import getCacheDir
+
+# Serve the int8 artifact when one was exported. Set JARVIS_ONNX_QUANTIZED=0 to prefer full precision.
+PREFER_QUANTIZED = os.environ.get("JARVIS_ONNX_QUANTIZED", "1") != "0"
+
+
+def onnxArtifactPath(name, quantized=False):
+  """
+  Path of an exported ONNX model inside the local cache.
+
+  Args:
+    name (str): Model name, e.g. "dogBreedClassifier".
+    quantized (bool): Return the int8 dynamically quantized variant.
+
+  Returns:
+    str: Path to the .onnx file (it may not exist yet).
+  """
+  return os.path.join(getCacheDir("onnx"), f"{name}.int8.onnx" if quantized else f"{name}.onnx")
+
+
+def loadOnnxModel(name):
+  """
+  Open an exported model with onnxruntime, if both the artifact and onnxruntime are available.
+
+  Args:
+    name (str): Model name used when exporting.
+
+  Returns:
+    dict or None: {"backend": "onnx", "session", "input", "path", "size_mb"}, or None so the caller can fall back
+      to its native framework.
+  """
+  try:
+    import onnxruntime
+  except ImportError:
+    return None
+
+  candidates = [onnxArtifactPath(name, quantized=True), onnxArtifactPath(name)]
+  if not PREFER_QUANTIZED:
+    candidates.reverse()
+  path = next((candidate for candidate in candidates if os.path.exists(candidate)), None)
+  if path is None:
+    return None
+
+  session = onnxruntime.InferenceSession(path, providers=["CPUExecutionProvider"])
+  return {
+    "backend": "onnx",
+    "session": session,
+    "input": session.get_inputs()[0].name,
+    "path": path,
+    "size_mb": os.path.getsize(path) / (1024 * 1024),
+  }
+
+
+def runOnnx(model, batch):
+  """
+  Run a stacked batch through an ONNX model returned by loadOnnxModel.
+
+  Args:
+    model (dict): Result of loadOnnxModel.
+    batch (np.ndarray): Input batch, already preprocessed for the model.
+
+  Returns:
+    np.ndarray: The first model output.
+  """
+  return model["session"].run(None, {model["input"]: np.asarray(batch, dtype=np.float32)})[0]
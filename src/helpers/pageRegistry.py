@@ -0,0 +1,80 @@
+import os
+import threading
+
+import streamlit as st
+
+from src.helpers.getFolders import getFolders
+from src.helpers.getModules import getModules
+
+
+def directorySignature(dirs):
+  """
+  Build a cheap change signature for a set of directories.
+
+  A directory's mtime changes whenever an entry is added, removed or renamed inside it, so stat-ing the
+  directories that were walked is enough to know whether the page layout changed since the last scan.
+
+  Args:
+    dirs (list): Directory paths to stat.
+
+  Returns:
+    tuple: The mtime (in nanoseconds) of each directory, or None for directories that no longer exist.
+  """
+  signature = []
+  for path in dirs:
+    try:
+      signature.append(os.stat(path).st_mtime_ns)
+    except FileNotFoundError:
+      signature.append(None)
+  return tuple(signature)
+
+
+def scanPages(MAIN_DIR):
+  """
+  Walk MAIN_DIR once and collect every category, page folder and module.
+
+  Args:
+    MAIN_DIR (str): Root directory holding the page categories, e.g. "src/apps/pages".
+
+  Returns:
+    tuple: (categories, dirs) where categories maps a category title to its directory name and folders,
+      and dirs lists every directory that was walked.
+  """
+  categories = {}
+  dirs = [MAIN_DIR]
+  for category_name, category_dir in getFolders(MAIN_DIR).items():
+    CATEGORY_PATH = f"{MAIN_DIR}/{category_dir}"
+    dirs.append(CATEGORY_PATH)
+    folders = []
+    for name, folder in getFolders(CATEGORY_PATH).items():
+      COMMON_MODULE_PATH = f"{CATEGORY_PATH}/{folder}"
+      dirs.append(COMMON_MODULE_PATH)
+      folders.append({"title": name, "folder": folder, "modules": getModules(COMMON_MODULE_PATH)})
+    categories[category_name.title()] = {"dir": category_dir, "folders": folders}
+  return categories, dirs
+
+
+@st.cache_resource
+def pageRegistry(MAIN_DIR):
+  """Process-wide holder for the scanned page layout, shared by every session."""
+  return {"lock": threading.Lock(), "signature": None, "dirs": [MAIN_DIR], "categories": {}}
+
+
+def getPageRegistry(MAIN_DIR):
+  """
+  Return the page layout under MAIN_DIR, rescanning only when a directory in it has changed.
+
+  Args:
+    MAIN_DIR (str): Root directory holding the page categories.
+
+  Returns:
+    dict: Category title mapped to {"dir": category directory, "folders": [{"title", "folder", "modules"}]}.
+  """
+  registry = pageRegistry(MAIN_DIR)
+  with registry["lock"]:
+    if directorySignature(registry["dirs"]) != registry["signature"]:
+      categories, dirs = scanPages(MAIN_DIR)
+      registry["categories"] = categories
+      registry["dirs"] = dirs
+      registry["signature"] = directorySignature(dirs)
+  return registry["categories"]
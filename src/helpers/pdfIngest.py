@@ -0,0 +1,130 @@
+import contextlib
+import hashlib
+import multiprocessing
+import os
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+
+import streamlit as st
+
+PDF_WORKERS = int(os.environ.get("JARVIS_PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Pages extracted per worker task: large enough to amortise reopening the file, small enough for smooth progress.
+PAGES_PER_TASK = 8
+
+
+def documentDigest(data):
+  """Content hash that identifies an uploaded document, whatever its file name."""
+  return hashlib.sha256(data).hexdigest()
+
+
+@contextlib.contextmanager
+def temporaryPDF(data):
+  """
+  Write PDF bytes to a private temporary file for the duration of the block.
+
+  Worker processes open the document by path, so uploads are written once instead of being pickled to each worker.
+
+  Args:
+    data (bytes): The PDF content.
+
+  Yields:
+    str: Path to the temporary file.
+  """
+  with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
+    tmp_file.write(data)
+    tmp_path = tmp_file.name
+  try:
+    yield tmp_path
+  finally:
+    os.unlink(tmp_path)
+
+
+@st.cache_resource
+def pdfProcessPool():
+  """Process pool shared by every session. Spawned workers never inherit the server's threads or open sockets."""
+  return ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+
+
+def pageCount(path):
+  from pypdf import PdfReader
+
+  return len(PdfReader(path).pages)
+
+
+def extractPageRange(path, start, stop):
+  """Extract the text of pages [start, stop). Runs in a worker process, so it opens the file itself."""
+  from pypdf import PdfReader
+
+  reader = PdfReader(path)
+  return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+def iterPageTexts(path, workers=PDF_WORKERS, progress=None, pool=None):
+  """
+  Yield the text of every page in order, extracting pages in a process pool.
+
+  Only a few page ranges are in flight at once and pages are handed over as soon as they are ready, so memory stays
+  bounded for documents with thousands of pages. Closing the generator early cancels the remaining work.
+
+  Args:
+    path (str): PDF file path.
+    workers (int): Parallelism, at most JARVIS_PDF_WORKERS. Small documents or workers <= 1 are extracted in this process.
+    progress (callable, optional): progress(done, total) called as pages are yielded.
+    pool (ProcessPoolExecutor, optional): Pool to use. Defaults to pdfProcessPool(); pass it in from background threads.
+
+  Yields:
+    tuple: (zero-based page number, page text).
+  """
+  total = pageCount(path)
+  if progress:
+    progress(0, total)
+
+  if workers <= 1 or total <= PAGES_PER_TASK:
+    for start in range(0, total, PAGES_PER_TASK):
+      for offset, text in enumerate(extractPageRange(path, start, min(start + PAGES_PER_TASK, total))):
+        yield start + offset, text
+        if progress:
+          progress(start + offset + 1, total)
+    return
+
+  pool = pool or pdfProcessPool()
+  ranges = iter([(start, min(start + PAGES_PER_TASK, total)) for start in range(0, total, PAGES_PER_TASK)])
+  pending = deque(pool.submit(extractPageRange, path, *page_range) for page_range in islice(ranges, workers * 2))
+  page = 0
+  try:
+    while pending:
+      try:
+        texts = pending.popleft().result()
+      except BrokenProcessPool:
+        # A crashed worker (e.g. out of memory on a hostile file) breaks the pool for everyone; start a new one next time.
+        pdfProcessPool.clear()
+        raise
+      next_range = next(ranges, None)
+      if next_range:
+        pending.append(pool.submit(extractPageRange, path, *next_range))
+      for text in texts:
+        yield page, text
+        page += 1
+        if progress:
+          progress(page, total)
+  finally:
+    for future in pending:
+      future.cancel()
+
+
+def iterChunks(page_texts, splitter):
+  """
+  Split pages into LangChain Documents as they arrive, tagging each chunk with its page number.
+
+  Args:
+    page_texts (iterable): (page number, text) pairs, e.g. from iterPageTexts.
+    splitter: LangChain text splitter.
+
+  Yields:
+    Document: Chunks in document order.
+  """
+  for page, text in page_texts:
+    yield from splitter.create_documents([text], metadatas=[{"page": page}])
@@ -0,0 +1,34 @@
+import os
+import tempfile
+
+# Output documents larger than this spill from memory to an anonymous temp file while they are built.
+SPOOL_THRESHOLD_MB = float(os.environ.get("JARVIS_SPOOL_MB", "32"))
+
+
+def spooledPDF(writer):
+  """
+  Serialize a PDF writer into a private buffer: memory for small documents, an anonymous temp file above the threshold.
+
+  Nothing is written to a shared path, so concurrent sessions can never overwrite each other's output.
+
+  Args:
+    writer: PyPDF2/pypdf PdfWriter.
+
+  Returns:
+    tempfile.SpooledTemporaryFile: The document, rewound to the start. Closing it frees the memory or deletes the file.
+  """
+  # The buffer outlives this call: the caller owns it and closes it once the document has been served.
+  buffer = tempfile.SpooledTemporaryFile(max_size=int(SPOOL_THRESHOLD_MB * 1024 * 1024), mode="w+b")  # noqa: SIM115
+  try:
+    writer.write(buffer)
+  except BaseException:
+    buffer.close()
+    raise
+  buffer.seek(0)
+  return buffer
+
+
+def readBuffer(buffer):
+  """Return the full content of a spooled buffer, whatever its current position."""
+  buffer.seek(0)
+  return buffer.read()
@@ -0,0 +1,143 @@
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import streamlit as st
+
+from src.helpers.artifactStore import fetchArtifact, findArtifact
+from src.helpers.jobQueue import getJob, submitJob
+from src.helpers.pdfIngest import iterPageTexts, pdfProcessPool, temporaryPDF
+
+# Documents whose page texts and search index stay in memory; others are reloaded from the artifact store.
+PAGE_TEXT_CACHE_SIZE = int(os.environ.get("JARVIS_PAGE_TEXT_CACHE", "8"))
+TOKEN = re.compile(r"\w+")
+# A failed extraction (e.g. a crashed worker) is started again by the first request this long after it failed. Until
+# then sessions are shown the failure, so a document that always fails is not extracted in a loop.
+EXTRACTION_RETRY_SECONDS = 30
+
+
+@st.cache_resource
+def pageTextCache():
+  """Process-wide cache: loaded documents by digest (LRU order) and the extraction job of each digest."""
+  return {"lock": threading.Lock(), "documents": OrderedDict(), "jobs": {}}
+
+
+def buildIndex(pages):
+  """Inverted index: token -> {page number: occurrences on that page}."""
+  index = {}
+  for page, text in enumerate(pages):
+    for token in TOKEN.findall(text.lower()):
+      postings = index.setdefault(token, {})
+      postings[page] = postings.get(page, 0) + 1
+  return index
+
+
+def loadDocument(cache, digest, folder):
+  with open(os.path.join(folder, "pages.json"), encoding="utf-8") as f:
+    pages = json.load(f)
+  document = {"digest": digest, "pages": pages, "index": buildIndex(pages)}
+  with cache["lock"]:
+    cache["documents"][digest] = document
+    cache["documents"].move_to_end(digest)
+    while len(cache["documents"]) > PAGE_TEXT_CACHE_SIZE:
+      cache["documents"].popitem(last=False)
+  return document
+
+
+def extractionJob(progress, cache, pool, digest, data):
+  """Background job: extract every page once into the artifact store, then load and index it."""
+
+  def build(folder):
+    with temporaryPDF(data) as path:
+      pages = [text for _page, text in iterPageTexts(path, progress=lambda done, total: progress(done, total, f"Page {done}/{total}"), pool=pool)]
+    with open(os.path.join(folder, "pages.json"), "w", encoding="utf-8") as f:
+      json.dump(pages, f)
+
+  folder = fetchArtifact("pdf-text", digest, build, derived=True)
+  progress(1, 1, "Indexing")
+  return loadDocument(cache, digest, folder)
+
+
+def cachedDocument(digest):
+  """
+  Return a document's page texts and search index if they were already extracted, from memory or from disk.
+
+  Returns:
+    dict or None: {"digest", "pages": [text per page], "index"}, or None if the document has not been extracted yet.
+  """
+  cache = pageTextCache()
+  with cache["lock"]:
+    document = cache["documents"].get(digest)
+    if document is not None:
+      cache["documents"].move_to_end(digest)
+      return document
+  folder = findArtifact("pdf-text", digest)
+  return loadDocument(cache, digest, folder) if folder else None
+
+
+def requestDocument(digest, data):
+  """
+  Return a document's cached page texts, starting their extraction in the background on a miss.
+
+  Every session asking for the same content shares one extraction job. A cancelled job is started again right
+  away, a failed one after EXTRACTION_RETRY_SECONDS.
+
+  Args:
+    digest (str): documentDigest of data.
+    data (bytes): The PDF content.
+
+  Returns:
+    tuple: (document, None) when cached, otherwise (None, id of the extraction job).
+  """
+  document = cachedDocument(digest)
+  if document is not None:
+    return document, None
+  cache = pageTextCache()
+  with cache["lock"]:
+    job_id = cache["jobs"].get(digest)
+    job = getJob(job_id) if job_id else None
+    retry = job is not None and job["status"] == "failed" and time.time() - job["finished"] > EXTRACTION_RETRY_SECONDS
+    if job is None or job["status"] == "cancelled" or retry:
+      job_id = submitJob("Extract page text", extractionJob, cache, pdfProcessPool(), digest, data)
+      cache["jobs"][digest] = job_id
+  return None, job_id
+
+
+def snippet(text, terms, width=80):
+  """Excerpt around the first match of any term, with matches in bold."""
+  pattern = re.compile(r"\b(" + "|".join(re.escape(term) for term in terms) + r")\b", re.IGNORECASE)
+  match = pattern.search(text)
+  if match is None:
+    return ""
+  start, end = max(0, match.start() - width), min(len(text), match.end() + width)
+  excerpt = " ".join(text[start:end].split())
+  excerpt = pattern.sub(lambda found: f"**{found.group(0)}**", excerpt)
+  return ("…" if start else "") + excerpt + ("…" if end < len(text) else "")
+
+
+def searchDocument(document, query, limit=20):
+  """
+  Find the pages containing every word of query, best matches first (tf-idf).
+
+  Args:
+    document (dict): From cachedDocument or requestDocument.
+    query (str): Words to look for, case-insensitive.
+    limit (int): Maximum number of pages returned.
+
+  Returns:
+    list: {"page": zero-based page number, "score": float, "snippet": str} per matching page.
+  """
+  terms = list(dict.fromkeys(TOKEN.findall(query.lower())))
+  postings = [document["index"].get(term) for term in terms]
+  if not terms or not all(postings):
+    return []
+  postings.sort(key=len)
+  pages = set(postings[0]).intersection(*postings[1:])
+  num_pages = len(document["pages"])
+  scores = {page: sum(posting[page] * math.log(1 + num_pages / len(posting)) for posting in postings) for page in pages}
+  best = sorted(scores, key=lambda page: (-scores[page], page))[:limit]
+  return [{"page": page, "score": scores[page], "snippet": snippet(document["pages"][page], terms)} for page in best]
@@ -0,0 +1,118 @@
+import os
+import threading
+import time
+
+# Sustained requests per second and burst size per upstream provider, kept a little under each provider's
+# published limit. Hosts without a provider are not throttled.
+PROVIDERS = {
+  "jikan": {"hosts": ["api.jikan.moe"], "rate": 1.0, "burst": 3},
+  "coingecko": {"hosts": ["api.coingecko.com"], "rate": 0.4, "burst": 5},
+  "newsapi": {"hosts": ["newsapi.org"], "rate": 1.0, "burst": 5},
+  "nasa": {"hosts": ["api.nasa.gov", "images-api.nasa.gov"], "rate": 0.25, "burst": 10},
+  "spoonacular": {"hosts": ["api.spoonacular.com"], "rate": 1.0, "burst": 2},
+  "opentdb": {"hosts": ["opentdb.com"], "rate": 0.2, "burst": 1},
+}
+# A request queued behind the bucket longer than this fails fast instead of holding the page.
+MAX_THROTTLE_WAIT = float(os.environ.get("JARVIS_MAX_THROTTLE_WAIT", "10"))
+
+
+class TokenBucket:
+  """
+  Token bucket that queues callers instead of rejecting them: tokens may go negative, which reserves future slots in
+  arrival order, so bursts are smoothed into a steady rate.
+  """
+
+  def __init__(self, rate, capacity):
+    self.rate = rate
+    self.capacity = capacity
+    self.tokens = float(capacity)
+    self.updated = time.monotonic()
+    self.lock = threading.Lock()
+
+  def available(self):
+    with self.lock:
+      return min(self.capacity, self.tokens + (time.monotonic() - self.updated) * self.rate)
+
+  def acquire(self, max_wait=None):
+    """
+    Take a token, sleeping until it is due.
+
+    Args:
+      max_wait (float, optional): Give up without taking a token if it would be due later than this.
+
+    Returns:
+      float or None: Seconds waited, or None when the wait would exceed max_wait.
+    """
+    with self.lock:
+      now = time.monotonic()
+      self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+      self.updated = now
+      wait = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+      if max_wait is not None and wait > max_wait:
+        return None
+      self.tokens -= 1
+    if wait:
+      time.sleep(wait)
+    return wait
+
+
+def createGovernor():
+  """Fresh governor state: one bucket and one stats row per provider, plus the host -> provider map."""
+  return {
+    "lock": threading.Lock(),
+    "hosts": {host: name for name, provider in PROVIDERS.items() for host in provider["hosts"]},
+    "buckets": {name: TokenBucket(provider["rate"], provider["burst"]) for name, provider in PROVIDERS.items()},
+    "stats": {name: {"requests": 0, "coalesced": 0, "throttled": 0, "wait_seconds": 0.0, "rejected": 0} for name in PROVIDERS},
+  }
+
+
+def providerFor(governor, host):
+  return governor["hosts"].get(host)
+
+
+def countCoalesced(governor, provider):
+  with governor["lock"]:
+    governor["stats"][provider]["coalesced"] += 1
+
+
+def throttle(governor, provider, max_wait=MAX_THROTTLE_WAIT):
+  """
+  Wait for the provider's next request slot.
+
+  Returns:
+    bool: True once the request may be sent, False when the provider's queue is longer than max_wait.
+  """
+  wait = governor["buckets"][provider].acquire(max_wait)
+  with governor["lock"]:
+    stats = governor["stats"][provider]
+    if wait is None:
+      stats["rejected"] += 1
+      return False
+    stats["requests"] += 1
+    if wait:
+      stats["throttled"] += 1
+      stats["wait_seconds"] += wait
+  return True
+
+
+def governorMetrics(governor):
+  """
+  Per-provider counters for the admin page.
+
+  Returns:
+    list: One row dict per provider.
+  """
+  with governor["lock"]:
+    return [
+      {
+        "provider": name,
+        "rate (req/s)": PROVIDERS[name]["rate"],
+        "tokens": round(governor["buckets"][name].available(), 2),
+        "requests": stats["requests"],
+        "coalesced": stats["coalesced"],
+        "throttled": stats["throttled"],
+        "avg wait (s)": round(stats["wait_seconds"] / stats["throttled"], 2) if stats["throttled"] else None,
+        "rejected": stats["rejected"],
+      }
+      for name, stats in governor["stats"].items()
+    ]
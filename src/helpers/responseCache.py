@@ -0,0 +1,182 @@
+import contextlib
+import functools
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import streamlit as st
+
+from src.helpers.cacheDir import getCacheDir
+
+MEMORY_ENTRIES = int(os.environ.get("JARVIS_RESPONSE_CACHE_ENTRIES", "512"))
+# Expired rows are kept this long on disk so an upstream outage can still be bridged with the last good copy.
+KEEP_EXPIRED_SECONDS = 7 * 86400
+
+
+@st.cache_resource
+def responseCache():
+  """Process-wide tier-1 state: the in-memory LRU, keys being refreshed in the background and per-namespace stats."""
+  return {"lock": threading.Lock(), "memory": OrderedDict(), "refreshing": set(), "stats": {}, "db_ready": False}
+
+
+def dbPath():
+  return os.path.join(getCacheDir("responses"), "cache.sqlite3")
+
+
+@contextlib.contextmanager
+def database(cache):
+  # One short-lived connection per operation: sqlite connections must not be shared across threads.
+  connection = sqlite3.connect(dbPath(), timeout=5, isolation_level=None)
+  try:
+    if not cache["db_ready"]:
+      connection.execute("PRAGMA journal_mode=WAL")
+      connection.execute("CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, namespace TEXT, value TEXT, fetched REAL, expires REAL)")
+      cache["db_ready"] = True
+    yield connection
+  finally:
+    connection.close()
+
+
+def readDisk(cache, key):
+  try:
+    with database(cache) as db:
+      row = db.execute("SELECT value, fetched FROM responses WHERE key = ?", (key,)).fetchone()
+  except sqlite3.Error:
+    return None
+  return {"value": json.loads(row[0]), "fetched": row[1]} if row else None
+
+
+def writeDisk(cache, key, namespace, entry, expires):
+  try:
+    with database(cache) as db:
+      db.execute(
+        "INSERT OR REPLACE INTO responses (key, namespace, value, fetched, expires) VALUES (?, ?, ?, ?, ?)",
+        (key, namespace, json.dumps(entry["value"]), entry["fetched"], expires),
+      )
+      if random.random() < 0.01:
+        db.execute("DELETE FROM responses WHERE expires < ?", (time.time() - KEEP_EXPIRED_SECONDS,))
+  except sqlite3.Error:
+    # The disk tier is an optimisation; a locked or read-only database must never break the page.
+    pass
+
+
+def remember(cache, key, entry):
+  with cache["lock"]:
+    cache["memory"][key] = entry
+    cache["memory"].move_to_end(key)
+    while len(cache["memory"]) > MEMORY_ENTRIES:
+      cache["memory"].popitem(last=False)
+
+
+def count(cache, namespace, outcome):
+  with cache["lock"]:
+    stats = cache["stats"].setdefault(namespace, {"memory": 0, "disk": 0, "stale": 0, "miss": 0, "stale_on_error": 0, "refresh_errors": 0})
+    stats[outcome] += 1
+
+
+def fetchAndStore(cache, namespace, key, ttl, stale_ttl, fn, args, kwargs):
+  entry = {"value": fn(*args, **kwargs), "fetched": time.time()}
+  remember(cache, key, entry)
+  writeDisk(cache, key, namespace, entry, entry["fetched"] + ttl + stale_ttl)
+  return entry
+
+
+def refreshInBackground(cache, namespace, key, ttl, stale_ttl, fn, args, kwargs):
+  with cache["lock"]:
+    if key in cache["refreshing"]:
+      return
+    cache["refreshing"].add(key)
+
+  def refresh():
+    try:
+      fetchAndStore(cache, namespace, key, ttl, stale_ttl, fn, args, kwargs)
+    except Exception:
+      count(cache, namespace, "refresh_errors")
+    finally:
+      with cache["lock"]:
+        cache["refreshing"].discard(key)
+
+  threading.Thread(target=refresh, name=f"jarvis-refresh-{namespace}", daemon=True).start()
+
+
+def tieredCache(namespace, ttl, stale_ttl=None):
+  """
+  Cache a function's JSON-serialisable result in memory and in a sqlite file shared by every worker on the host.
+
+  A result younger than ttl is served as-is. Up to stale_ttl seconds after that it is still served immediately while
+  one background call refreshes it (stale-while-revalidate). When the function raises (upstream down or rate
+  limited), the last good copy is served if there is one. Exceptions are never cached.
+
+  Args:
+    namespace (str): Cache namespace, e.g. "coingecko:markets". Also the key for cacheMetrics().
+    ttl (float): Seconds a result is fresh.
+    stale_ttl (float, optional): Seconds a result may be served stale while refreshing. Defaults to ttl.
+
+  Returns:
+    callable: Decorator.
+  """
+  stale_ttl = ttl if stale_ttl is None else stale_ttl
+
+  def decorator(fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+      cache = responseCache()
+      digest = hashlib.sha256(json.dumps([args, kwargs], sort_keys=True, default=str).encode("utf-8")).hexdigest()
+      key = f"{namespace}:{digest}"
+
+      with cache["lock"]:
+        entry = cache["memory"].get(key)
+        if entry is not None:
+          cache["memory"].move_to_end(key)
+      source = "memory"
+      if entry is None:
+        entry = readDisk(cache, key)
+        source = "disk"
+        if entry is not None:
+          remember(cache, key, entry)
+
+      if entry is not None:
+        age = time.time() - entry["fetched"]
+        if age < ttl:
+          count(cache, namespace, source)
+          return entry["value"]
+        if age < ttl + stale_ttl:
+          count(cache, namespace, "stale")
+          refreshInBackground(cache, namespace, key, ttl, stale_ttl, fn, args, kwargs)
+          return entry["value"]
+
+      try:
+        value = fetchAndStore(cache, namespace, key, ttl, stale_ttl, fn, args, kwargs)["value"]
+      except Exception:
+        if entry is None:
+          raise
+        count(cache, namespace, "stale_on_error")
+        return entry["value"]
+      count(cache, namespace, "miss")
+      return value
+
+    return wrapper
+
+  return decorator
+
+
+def cacheMetrics():
+  """
+  Hit counts per cache namespace for the admin page.
+
+  Returns:
+    list: One row dict per namespace.
+  """
+  cache = responseCache()
+  with cache["lock"]:
+    rows = []
+    for namespace, stats in sorted(cache["stats"].items()):
+      calls = sum(stats[outcome] for outcome in ("memory", "disk", "stale", "miss", "stale_on_error"))
+      hits = calls - stats["miss"]
+      rows.append({"namespace": namespace, **stats, "hit rate": round(hits / calls, 3) if calls else None})
+  return rows
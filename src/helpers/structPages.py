@@ -1,11 +1,9 @@
-import importlib
-import random
 import re
+import zlib
 
 import streamlit as st
 
-from src.helpers.getFolders import getFolders
-from src.helpers.getModules import getModules
+from src.helpers.moduleLoader import loadPageModule
 
 icons = [
   ":material/api:",
@@ -40,7 +38,7 @@ def createPageModule(BASE_DIR, MAIN_DIR, MODULES):
   if choice in MODULES:
     module_name = MODULES[choice]
     try:
-      module = importlib.import_module(f"src.apps.pages.{BASE_DIR}.{MAIN_DIR}.{module_name}")
+      module = loadPageModule(f"src.apps.pages.{BASE_DIR}.{MAIN_DIR}.{module_name}")
       func = getattr(module, module_name)
       func()
     except ModuleNotFoundError as e:
@@ -55,21 +53,23 @@ def createPageModule(BASE_DIR, MAIN_DIR, MODULES):
     st.info("Star this project on [GitHub](https://github.com/Code-A2Z/jarvis), if you like it!", icon="⭐")
 
 
-def structPages(path):
-  folders = getFolders(path)
-  pages = []
-  for name, folder in folders.items():
-    COMMON_MODULE_PATH = f"{path}/{folder}"
-    MODULES = getModules(COMMON_MODULE_PATH)
+def pageIcon(folder):
+  # crc32 is stable across processes, so a page keeps its icon between reruns and restarts.
+  return icons[zlib.crc32(folder.encode()) % len(icons)]
+
 
-    page_path_name = path.split("/")[-1]
+def structPages(page_path_name, folders):
+  pages = []
+  for entry in folders:
+    folder = entry["folder"]
+    MODULES = entry["modules"]
 
     if MODULES:
       pages.append(
         st.Page(
           lambda path=page_path_name, folder=folder, MODULES=MODULES: createPageModule(path, folder, MODULES),
-          title=name,
-          icon=random.choice(icons),
+          title=entry["title"],
+          icon=pageIcon(folder),
           url_path=folder,
         )
       )
@@ -0,0 +1,103 @@
+import contextlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from src.helpers.cacheDir import getCacheDir
+from src.helpers.httpClient import httpClient, httpGet
+
+TMDB_URL = "https://api.themoviedb.org/3/movie/{movie_id}"
+TMDB_CACHE_TTL = int(os.environ.get("JARVIS_TMDB_TTL", str(7 * 86400)))
+TMDB_WORKERS = 8
+TMDB_TIMEOUT = (3.05, 10)
+
+
+def cachePath(movie_id):
+  return os.path.join(getCacheDir("tmdb"), f"{int(movie_id)}.json")
+
+
+def readCachedMovie(movie_id, ttl=TMDB_CACHE_TTL):
+  try:
+    with open(cachePath(movie_id), encoding="utf-8") as f:
+      entry = json.load(f)
+  except (OSError, ValueError):
+    return None
+  if time.time() - entry["fetched"] > ttl:
+    return None
+  return entry["data"]
+
+
+def writeCachedMovie(movie_id, movie_data):
+  path = cachePath(movie_id)
+  # Unique per thread: pool threads may write the same movie at once.
+  tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+  with open(tmp_path, "w", encoding="utf-8") as f:
+    json.dump({"fetched": time.time(), "data": movie_data}, f)
+  os.replace(tmp_path, path)
+
+
+def formatMovie(data):
+  return {
+    "original_title": data["original_title"],
+    "poster_path": f"https://image.tmdb.org/t/p/w500{data['poster_path']}",
+    "backdrop_path": f"https://image.tmdb.org/t/p/w500{data['backdrop_path']}",
+    "overview": data["overview"],
+    "runtime": data["runtime"],
+    "release_date": data["release_date"],
+    "spoken_languages": data["spoken_languages"],
+    "genres": data["genres"],
+  }
+
+
+def fetchMovie(movie_id, api_key, refresh=False, client=None):
+  """
+  Fetch the display metadata of one movie, served from the on-disk cache while it is fresh.
+
+  Args:
+    movie_id (int): TMDB movie id.
+    api_key (str): TMDB API key.
+    refresh (bool): Ignore the cached copy.
+    client (dict, optional): Shared HTTP client state, required when called from a worker thread. Defaults to httpClient().
+
+  Returns:
+    dict or None: Movie metadata, or None when TMDB has no usable record for the id.
+  """
+  if not refresh:
+    cached = readCachedMovie(movie_id)
+    if cached is not None:
+      return cached
+  try:
+    response = httpGet(TMDB_URL.format(movie_id=int(movie_id)), params={"api_key": api_key}, timeout=TMDB_TIMEOUT, client=client)
+    response.raise_for_status()
+    movie_data = formatMovie(response.json())
+  except (requests.RequestException, KeyError, ValueError):
+    return None
+  # The cache is an optimisation; a failed write must never fail the fetch.
+  with contextlib.suppress(OSError):
+    writeCachedMovie(movie_id, movie_data)
+  return movie_data
+
+
+def fetchMovies(movie_ids, api_key, refresh=False, workers=TMDB_WORKERS):
+  """
+  Fetch several movies concurrently, preserving the order of movie_ids.
+
+  Args:
+    movie_ids (list): TMDB movie ids.
+    api_key (str): TMDB API key.
+    refresh (bool): Ignore cached copies.
+    workers (int): Maximum concurrent requests.
+
+  Returns:
+    list: Movie metadata (or None for failures) in the same order as movie_ids.
+  """
+  if not movie_ids:
+    return []
+  # Keep-alive connections, retries and the per-host cap come from the shared HTTP client.
+  client = httpClient()
+  with ThreadPoolExecutor(max_workers=max(1, min(workers, len(movie_ids)))) as executor:
+    return list(executor.map(lambda movie_id: fetchMovie(movie_id, api_key, refresh, client), movie_ids))
@@ -0,0 +1,130 @@
+import json
+import math
+import os
+import shutil
+
+import numpy as np
+
+from src.helpers.artifactStore import artifactKey, fetchArtifact
+from src.helpers.cacheDir import getCacheDir
+from src.helpers.embeddings import embedTexts
+
+# Flat is exact and fine for typical PDFs; HNSW and IVF trade a little recall for much faster search on large ones.
+INDEX_TYPES = ["Flat", "HNSW", "IVF"]
+INDEX_TYPE = os.environ.get("JARVIS_FAISS_INDEX", "Flat")
+HNSW_NEIGHBOURS = 32
+HNSW_EF_SEARCH = 64
+IVF_NPROBE = 8
+
+
+def buildFaissIndex(vectors, index_type=INDEX_TYPE):
+  """
+  Build a FAISS index of the requested type over a matrix of embeddings (L2 distance, like LangChain's default).
+
+  Args:
+    vectors (np.ndarray): float32 matrix of shape (chunks, dimensions).
+    index_type (str): One of INDEX_TYPES.
+
+  Returns:
+    faiss.Index: The populated index.
+  """
+  import faiss
+
+  if index_type not in INDEX_TYPES:
+    raise ValueError(f"Unknown index type '{index_type}'. Choose one of {', '.join(INDEX_TYPES)}.")
+  dimensions = vectors.shape[1]
+  if index_type == "HNSW":
+    index = faiss.IndexHNSWFlat(dimensions, HNSW_NEIGHBOURS)
+  elif index_type == "IVF":
+    # FAISS wants roughly 39 training points per list, so small documents get few lists.
+    nlist = max(1, min(int(4 * math.sqrt(len(vectors))), len(vectors) // 39))
+    index = faiss.IndexIVFFlat(faiss.IndexFlatL2(dimensions), dimensions, nlist)
+    index.train(vectors)
+  else:
+    index = faiss.IndexFlatL2(dimensions)
+  index.add(vectors)
+  return index
+
+
+def readFaissIndex(path):
+  """Load a saved index and apply the search-time parameters that are not stored with it."""
+  import faiss
+
+  index = faiss.read_index(path)
+  if isinstance(index, faiss.IndexHNSW):
+    index.hnsw.efSearch = HNSW_EF_SEARCH
+  if isinstance(index, faiss.IndexIVF):
+    index.nprobe = IVF_NPROBE
+    # MMR reconstructs stored vectors, which IVF indexes only support with a direct map.
+    index.make_direct_map()
+  return index
+
+
+def fetchEmbeddings(digest, embedding_name, load_chunks, embeddings, progress=None):
+  """
+  Return the artifact directory holding a document's chunks (chunks.json) and their embeddings (embeddings.npy).
+
+  The document is split and embedded only the first time this digest is seen with this embedding model on the host.
+  Embedding goes through embedTexts, so an interrupted run resumes from its finished batches.
+
+  Args:
+    digest (str): documentDigest of the document.
+    embedding_name (str): Embedding model name, part of the cache key.
+    load_chunks (callable): Returns the document's chunks as LangChain Documents.
+    embeddings: LangChain Embeddings used to embed the chunks.
+    progress (callable, optional): progress(done, total) over embedding batches.
+
+  Returns:
+    str: Artifact directory.
+  """
+
+  def build(folder):
+    documents = load_chunks()
+    checkpoint_dir = getCacheDir("embedding-progress", artifactKey(embedding_name), digest)
+    vectors = embedTexts([document.page_content for document in documents], embeddings, checkpoint_dir, progress=progress)
+    with open(os.path.join(folder, "chunks.json"), "w", encoding="utf-8") as f:
+      json.dump([{"text": document.page_content, "metadata": document.metadata} for document in documents], f)
+    np.save(os.path.join(folder, "embeddings.npy"), vectors)
+    shutil.rmtree(checkpoint_dir, ignore_errors=True)
+
+  # Built from the document, so offline mode may build it (with the local backend; a remote one fails on its own).
+  return fetchArtifact("pdf-embeddings", digest, build, version=embedding_name, derived=True)
+
+
+def loadVectorStore(digest, embedding_name, load_chunks, embeddings, index_type=INDEX_TYPE, progress=None):
+  """
+  Return a LangChain FAISS vector store for a document, reusing persisted chunks, embeddings and index.
+
+  Args:
+    digest (str): documentDigest of the document.
+    embedding_name (str): Embedding model name, part of the cache key.
+    load_chunks (callable): Returns the document's chunks as LangChain Documents. Only called on a cache miss.
+    embeddings: LangChain Embeddings, used for cache misses and to embed queries.
+    index_type (str): One of INDEX_TYPES.
+    progress (callable, optional): progress(done, total) over embedding batches on a cache miss.
+
+  Returns:
+    FAISS: Vector store ready for as_retriever().
+  """
+  import faiss
+  from langchain_community.docstore.in_memory import InMemoryDocstore
+  from langchain_community.vectorstores import FAISS
+  from langchain_core.documents import Document
+
+  embeddings_dir = fetchEmbeddings(digest, embedding_name, load_chunks, embeddings, progress)
+
+  def build(folder):
+    vectors = np.load(os.path.join(embeddings_dir, "embeddings.npy"))
+    faiss.write_index(buildFaissIndex(vectors, index_type), os.path.join(folder, "index.faiss"))
+
+  index_dir = fetchArtifact("pdf-index", digest, build, version=f"{embedding_name}-{index_type}", derived=True)
+  with open(os.path.join(embeddings_dir, "chunks.json"), encoding="utf-8") as f:
+    chunks = json.load(f)
+
+  docstore = InMemoryDocstore({str(i): Document(page_content=chunk["text"], metadata=chunk["metadata"]) for i, chunk in enumerate(chunks)})
+  return FAISS(
+    embedding_function=embeddings,
+    index=readFaissIndex(os.path.join(index_dir, "index.faiss")),
+    docstore=docstore,
+    index_to_docstore_id={i: str(i) for i in range(len(chunks))},
+  )
@@ -0,0 +1,142 @@
+"""
+Benchmark the embedding pipeline against a fake embedding server.
+
+The fake server answers POST /embed {"texts": [...]} with deterministic vectors after a configurable latency, and
+can reject a share of requests with HTTP 429 to exercise retries. Each pipeline configuration embeds the same
+synthetic chunks; the report shows wall time and throughput. With --local the sentence-transformer backend is
+measured on the same chunks too.
+
+Usage (from the repository root):
+  python -m src.tools.benchmarkEmbeddings
+  python -m src.tools.benchmarkEmbeddings --chunks 5000 --latency-ms 300 --batch-sizes 32,100 --workers 1,4,8 --local
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import requests
+from langchain_core.embeddings import Embeddings
+
+from src.helpers.embeddings import EMBED_RETRIES, LocalEmbeddings, embedTexts
+
+
+def fakeVector(text, dimensions):
+  seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:8], "little")
+  vector = np.random.default_rng(seed).standard_normal(dimensions)
+  return (vector / np.linalg.norm(vector)).tolist()
+
+
+def startFakeServer(latency_ms, per_item_ms, error_rate, max_batch, dimensions):
+  """Serve fake embeddings on a free local port. Returns (server, url)."""
+
+  class Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+      texts = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["texts"]
+      time.sleep((latency_ms + per_item_ms * len(texts)) / 1000)
+      if len(texts) > max_batch:
+        status, body = 400, {"error": f"at most {max_batch} texts per request"}
+      elif random.random() < error_rate:
+        status, body = 429, {"error": "rate limited"}
+      else:
+        status, body = 200, {"embeddings": [fakeVector(text, dimensions) for text in texts]}
+      payload = json.dumps(body).encode("utf-8")
+      self.send_response(status)
+      self.send_header("Content-Type", "application/json")
+      self.send_header("Content-Length", str(len(payload)))
+      self.end_headers()
+      self.wfile.write(payload)
+
+    def log_message(self, *args):
+      pass
+
+  server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+  threading.Thread(target=server.serve_forever, daemon=True).start()
+  return server, f"http://127.0.0.1:{server.server_port}/embed"
+
+
+class FakeServerEmbeddings(Embeddings):
+  """Embeddings client for the fake server, sharing one keep-alive session like the real API clients."""
+
+  def __init__(self, url):
+    self.url = url
+    self.session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=32)
+    self.session.mount("http://", adapter)
+
+  def embed_documents(self, texts):
+    response = self.session.post(self.url, json={"texts": list(texts)}, timeout=60)
+    response.raise_for_status()
+    return response.json()["embeddings"]
+
+  def embed_query(self, text):
+    return self.embed_documents([text])[0]
+
+
+def syntheticChunks(count, seed=0):
+  rng = random.Random(seed)
+  words = ["jarvis", "pdf", "vector", "index", "embedding", "batch", "page", "chunk", "model", "query", "answer", "context"]
+  return [" ".join(rng.choice(words) for _ in range(150)) + f" #{i}" for i in range(count)]
+
+
+def timeRun(label, texts, embeddings, **options):
+  start = time.perf_counter()
+  vectors = embedTexts(texts, embeddings, **options)
+  seconds = time.perf_counter() - start
+  print(f"{label:<36} {seconds:>8.2f}s {len(texts) / seconds:>10.1f} chunks/s  shape={vectors.shape}")
+  return vectors
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Benchmark the batched embedding pipeline against a fake embedding server.")
+  parser.add_argument("--chunks", type=int, default=2000, help="Number of synthetic chunks.")
+  parser.add_argument("--latency-ms", type=float, default=200, help="Fixed server latency per request.")
+  parser.add_argument("--per-item-ms", type=float, default=1, help="Extra server latency per text.")
+  parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with HTTP 429.")
+  parser.add_argument("--max-batch", type=int, default=100, help="Largest request the server accepts.")
+  parser.add_argument("--dimensions", type=int, default=768, help="Embedding size returned by the server.")
+  parser.add_argument("--batch-sizes", default="16,64,100", help="Comma-separated batch sizes to try.")
+  parser.add_argument("--workers", default="1,4,8", help="Comma-separated worker counts to try.")
+  parser.add_argument("--rpm", type=float, default=0, help="Requests-per-minute limit applied to every run (0 = none).")
+  parser.add_argument("--local", action="store_true", help="Also benchmark the local sentence-transformer backend.")
+  args = parser.parse_args()
+
+  texts = syntheticChunks(args.chunks)
+  server, url = startFakeServer(args.latency_ms, args.per_item_ms, args.error_rate, args.max_batch, args.dimensions)
+  embeddings = FakeServerEmbeddings(url)
+  print(f"{args.chunks} chunks, fake server at {url}, {EMBED_RETRIES} retries per batch\n")
+
+  try:
+    reference = None
+    for batch_size in (int(value) for value in args.batch_sizes.split(",")):
+      for workers in (int(value) for value in args.workers.split(",")):
+        vectors = timeRun(
+          f"remote batch={batch_size} workers={workers}", texts, embeddings, batch_size=batch_size, workers=workers, requests_per_minute=args.rpm
+        )
+        if reference is None:
+          reference = vectors
+        elif not np.array_equal(reference, vectors):
+          raise SystemExit("Pipeline configurations returned different vectors.")
+
+    with tempfile.TemporaryDirectory() as checkpoint_dir:
+      # Resume: a full run leaves every batch checkpointed, so the second run must not hit the server at all.
+      timeRun("remote checkpointed (cold)", texts, embeddings, checkpoint_dir=checkpoint_dir, requests_per_minute=args.rpm)
+      server.shutdown()
+      timeRun("remote checkpointed (resumed)", texts, embeddings, checkpoint_dir=checkpoint_dir, requests_per_minute=args.rpm)
+
+    if args.local:
+      local = LocalEmbeddings()
+      local.embed_query("warm up")
+      timeRun("local sentence-transformer", texts, local)
+  finally:
+    server.server_close()
+
+
+if __name__ == "__main__":
+  main()
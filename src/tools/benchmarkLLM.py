@@ -0,0 +1,81 @@
+"""
+Load-test the LLM gateway offline with the stub provider.
+
+Simulated users send chat requests through streamChat("stub", ...) concurrently, so the whole gateway path
+(client pool, per-provider concurrency cap, queueing, streaming, metrics) is exercised without API keys or
+network. The report shows time to first token, total latency and throughput for each user count.
+
+The per-provider cap comes from JARVIS_LLM_CONCURRENCY, read at import time.
+
+Usage (from the repository root):
+  python -m src.tools.benchmarkLLM
+  JARVIS_LLM_CONCURRENCY=8 python -m src.tools.benchmarkLLM --users 1,8,32 --requests 4 --first-token-ms 500 --words 200
+"""
+
+import argparse
+import statistics
+import threading
+import time
+
+from src.helpers.llmGateway import LLM_CONCURRENCY, llmMetrics, streamChat
+
+
+def percentile(values, share):
+  return sorted(values)[min(len(values) - 1, int(share * len(values)))] if values else float("nan")
+
+
+def runUser(results, requests, prompt, options):
+  for _ in range(requests):
+    start = time.perf_counter()
+    first_token = None
+    try:
+      for _chunk in streamChat("stub", [{"role": "user", "content": prompt}], **options):
+        if first_token is None:
+          first_token = time.perf_counter() - start
+      results.append((first_token, time.perf_counter() - start))
+    except Exception:
+      results.append((None, None))
+
+
+def runLoad(users, requests, prompt, options):
+  results = []
+  threads = [threading.Thread(target=runUser, args=(results, requests, prompt, options)) for _ in range(users)]
+  start = time.perf_counter()
+  for thread in threads:
+    thread.start()
+  for thread in threads:
+    thread.join()
+  seconds = time.perf_counter() - start
+
+  ok = [result for result in results if result[1] is not None]
+  first_tokens = [first_token * 1000 for first_token, _ in ok if first_token is not None]
+  latencies = [latency * 1000 for _, latency in ok]
+  print(
+    f"{users:>5} users {len(ok):>5}/{len(results)} ok  "
+    f"first token p50 {statistics.median(first_tokens) if first_tokens else float('nan'):>7.0f} ms p95 {percentile(first_tokens, 0.95):>7.0f} ms  "
+    f"latency p50 {statistics.median(latencies) if latencies else float('nan'):>7.0f} ms p95 {percentile(latencies, 0.95):>7.0f} ms  "
+    f"{len(ok) / seconds:>6.1f} req/s"
+  )
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Load-test the LLM gateway with the offline stub provider.")
+  parser.add_argument("--users", default="1,4,16", help="Comma-separated numbers of concurrent users.")
+  parser.add_argument("--requests", type=int, default=3, help="Requests per user.")
+  parser.add_argument("--words", type=int, default=100, help="Words in each stub answer.")
+  parser.add_argument("--first-token-ms", type=float, default=300, help="Stub latency before the first word.")
+  parser.add_argument("--token-ms", type=float, default=15, help="Stub latency between words.")
+  args = parser.parse_args()
+
+  prompt = " ".join(["word"] * args.words)
+  options = {"first_token_ms": args.first_token_ms, "token_ms": args.token_ms}
+  print(f"Stub provider, {LLM_CONCURRENCY} concurrent completions, {args.words} words per answer\n")
+  for users in (int(value) for value in args.users.split(",")):
+    runLoad(users, args.requests, prompt, options)
+  print()
+  for row in llmMetrics():
+    print(row)
+
+
+if __name__ == "__main__":
+  main()
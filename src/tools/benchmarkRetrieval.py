@@ -0,0 +1,143 @@
+"""
+Benchmark chatWithYourPDF retrieval (vector, BM25, hybrid RRF, optional cross-encoder rerank) on a synthetic corpus.
+
+Every synthetic chunk mixes filler, words of its topic, a few signature concepts of its own and one rare identifier
+(a part number, a name). Two kinds of queries target one chunk each:
+  keyword     the chunk's identifier and a couple of its words, verbatim (exact-term lookups)
+  paraphrase  the chunk's signature concepts, one verbatim and the rest with synonyms the chunk does not use
+The default embedder maps synonyms to the same concept vector, like a semantic model, and hashes unknown words
+(identifiers) weakly, so vector search is good at paraphrases and weak at identifiers while BM25 is the opposite.
+With --local the real local sentence-transformer is used instead (its recall on pseudo-words is not meaningful,
+but its latency is).
+
+The report shows recall@k per query kind and the query latency for each retrieval mode.
+
+Usage (from the repository root):
+  python -m src.tools.benchmarkRetrieval
+  python -m src.tools.benchmarkRetrieval --chunks 20000 --queries 500 --index-type HNSW --rerank
+"""
+
+import argparse
+import hashlib
+import random
+import statistics
+import time
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.helpers.embeddings import LocalEmbeddings, embedTexts
+from src.helpers.hybridRetrieval import buildBM25, retrieveIds
+from src.helpers.vectorStore import INDEX_TYPE, INDEX_TYPES, buildFaissIndex
+
+SYNONYMS = 3
+FILLER = ["the", "a", "of", "and", "to", "in", "is", "for", "with", "on", "this", "that", "by", "as", "be", "are", "from", "it"]
+
+
+class ConceptEmbeddings:
+  """Deterministic stand-in for a semantic embedding model: synonyms share a concept vector, other words are hashed."""
+
+  def __init__(self, concepts, dimensions=128, seed=0):
+    rng = np.random.default_rng(seed)
+    self.dimensions = dimensions
+    self.vectors = rng.standard_normal((concepts, dimensions)).astype(np.float32)
+
+  def wordVector(self, word):
+    if word.startswith("c") and "s" in word and word[1:].split("s")[0].isdigit():
+      return self.vectors[int(word[1:].split("s")[0]) % len(self.vectors)]
+    seed = int.from_bytes(hashlib.sha256(word.encode("utf-8")).digest()[:8], "little")
+    return 0.3 * np.random.default_rng(seed).standard_normal(self.dimensions).astype(np.float32)
+
+  def embed_query(self, text):
+    vector = sum((self.wordVector(word) for word in text.lower().split() if word not in FILLER), np.zeros(self.dimensions, np.float32))
+    return (vector / (np.linalg.norm(vector) or 1)).tolist()
+
+  def embed_documents(self, texts):
+    return [self.embed_query(text) for text in texts]
+
+
+def surface(concept, rng, avoid=None):
+  """One of the synonyms of a concept, e.g. "c42s1", optionally different from avoid."""
+  forms = [f"c{concept}s{i}" for i in range(SYNONYMS)]
+  return rng.choice([form for form in forms if form != avoid] or forms)
+
+
+def syntheticCorpus(chunks, queries, topics=50, concepts=5000, seed=0):
+  """
+  Returns:
+    tuple: (texts, queries) where queries are (kind, text, target chunk id).
+  """
+  rng = random.Random(seed)
+  topic_concepts = [rng.sample(range(concepts), 20) for _ in range(topics)]
+  texts, signatures = [], []
+  for i in range(chunks):
+    topic = topic_concepts[i % topics]
+    signature = {concept: surface(concept, rng) for concept in rng.sample(range(concepts), 4)}
+    identifier = f"id{hashlib.sha256(f'{seed}-{i}'.encode()).hexdigest()[:8]}"
+    words = [rng.choice(FILLER) for _ in range(50)] + [surface(rng.choice(topic), rng) for _ in range(30)]
+    words += [form for form in signature.values() for _ in range(2)] + [identifier, identifier]
+    rng.shuffle(words)
+    texts.append(" ".join(words))
+    signatures.append((signature, identifier))
+
+  pairs = []
+  for target in rng.sample(range(chunks), min(queries, chunks)):
+    signature, identifier = signatures[target]
+    pairs.append(("keyword", f"what is {identifier} {' '.join(list(signature.values())[:1])}", target))
+    reworded = [form if i == 0 else surface(concept, rng, avoid=form) for i, (concept, form) in enumerate(signature.items())]
+    pairs.append(("paraphrase", " ".join(reworded), target))
+  return texts, pairs
+
+
+def evaluate(label, retriever, pairs, k_values, **options):
+  depth = max(k_values)
+  hits = {kind: dict.fromkeys(k_values, 0) for kind in ("keyword", "paraphrase")}
+  totals = dict.fromkeys(hits, 0)
+  latencies = []
+  for kind, query, target in pairs:
+    start = time.perf_counter()
+    ids = retrieveIds(retriever, query, k=depth, **options)
+    latencies.append((time.perf_counter() - start) * 1000)
+    totals[kind] += 1
+    for k in k_values:
+      hits[kind][k] += target in ids[:k]
+  recall = "  ".join(f"{kind} " + " ".join(f"@{k} {hits[kind][k] / totals[kind]:.2f}" for k in k_values) for kind in hits if totals[kind])
+  p95 = sorted(latencies)[int(0.95 * (len(latencies) - 1))]
+  print(f"{label:<16} {recall}   p50 {statistics.median(latencies):6.2f} ms  p95 {p95:6.2f} ms")
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Benchmark vector, BM25 and hybrid retrieval on a synthetic corpus.")
+  parser.add_argument("--chunks", type=int, default=5000, help="Number of synthetic chunks.")
+  parser.add_argument("--queries", type=int, default=200, help="Target chunks; each gets a keyword and a paraphrase query.")
+  parser.add_argument("--index-type", default=INDEX_TYPE, choices=INDEX_TYPES, help="FAISS index type.")
+  parser.add_argument("--k", default="1,4,10", help="Comma-separated k values for recall@k.")
+  parser.add_argument("--candidates", type=int, default=20, help="Candidates per retriever before fusion.")
+  parser.add_argument("--rerank", action="store_true", help="Also measure hybrid retrieval with the local cross-encoder.")
+  parser.add_argument("--local", action="store_true", help="Embed with the local sentence-transformer instead of the stand-in.")
+  args = parser.parse_args()
+  k_values = [int(value) for value in args.k.split(",")]
+
+  texts, pairs = syntheticCorpus(args.chunks, args.queries)
+  embeddings = LocalEmbeddings() if args.local else ConceptEmbeddings(5000)
+  print(f"{len(texts)} chunks, {len(pairs)} queries, {args.index_type} index, {'local model' if args.local else 'concept stand-in'}\n")
+
+  start = time.perf_counter()
+  vectors = embedTexts(texts, embeddings, requests_per_minute=0)
+  index = buildFaissIndex(vectors, args.index_type)
+  print(f"embed + vector index  {time.perf_counter() - start:8.2f}s")
+  start = time.perf_counter()
+  bm25 = buildBM25(texts)
+  print(f"BM25 index            {time.perf_counter() - start:8.2f}s\n")
+
+  retriever = {"store": SimpleNamespace(embedding_function=embeddings, index=index), "bm25": bm25, "texts": texts}
+  options = {"candidates": args.candidates, "rerank_results": False}
+  evaluate("vector", retriever, pairs, k_values, mode="vector", **options)
+  evaluate("bm25", retriever, pairs, k_values, mode="bm25", **options)
+  evaluate("hybrid (RRF)", retriever, pairs, k_values, mode="hybrid", **options)
+  if args.rerank:
+    evaluate("hybrid + rerank", retriever, pairs, k_values, mode="hybrid", candidates=args.candidates, rerank_results=True)
+
+
+if __name__ == "__main__":
+  main()
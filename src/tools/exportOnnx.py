@@ -0,0 +1,169 @@
+"""
+Export the dog breed and Arabic dates classifiers to ONNX for the onnxruntime CPU backend.
+
+Each model is built with its native framework (TensorFlow / PyTorch), exported to ONNX and optionally
+quantized to int8 with dynamic quantization. Before an artifact is published to the cache, its top-1 predictions
+are compared with the native model on real sample images (random noise says little about how a classifier behaves
+on its own inputs, so the images are required); artifacts that disagree are not published and any earlier copy is
+removed, so the pages serve the native model.
+
+Usage (from the repository root):
+  python -m src.tools.exportOnnx --images samples/
+  python -m src.tools.exportOnnx --quantize --images samples/ --samples 32
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import tempfile
+
+import numpy as np
+from PIL import Image
+
+from src.helpers.onnxBackend import onnxArtifactPath
+
+
+def exportDogBreed(path):
+  import tensorflow as tf
+  import tf2onnx
+
+  from src.apps.pages.models.ObjectDetection.dogBreedClassifier import loadModel
+
+  model = loadModel()
+  signature = (tf.TensorSpec((None, 224, 224, 3), tf.float32, name="input"),)
+  tf2onnx.convert.from_keras(model, input_signature=signature, opset=17, output_path=path)
+  return lambda images: model.predict(images, verbose=0)
+
+
+def exportArabicDates(path):
+  import torch
+
+  from src.apps.pages.models.ImageProcessing.ArabicDatesClassifierModel import load_model_data
+
+  model, _class_names = load_model_data()
+  torch.onnx.export(
+    model,
+    torch.randn(1, 3, 224, 224),
+    path,
+    input_names=["input"],
+    output_names=["logits"],
+    dynamic_axes={"input": {0: "batch"}, "logits": {0: "batch"}},
+    opset_version=17,
+  )
+
+  def native(images):
+    with torch.no_grad():
+      return model(torch.from_numpy(images)).numpy()
+
+  return native
+
+
+def preprocessDogBreed(image):
+  from src.apps.pages.models.ObjectDetection.dogBreedClassifier import preprocessImage
+
+  return preprocessImage(image)
+
+
+def preprocessArabicDates(image):
+  from src.apps.pages.models.ImageProcessing.ArabicDatesClassifierModel import preprocess_image
+
+  return preprocess_image(image).numpy()
+
+
+EXPORTERS = {
+  "dogBreedClassifier": (exportDogBreed, preprocessDogBreed),
+  "arabicDatesClassifier": (exportArabicDates, preprocessArabicDates),
+}
+
+
+def sampleImages(images_dir, count):
+  """
+  Up to count real images from images_dir for the parity check.
+
+  Raises:
+    ValueError: When images_dir holds no .jpg/.jpeg/.png image.
+  """
+  files = sorted(f for f in os.listdir(images_dir) if f.lower().endswith((".jpg", ".jpeg", ".png")))[:count]
+  if not files:
+    raise ValueError(f"No sample images (.jpg, .jpeg, .png) in {images_dir}: the parity check needs real inputs.")
+  return [Image.open(os.path.join(images_dir, f)) for f in files]
+
+
+def onnxRunner(path):
+  import onnxruntime
+
+  session = onnxruntime.InferenceSession(path, providers=["CPUExecutionProvider"])
+  return lambda inputs: session.run(None, {session.get_inputs()[0].name: inputs})[0]
+
+
+def topOneAgreement(native, exported, inputs):
+  """
+  Returns:
+    float: Fraction of inputs on which both models (callables from a batch to per-class scores) pick the same class.
+  """
+  return float(np.mean(np.argmax(native(inputs), axis=1) == np.argmax(exported(inputs), axis=1)))
+
+
+def exportModel(name, quantize, images, min_agreement):
+  """
+  Export, check and publish one model.
+
+  Returns:
+    bool: True when every produced artifact passed the parity check and was published.
+  """
+  export, preprocess = EXPORTERS[name]
+  inputs = np.concatenate([preprocess(image) for image in images]).astype(np.float32)
+  ok = True
+  with tempfile.TemporaryDirectory() as tmp_dir:
+    fp32_path = os.path.join(tmp_dir, f"{name}.onnx")
+    native = export(fp32_path)
+    artifacts = [(fp32_path, onnxArtifactPath(name))]
+
+    if quantize:
+      from onnxruntime.quantization import QuantType, quantize_dynamic
+
+      int8_path = os.path.join(tmp_dir, f"{name}.int8.onnx")
+      quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+      artifacts.append((int8_path, onnxArtifactPath(name, quantized=True)))
+
+    for tmp_path, target in artifacts:
+      agreement = topOneAgreement(native, onnxRunner(tmp_path), inputs)
+      size_mb = os.path.getsize(tmp_path) / (1024 * 1024)
+      if agreement >= min_agreement:
+        # Same-directory replace keeps the swap atomic for workers that are loading the artifact.
+        staged = f"{target}.{os.getpid()}.tmp"
+        with open(tmp_path, "rb") as src, open(staged, "wb") as dst:
+          dst.write(src.read())
+        os.replace(staged, target)
+        print(f"{name}: top-1 agreement {agreement:.1%}, {size_mb:.1f} MB -> {target}")
+      else:
+        ok = False
+        # An artifact published earlier no longer matches the weights just checked: remove it so the page falls back
+        # to the native model instead of serving it.
+        with contextlib.suppress(FileNotFoundError):
+          os.remove(target)
+        print(f"{name}: top-1 agreement {agreement:.1%} is below {min_agreement:.0%}, not publishing {os.path.basename(target)}")
+  return ok
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Export the Jarvis image classifiers to ONNX.")
+  parser.add_argument("--models", nargs="+", choices=list(EXPORTERS), default=list(EXPORTERS), help="Models to export.")
+  parser.add_argument("--quantize", action="store_true", help="Also produce an int8 dynamically quantized artifact.")
+  parser.add_argument("--images", required=True, help="Directory of real sample images for the parity check.")
+  parser.add_argument("--samples", type=int, default=16, help="Number of sample images for the parity check.")
+  parser.add_argument("--min-agreement", type=float, default=1.0, help="Required fraction of matching top-1 predictions.")
+  args = parser.parse_args()
+
+  try:
+    images = sampleImages(args.images, args.samples)
+  except (OSError, ValueError) as e:
+    parser.error(str(e))
+  results = [exportModel(name, args.quantize, images, args.min_agreement) for name in args.models]
+  if not all(results):
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+  main()
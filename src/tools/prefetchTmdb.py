@@ -0,0 +1,52 @@
+"""
+Warm the on-disk TMDB cache for every movie the recommender can suggest.
+
+Run this once after deploying (or from a nightly job) so recommendation pages never wait on TMDB. Movies whose
+cached copy is still fresh are skipped unless --refresh is given.
+
+Usage (from the repository root):
+  TMDB_API_KEY=... python -m src.tools.prefetchTmdb
+  python -m src.tools.prefetchTmdb --workers 16 --refresh
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import time
+
+import streamlit as st
+
+from src.helpers.kaggle import downloadNotebookOutput
+from src.helpers.tmdb import TMDB_WORKERS, fetchMovies, readCachedMovie
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Prefetch TMDB metadata for the movie recommender.")
+  parser.add_argument("--workers", type=int, default=TMDB_WORKERS, help="Concurrent TMDB requests.")
+  parser.add_argument("--refresh", action="store_true", help="Refetch movies that are already cached.")
+  parser.add_argument("--batch", type=int, default=200, help="Movies per progress report.")
+  args = parser.parse_args()
+
+  api_key = os.environ.get("TMDB_API_KEY") or st.secrets["api_key"]["TMDB_API_KEY"]
+  notebook = downloadNotebookOutput("avdhesh15", "movie-recommendation-app")
+  with open(os.path.join(notebook, "movies_list.pkl"), "rb") as movies_file:
+    movie_ids = [int(movie_id) for movie_id in pickle.load(movies_file)["id"].values]
+
+  pending = movie_ids if args.refresh else [movie_id for movie_id in movie_ids if readCachedMovie(movie_id) is None]
+  print(f"{len(movie_ids)} movies, {len(pending)} to fetch")
+
+  failed = 0
+  start = time.perf_counter()
+  for offset in range(0, len(pending), args.batch):
+    results = fetchMovies(pending[offset : offset + args.batch], api_key, refresh=args.refresh, workers=args.workers)
+    failed += sum(result is None for result in results)
+    done = min(offset + args.batch, len(pending))
+    print(f"{done}/{len(pending)} fetched, {failed} failed, {time.perf_counter() - start:.1f}s")
+
+  if failed:
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,201 @@
+"""
+Import every page module in its own interpreter and report how expensive the import is.
+
+For each module under src/apps/pages this records the wall time of the import, the peak RSS of the process and
+every network connection opened while importing. Results are written as JSON and HTML, and the run fails when a
+page goes over its import-time budget, so it can be used as a CI gate.
+
+Usage (from the repository root):
+  python -m src.tools.profileImports
+  python -m src.tools.profileImports --budget 1.5 --budgets budgets.json --only models
+"""
+
+import argparse
+import html
+import importlib
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from src.helpers.cacheDir import getCacheDir
+from src.helpers.moduleLoader import moduleDependencies, pageModules
+
+DEFAULT_BUDGET = 2.0
+DEFAULT_TIMEOUT = 300
+
+
+def peakRSS():
+  """Peak resident set size of this process in MB, or None where the resource module is unavailable."""
+  try:
+    import resource
+  except ImportError:
+    return None
+  peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+  # ru_maxrss is reported in bytes on macOS and in kilobytes everywhere else.
+  return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def profileModule(name, block_network=False):
+  """
+  Import a single module in the current process while recording time, memory and network use.
+
+  Args:
+    name (str): Dotted module path to import.
+    block_network (bool): Refuse every connection instead of only recording it.
+
+  Returns:
+    dict: Measurements for the module.
+  """
+  connections = []
+  hosts = set()
+  original_connect = socket.socket.connect
+  original_getaddrinfo = socket.getaddrinfo
+
+  def connect(sock, address):
+    connections.append(str(address))
+    if block_network:
+      raise OSError(f"Network access blocked while profiling {name}")
+    return original_connect(sock, address)
+
+  def getaddrinfo(host, *args, **kwargs):
+    hosts.add(str(host))
+    return original_getaddrinfo(host, *args, **kwargs)
+
+  # Every page imports streamlit and the server has it loaded already, so keep it out of the measurement.
+  import streamlit  # noqa: F401
+
+  socket.socket.connect = connect
+  socket.getaddrinfo = getaddrinfo
+  rss_before = peakRSS()
+  error = None
+  start = time.perf_counter()
+  try:
+    importlib.import_module(name)
+  except BaseException as e:
+    error = f"{type(e).__name__}: {e}"
+  seconds = time.perf_counter() - start
+  socket.socket.connect = original_connect
+  socket.getaddrinfo = original_getaddrinfo
+  rss_after = peakRSS()
+
+  return {
+    "module": name,
+    "seconds": seconds,
+    "peak_rss_mb": rss_after,
+    "rss_growth_mb": rss_after - rss_before if rss_after is not None else None,
+    "network_calls": len(connections),
+    "hosts": sorted(hosts),
+    "error": error,
+  }
+
+
+def runIsolated(name, timeout, block_network):
+  """Profile a module in a fresh interpreter so earlier imports cannot hide its cost."""
+  with tempfile.TemporaryDirectory() as tmp_dir:
+    result_path = os.path.join(tmp_dir, "result.json")
+    command = [sys.executable, "-m", "src.tools.profileImports", "--child", name, "--result", result_path]
+    if block_network:
+      command.append("--block-network")
+    start = time.perf_counter()
+    try:
+      subprocess.run(command, timeout=timeout, capture_output=True, check=False)
+    except subprocess.TimeoutExpired:
+      return {"module": name, "seconds": time.perf_counter() - start, "error": f"Timed out after {timeout}s"}
+    try:
+      with open(result_path, encoding="utf-8") as f:
+        return json.load(f)
+    except (OSError, ValueError):
+      return {"module": name, "seconds": time.perf_counter() - start, "error": "Interpreter exited before reporting a result"}
+
+
+def loadBudgets(path):
+  if not path:
+    return {}
+  with open(path, encoding="utf-8") as f:
+    return json.load(f)
+
+
+def budgetFor(name, budgets, default):
+  """A budget can be keyed by the full dotted path or just the module name, e.g. "translator"."""
+  return budgets.get(name, budgets.get(name.rsplit(".", 1)[-1], default))
+
+
+def writeHTML(results, path):
+  rows = []
+  for result in results:
+    style = ' style="background:#fdd"' if result["over_budget"] or result.get("error") else ""
+    rss = f"{result['peak_rss_mb']:.0f}" if result.get("peak_rss_mb") is not None else "-"
+    rows.append(
+      f"<tr{style}><td>{html.escape(result['module'])}</td><td>{result['seconds']:.3f}</td><td>{result['budget']:.2f}</td>"
+      f"<td>{rss}</td><td>{result.get('network_calls', '-')}</td><td>{html.escape(', '.join(result.get('hosts', [])))}</td>"
+      f"<td>{html.escape(', '.join(result.get('dependencies', [])))}</td><td>{html.escape(result.get('error') or '')}</td></tr>"
+    )
+  with open(path, "w", encoding="utf-8") as f:
+    f.write(
+      "<!DOCTYPE html><html><head><meta charset='utf-8'><title>Jarvis page import profile</title>"
+      "<style>body{font-family:sans-serif}table{border-collapse:collapse}td,th{border:1px solid #ccc;padding:4px 8px}</style>"
+      "</head><body><h1>Jarvis page import profile</h1><table><tr><th>Module</th><th>Import (s)</th><th>Budget (s)</th>"
+      "<th>Peak RSS (MB)</th><th>Network calls</th><th>Hosts</th><th>Heavy dependencies</th><th>Error</th></tr>"
+      + "".join(rows)
+      + "</table></body></html>"
+    )
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Profile the import cost of every Jarvis page module.")
+  parser.add_argument("--pages", default="src/apps/pages", help="Root directory of the page modules.")
+  parser.add_argument("--only", help="Profile only modules whose dotted path contains this string.")
+  parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET, help="Default import-time budget per page in seconds.")
+  parser.add_argument("--budgets", help="JSON file mapping module names to their own budget in seconds.")
+  parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Give up on a single import after this many seconds.")
+  parser.add_argument("--block-network", action="store_true", help="Refuse network connections made during import.")
+  parser.add_argument("--output", help="Directory for import_profile.json and import_profile.html.")
+  parser.add_argument("--child", help=argparse.SUPPRESS)
+  parser.add_argument("--result", help=argparse.SUPPRESS)
+  args = parser.parse_args()
+
+  if args.child:
+    result = profileModule(args.child, block_network=args.block_network)
+    with open(args.result, "w", encoding="utf-8") as f:
+      json.dump(result, f)
+    # Skip interpreter teardown: some page libraries hang on exit when their import failed halfway.
+    os._exit(0)
+
+  budgets = loadBudgets(args.budgets)
+  results = []
+  for name, path in pageModules(args.pages):
+    if args.only and args.only not in name:
+      continue
+    result = runIsolated(name, args.timeout, args.block_network)
+    result["dependencies"] = moduleDependencies(path)
+    result["budget"] = budgetFor(name, budgets, args.budget)
+    result["over_budget"] = result["seconds"] > result["budget"]
+    results.append(result)
+    status = "FAILED" if result.get("error") else "OVER BUDGET" if result["over_budget"] else "ok"
+    print(f"{result['seconds']:8.3f}s  {status:<11}  {name}" + (f"  ({result['error']})" if result.get("error") else ""))
+
+  results.sort(key=lambda result: -result["seconds"])
+  output = args.output or getCacheDir("reports")
+  os.makedirs(output, exist_ok=True)
+  with open(os.path.join(output, "import_profile.json"), "w", encoding="utf-8") as f:
+    json.dump(results, f, indent=2)
+  writeHTML(results, os.path.join(output, "import_profile.html"))
+
+  # A page that fails to import (or times out) is a failure too, whatever its time.
+  failed = [result["module"] for result in results if result.get("error")]
+  over_budget = [result["module"] for result in results if result["over_budget"] and not result.get("error")]
+  print(f"\nReport written to {output}")
+  if failed:
+    print(f"{len(failed)} page(s) failed to import:\n  " + "\n  ".join(failed))
+  if over_budget:
+    print(f"{len(over_budget)} page(s) exceeded their import budget:\n  " + "\n  ".join(over_budget))
+  if failed or over_budget:
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from src.tools import exportOnnx
+
+WEIGHTS = np.random.default_rng(0).standard_normal((4, 5)).astype(np.float32)
+
+
+def native(inputs):
+  return inputs @ WEIGHTS
+
+
+def shifted(inputs):
+  # Same scores with the classes rotated: every top-1 prediction differs.
+  return np.roll(native(inputs), 1, axis=1)
+
+
+@pytest.fixture
+def fakeExport(tmp_path, monkeypatch):
+  """Export a stand-in model whose "ONNX" twin is chosen by the test, publishing into tmp_path."""
+
+  def use(exported):
+    def export(path):
+      with open(path, "wb") as f:
+        f.write(b"onnx")
+      return native
+
+    monkeypatch.setitem(exportOnnx.EXPORTERS, "fake", (export, lambda image: np.asarray(image, np.float32).reshape(1, 4)))
+    monkeypatch.setattr(exportOnnx, "onnxRunner", lambda path: exported)
+    monkeypatch.setattr(exportOnnx, "onnxArtifactPath", lambda name, quantized=False: str(tmp_path / f"{name}.onnx"))
+    return tmp_path / "fake.onnx"
+
+  return use
+
+
+def samples(count=8):
+  rng = np.random.default_rng(1)
+  return [Image.fromarray(rng.random((2, 2), dtype=np.float32), mode="F") for _ in range(count)]
+
+
+def test_top_one_agreement():
+  inputs = np.random.default_rng(2).standard_normal((16, 4)).astype(np.float32)
+  assert exportOnnx.topOneAgreement(native, native, inputs) == 1.0
+  assert exportOnnx.topOneAgreement(native, shifted, inputs) == 0.0
+
+
+def test_matching_export_is_published(fakeExport):
+  target = fakeExport(native)
+  assert exportOnnx.exportModel("fake", quantize=False, images=samples(), min_agreement=1.0)
+  assert target.read_bytes() == b"onnx"
+
+
+def test_diverging_export_is_not_published(fakeExport):
+  target = fakeExport(shifted)
+  assert not exportOnnx.exportModel("fake", quantize=False, images=samples(), min_agreement=1.0)
+  assert not target.exists()
+
+
+def test_sample_images_are_required(tmp_path):
+  with pytest.raises(ValueError):
+    exportOnnx.sampleImages(str(tmp_path), 4)
+  Image.new("RGB", (8, 8)).save(tmp_path / "dog.jpg")
+  assert len(exportOnnx.sampleImages(str(tmp_path), 4)) == 1
+
+
+def test_diverging_export_removes_the_previous_artifact(fakeExport):
+  target = fakeExport(shifted)
+  target.write_bytes(b"stale")
+  assert not exportOnnx.exportModel("fake", quantize=False, images=samples(), min_agreement=1.0)
+  assert not target.exists()